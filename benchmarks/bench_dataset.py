@@ -0,0 +1,132 @@
+"""
+Benchmark du chargement des données d'entraînement.
+
+Compare le chemin historique (`fetch_california_housing(as_frame=True)` puis
+`train_test_split`) au dépôt local colonnaire (`load_dataset().splits()`) :
+
+- à froid : premier chargement dans un processus neuf (imports non compris) ;
+- à chaud : médiane de chargements répétés dans le même processus.
+
+Pour le dépôt local, la ligne "+ lecture" parcourt aussi toutes les valeurs, les
+fichiers projetés en mémoire n'étant lus qu'au premier accès. Avec `--scale N`, la
+comparaison porte sur un fichier CSV agrandi N fois (lu par `pandas.read_csv`).
+
+Usage :
+    python -m benchmarks.bench_dataset --repeat 5 --scale 1 100
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.ml.dataset import load_dataset, read_source
+
+SETUP = """
+import time
+import numpy as np
+import pandas as pd
+from sklearn.datasets import fetch_california_housing
+from sklearn.model_selection import train_test_split
+from src.ml.dataset import load_dataset
+source = {source!r}
+directory = {directory!r}
+
+
+def historical():
+    if source is None:
+        housing = fetch_california_housing(as_frame=True)
+        X, y = housing.data, housing.target
+    else:
+        frame = pd.read_csv(source)
+        X, y = frame.drop(columns="MedHouseVal"), frame["MedHouseVal"]
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+def store():
+    return load_dataset("bench", source, directory=directory).splits()
+
+
+def store_read():
+    return [np.asarray(part).sum() for part in store()]
+"""
+
+MEASURE = """
+start = time.perf_counter()
+{function}()
+print(time.perf_counter() - start)
+"""
+
+PATHS = {
+    "historique": "historical",
+    "dépôt local": "store",
+    "dépôt local + lecture": "store_read",
+}
+
+
+def cold(setup: str, function: str, repeat: int) -> float:
+    """
+    Médiane du premier chargement dans `repeat` processus neufs.
+    """
+    code = setup + MEASURE.format(function=function)
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True
+            ).stdout.split()[-1]
+        )
+        for _ in range(repeat)
+    ]
+    return float(np.median(timings))
+
+
+def warm(setup: str, function: str, repeat: int) -> float:
+    """
+    Médiane de `repeat` chargements successifs dans ce processus.
+    """
+    namespace = {}
+    exec(setup, namespace)
+    namespace[function]()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        namespace[function]()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scale:
+            source = None
+            if scale > 1:
+                X, y = read_source(None)
+                frame = X.assign(MedHouseVal=y)
+                source = str(Path(directory) / f"california_x{scale}.csv")
+                frame.loc[frame.index.repeat(scale)].to_csv(source, index=False)
+            # Ingestion préalable : le dépôt local est mesuré une fois constitué
+            store = Path(directory) / "store"
+            rows = load_dataset("bench", source, directory=store).rows
+            setup = SETUP.format(source=source, directory=str(store))
+
+            label = "California Housing" if source is None else f"CSV x{scale}"
+            print(f"{label} ({rows:,} lignes)")
+            print(f"{'chemin':<24}{'froid ms':>12}{'chaud ms':>12}")
+            for name, function in PATHS.items():
+                print(
+                    f"{name:<24}{cold(setup, function, args.repeat) * 1e3:>12.1f}"
+                    f"{warm(setup, function, args.repeat) * 1e3:>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
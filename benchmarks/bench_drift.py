@@ -0,0 +1,84 @@
+"""
+Benchmark du calcul de dérive (`src/monitoring/drift.py`) sur du trafic journalisé.
+
+Mesure, pour `--rows` lignes tirées du jeu California Housing (avec remise, et
+revenu médian décalé pour simuler une dérive) :
+
+- "calcul" : comparaison à la référence d'entraînement, par blocs, en mémoire
+  (répartition sur la grille de quantiles et statistiques) ;
+- "journal" : relecture du journal des prédictions (`iter_prediction_chunks`) et
+  calcul, comme le point de terminaison "/drift" et la CLI.
+
+Usage :
+    python -m benchmarks.bench_drift --rows 1000000 5000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.api.prediction_log import PredictionLogger, iter_prediction_chunks
+from src.ml.dataset import load_dataset
+from src.monitoring.drift import DriftMonitor, build_reference, compute_drift
+
+
+def traffic(X_train: pd.DataFrame, rows: int, seed: int = 0) -> np.ndarray:
+    """
+    Trafic synthétique : lignes d'entraînement tirées avec remise, revenu médian décalé.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(X_train)[rng.integers(0, len(X_train), rows)]
+    values[:, 0] += 0.5
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument(
+        "--skip-log", action="store_true", help="Ne mesure pas la relecture du journal."
+    )
+    args = parser.parse_args()
+
+    X_train, _, _, _ = load_dataset().splits()
+    start = time.perf_counter()
+    reference = build_reference(X_train)
+    print(f"Référence ({len(X_train):,} lignes) : {time.perf_counter() - start:.2f}s")
+
+    print(f"{'lignes':>12}{'calcul s':>10}{'journal s':>11}  dérive")
+    for rows in args.rows:
+        values = traffic(X_train, rows)
+        start = time.perf_counter()
+        monitor = DriftMonitor(reference)
+        for offset in range(0, rows, args.chunk_size):
+            monitor.update(values[offset : offset + args.chunk_size])
+        result = monitor.result()
+        computed = time.perf_counter() - start
+
+        logged = float("nan")
+        if not args.skip_log:
+            with tempfile.TemporaryDirectory() as directory:
+                prediction_log = PredictionLogger(directory, max_queue=rows)
+                for offset in range(0, rows, 1000):
+                    batch = values[offset : offset + 1000]
+                    prediction_log.log(
+                        "/predict/batch", "bench", "1", batch, batch[:, 0], None
+                    )
+                prediction_log.stop()
+                start = time.perf_counter()
+                compute_drift(
+                    reference, iter_prediction_chunks(directory, args.chunk_size)
+                )
+                logged = time.perf_counter() - start
+        print(
+            f"{rows:>12,}{computed:>10.2f}{logged:>11.2f}  "
+            f"{', '.join(result['drifted_features'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
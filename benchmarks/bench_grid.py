@@ -0,0 +1,91 @@
+"""
+Benchmark de la grille de prédictions approchées face au modèle exact.
+
+Mesure, pour chaque nombre de caractéristiques `--features` et chaque résolution
+`--resolutions` :
+
+- le temps de construction de la grille (dépendance partielle et mesure de l'erreur) ;
+- sa taille en mémoire (Kio) ;
+- l'erreur absolue par rapport au modèle exact sur l'échantillon de test (médiane,
+  quantile 95 %, maximum), en centaines de milliers de dollars ;
+
+puis, pour la grille par défaut, la latence d'une prédiction unitaire et le débit par
+lot, face à `predict_row` et `predict` du moteur scikit-learn.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python -m benchmarks.bench_grid --features 2 3 4 --resolutions 8 16 32
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from src.api.backends import SklearnBackend
+from src.ml.dataset import load_dataset
+from src.ml.grid import PredictionGrid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-uri", default="models:/Production-model/1")
+    parser.add_argument("--features", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    sklearn = SklearnBackend(args.model_uri)
+    X_train, X_test, _, _ = load_dataset().splits()
+    X_train, X_test = X_train.to_numpy(), X_test.to_numpy()
+    exact = sklearn.predict(X_test)
+
+    print(
+        f"{'k':>3}{'résolution':>12}{'construction s':>16}{'Kio':>10}"
+        f"{'p50':>8}{'p95':>8}{'max':>8}"
+    )
+    for n_features in args.features:
+        for resolution in args.resolutions:
+            start = time.perf_counter()
+            grid = PredictionGrid.build(
+                sklearn.model, X_train, X_test, n_features, resolution
+            )
+            duration = time.perf_counter() - start
+            error = np.abs(grid.predict(X_test) - exact)
+            p50, p95, worst = np.quantile(error, (0.5, 0.95, 1.0))
+            print(
+                f"{n_features:>3}{resolution:>12}{duration:>16.2f}"
+                f"{grid.table.nbytes / 2**10:>10.0f}{p50:>8.3f}{p95:>8.3f}{worst:>8.3f}"
+            )
+
+    grid = PredictionGrid.build(sklearn.model, X_train, X_test)
+    row = X_test[:1]
+    engines = {
+        "exact": lambda X: sklearn.predict_row(X[0].tolist()),
+        "grille": grid.predict,
+    }
+    print(f"\n{'moteur':<10}{'ligne µs':>10}")
+    for name, predict in engines.items():
+        latencies = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            predict(row)
+            latencies.append(time.perf_counter() - start)
+        print(f"{name:<10}{np.median(latencies) * 1e6:>10.1f}")
+
+    rng = np.random.default_rng(0)
+    X = X_test[rng.integers(0, len(X_test), args.rows)]
+    print(f"\n{args.rows:,} lignes")
+    print(f"{'moteur':<10}{'lignes/s':>14}")
+    for name, predict in {"exact": sklearn.predict, "grille": grid.predict}.items():
+        start = time.perf_counter()
+        predict(X)
+        print(f"{name:<10}{args.rows / (time.perf_counter() - start):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark des moteurs d'inférence de l'API.
+
+Mesure la latence d'une prédiction unitaire (`predict_row`), telle qu'exécutée
+par "/predict", pour chaque moteur disponible, ainsi que le débit par lot.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python -m benchmarks.bench_inference_backends --iterations 2000 --batch-size 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.api.backends import BACKENDS, FEATURE_COLUMNS, load_backend
+
+ROW = [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]
+
+
+def bench_row(backend, iterations: int) -> np.ndarray:
+    """
+    Mesure la latence de `iterations` prédictions unitaires successives.
+
+    Returns:
+        np.ndarray: Latences en microsecondes.
+    """
+    for _ in range(50):
+        backend.predict_row(ROW)
+    latencies = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        backend.predict_row(ROW)
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1e6
+
+
+def bench_batch(backend, features: np.ndarray, repeat: int = 3) -> float:
+    """
+    Mesure le meilleur temps de prédiction d'un lot.
+
+    Returns:
+        float: Débit en lignes par seconde.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.predict(features)
+        best = min(best, time.perf_counter() - start)
+    return len(features) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-uri", default="models:/Production-model/1")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    features = np.tile(ROW, (args.batch_size, 1)) * rng.uniform(
+        0.9, 1.1, size=(args.batch_size, len(FEATURE_COLUMNS))
+    )
+
+    print(
+        f"{'moteur':<12}{'moy. µs':>10}{'p50 µs':>10}{'p99 µs':>10}"
+        f"{f'lot {args.batch_size} lignes/s':>26}"
+    )
+    for name in args.backends:
+        backend = load_backend(name, args.model_uri)
+        latencies = bench_row(backend, args.iterations)
+        throughput = bench_batch(backend, features)
+        print(
+            f"{name:<12}{latencies.mean():>10.1f}{np.percentile(latencies, 50):>10.1f}"
+            f"{np.percentile(latencies, 99):>10.1f}{throughput:>26,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
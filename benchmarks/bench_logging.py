@@ -0,0 +1,80 @@
+"""
+Benchmark de l'enregistrement MLflow du modèle (`log_model`).
+
+Compare le mode historique (signature inférée sur tout le jeu d'entraînement,
+enregistrement synchrone) au mode rapide (`fast=True` : signature sur un échantillon,
+paramètres et métriques en un appel, envoi du modèle en arrière-plan) :
+
+- "rendu" : durée avant que `log_model` ne rende la main au pipeline ;
+- "total" : durée jusqu'à la fin de l'envoi du modèle (`wait_for_uploads`).
+
+Le modèle est entraîné une fois (famille par défaut) sur California Housing,
+éventuellement agrandi `--scale` fois ; l'enregistrement se fait dans un dépôt
+MLflow temporaire.
+
+Usage :
+    python -m benchmarks.bench_logging --repeat 3 --scale 1 10
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_training import enlarge
+from src.ml.dataset import load_dataset
+from src.ml.train import MODEL_FAMILIES, evalute_model, log_model, wait_for_uploads
+
+
+def measure(model, params: dict, metrics: dict, X_train, fast: bool) -> tuple:
+    """
+    Durées (rendu, total) d'un enregistrement, en secondes.
+    """
+    start = time.perf_counter()
+    log_model(
+        model,
+        params,
+        metrics,
+        X_train,
+        experiment_name="bench_logging",
+        model_name="bench-model",
+        fast=fast,
+    )
+    returned = time.perf_counter() - start
+    wait_for_uploads()
+    return returned, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+    logging.getLogger("src.ml.train").setLevel(logging.WARNING)
+
+    X_train, X_test, y_train, y_test = load_dataset().splits()
+    estimator, params = MODEL_FAMILIES["gradient_boosting"]
+    model = estimator(**params, random_state=42).fit(X_train, y_train)
+    metrics = evalute_model(model, X_test, y_test)
+
+    with tempfile.TemporaryDirectory() as directory:
+        mlflow.set_tracking_uri(f"file:{directory}")
+        for scale in args.scale:
+            X, _ = enlarge(np.asarray(X_train), np.asarray(y_train), scale)
+            X = pd.DataFrame(X, columns=X_train.columns)
+            print(f"Signature sur {len(X):,} lignes d'entraînement")
+            print(f"{'mode':<12}{'rendu s':>10}{'total s':>10}")
+            for name, fast in (("historique", False), ("rapide", True)):
+                timings = [
+                    measure(model, params, metrics, X, fast) for _ in range(args.repeat)
+                ]
+                returned, total = np.median(timings, axis=0)
+                print(f"{name:<12}{returned:>10.2f}{total:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark du moteur d'inférence ONNX face à scikit-learn et au moteur compilé.
+
+Mesure :
+
+- la latence d'une prédiction unitaire (`predict_row`, médiane, en µs) ;
+- le débit par lot (meilleur de `--repeat` passages), pour chaque nombre de threads
+  onnxruntime de `--threads` ;
+- le démarrage à froid, dans un processus neuf : import, chargement du modèle et
+  première prédiction ("onnx" et "mmap" lisent les fichiers déjà copiés sur disque,
+  comme un worker) ;
+- la taille installée des dépendances de chaque moteur (paquets Python et leurs
+  dépendances), qui détermine celle d'une image ne servant que ce moteur.
+
+L'export ONNX est produit à la volée (`to_onnx`) à partir du modèle enregistré.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`) et l'export ONNX installé
+(`pip install skl2onnx onnxruntime`).
+
+Usage :
+    python -m benchmarks.bench_onnx --rows 1000 100000 1000000 --threads 1 0
+"""
+
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from src.api import backends
+from src.api.backends import (
+    CompiledBackend,
+    OnnxBackend,
+    SklearnBackend,
+    cache_name,
+    materialize_model,
+)
+from src.ml.dataset import load_dataset
+from src.ml.onnx_export import to_onnx
+
+# Code de démarrage à froid de chaque moteur, exécuté dans un interpréteur neuf
+STARTUP_CODE = (
+    "import time; start = time.perf_counter(); "
+    "from src.api.backends import load_backend; "
+    "backend = load_backend('{backend}', '{model_uri}'); "
+    "backend.predict_row([8.3, 41.0, 6.9, 1.0, 322.0, 2.5, 37.88, -122.23]); "
+    "print(time.perf_counter() - start)"
+)
+
+# Paquets racines importés par chaque moteur pour servir le modèle
+RUNTIME_PACKAGES = {
+    "sklearn": ["mlflow", "scikit-learn", "pandas"],
+    "mmap": ["mlflow", "numpy"],
+    "onnx": ["mlflow", "onnxruntime"],
+}
+
+
+def closure(packages: list[str]) -> set[str]:
+    """
+    Distributions installées nécessaires à des paquets (dépendances obligatoires, récursivement).
+    """
+    seen, stack = set(), list(packages)
+    while stack:
+        name = re.split(r"[ ;<>=!~\[(]", stack.pop(), maxsplit=1)[0].lower()
+        if name in seen:
+            continue
+        try:
+            requirements = metadata.requires(name) or []
+        except metadata.PackageNotFoundError:
+            continue
+        seen.add(name)
+        stack.extend(r for r in requirements if "extra ==" not in r)
+    return seen
+
+
+def installed_size(distributions: set[str]) -> float:
+    """
+    Taille installée (Mo) d'un ensemble de distributions.
+    """
+    total = 0
+    for name in distributions:
+        for file in metadata.distribution(name).files or []:
+            path = Path(file.locate())
+            if path.is_file():
+                total += path.stat().st_size
+    return total / 2**20
+
+
+def cold_start(backend: str, model_uri: str, env: dict, repeat: int) -> float:
+    """
+    Médiane (s) du démarrage à froid d'un moteur jusqu'à sa première prédiction.
+    """
+    durations = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_CODE.format(**locals())],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, **env},
+        )
+        durations.append(float(output.stdout.strip().splitlines()[-1]))
+    return float(np.median(durations))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-uri", default="models:/Production-model/1")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    # Modèles copiés sur disque dans un répertoire dédié, comme pour un worker :
+    # le fichier ONNX à l'emplacement attendu par `materialize_onnx`
+    directory = Path(tempfile.mkdtemp(prefix="bench-onnx-"))
+    backends.MODEL_MMAP_DIR = directory
+    env = {"MODEL_MMAP_DIR": str(directory)}
+    sklearn = SklearnBackend(args.model_uri)
+    X_train, X_test, _, _ = load_dataset().splits()
+    onnx_model = to_onnx(sklearn.model, X_train[:1000])
+    (directory / f"{cache_name(args.model_uri)}.onnx").write_bytes(
+        onnx_model.SerializeToString()
+    )
+    materialize_model(args.model_uri)
+
+    engines = {"sklearn": sklearn, "compiled": CompiledBackend(args.model_uri)}
+    for threads in args.threads:
+        engines[f"onnx ({threads or 'auto'} threads)"] = OnnxBackend(
+            args.model_uri, threads=threads
+        )
+
+    row = X_test.to_numpy()[0].tolist()
+    print(f"{'moteur':<24}{'ligne µs':>10}")
+    for name, engine in engines.items():
+        latencies = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            engine.predict_row(row)
+            latencies.append(time.perf_counter() - start)
+        print(f"{name:<24}{np.median(latencies) * 1e6:>10.1f}")
+
+    rng = np.random.default_rng(0)
+    for rows in args.rows:
+        X = X_test.to_numpy()[rng.integers(0, len(X_test), rows)]
+        expected = sklearn.predict(X)
+        print(f"\n{rows:,} lignes")
+        print(f"{'moteur':<24}{'lignes/s':>14}{'écart max':>12}")
+        for name, engine in engines.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                predictions = engine.predict(X)
+                best = min(best, time.perf_counter() - start)
+            error = np.max(np.abs(predictions - expected))
+            print(f"{name:<24}{rows / best:>14,.0f}{error:>12.1e}")
+
+    print(f"\n{'moteur':<12}{'démarrage s':>14}{'dépendances Mo':>16}")
+    for backend, packages in RUNTIME_PACKAGES.items():
+        startup = cold_start(backend, args.model_uri, env, args.repeat)
+        size = installed_size(closure(packages))
+        print(f"{backend:<12}{startup:>14.2f}{size:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark de l'inférence float32 du moteur compilé, face au float64 et à scikit-learn.
+
+Pour chaque taille de lot, mesure le débit (meilleur de `--repeat` passages), le pic
+de mémoire allouée pendant la prédiction (tracemalloc : copies des caractéristiques
+et tableaux intermédiaires) et l'écart maximal aux prédictions de scikit-learn. Les
+lignes sont tirées de l'ensemble de test de California Housing, avec remise.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python -m benchmarks.bench_precision --rows 100000 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.api.backends import load_sklearn_model
+from src.ml.compiled import CompiledGradientBoosting
+from src.ml.dataset import load_dataset
+
+
+def measure(predict, X: np.ndarray, repeat: int) -> tuple[float, float, np.ndarray]:
+    """
+    Débit (lignes/s), pic de mémoire allouée (Mo) et prédictions d'un moteur.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predictions = predict(X)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    predict(X)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return len(X) / best, peak, predictions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-uri", default="models:/Production-model/1")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model = load_sklearn_model(args.model_uri)
+    engines = {"float64": CompiledGradientBoosting.from_sklearn(model)}
+    engines["float32"] = engines["float64"].astype(np.float32)
+    for name, engine in engines.items():
+        size = sum(
+            array.nbytes for array in (engine.feature, engine.threshold, engine.value)
+        )
+        print(f"Tableaux du modèle {name} : {size / 2**10:.0f} Kio")
+
+    _, X_test, _, _ = load_dataset().splits()
+    rng = np.random.default_rng(0)
+    for rows in args.rows:
+        X = X_test.to_numpy()[rng.integers(0, len(X_test), rows)]
+        throughput, peak, expected = measure(model.predict, X, args.repeat)
+        print(f"\n{rows:,} lignes")
+        print(f"{'moteur':<12}{'lignes/s':>12}{'pic Mo':>10}{'écart max':>12}")
+        print(f"{'sklearn':<12}{throughput:>12,.0f}{peak:>10.1f}{0:>12.1e}")
+        for name, engine in engines.items():
+            throughput, peak, predictions = measure(engine.predict, X, args.repeat)
+            error = np.max(np.abs(predictions - expected))
+            print(f"{name:<12}{throughput:>12,.0f}{peak:>10.1f}{error:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark de la prédiction par lot de fichiers (`src/ml/score.py`).
+
+Génère un fichier synthétique de `--rows` lignes dans chaque format de `--formats`.
+Les lignes sont tirées de l'échantillon de test, avec un léger bruit multiplicatif.
+Le fichier est écrit par blocs, sans jamais tenir en mémoire. Le benchmark mesure
+ensuite, pour chaque format :
+
+- la lecture seule (`read_chunks`), en lignes/s ;
+- la prédiction complète (lecture, calcul, écriture d'un CSV), en lignes/s, pour
+  chaque nombre de processus de `--workers` ;
+- le pic de mémoire résidente du processus parent et des processus de calcul, qui
+  doit rester borné par la taille des blocs.
+
+Chaque mesure s'exécute dans un processus neuf, pour isoler les pics de mémoire.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python -m benchmarks.bench_scoring --rows 10000000 --workers 0 1 2 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.ml.dataset import load_dataset
+from src.ml.score import INPUT_FIELDS
+
+# Mesure exécutée dans un processus neuf : débit et pics de mémoire (Mio). Le pic du
+# processus lui-même est lu dans /proc (VmHWM, remis à zéro par exec, contrairement à
+# `ru_maxrss` qui garderait celui du benchmark)
+MEASURE_CODE = """
+import json, re, resource, sys, time
+from src.ml.score import read_chunks, score_file
+source, output, workers, chunk_size = sys.argv[1:5]
+start = time.perf_counter()
+if workers == "read":
+    rows = sum(len(values) for values in read_chunks(source, int(chunk_size)))
+else:
+    rows = score_file(source, output, "models:/Production-model/1",
+                      workers=int(workers), chunk_size=int(chunk_size))
+duration = time.perf_counter() - start
+print(json.dumps({
+    "rows_per_s": rows / duration,
+    "parent_mib": int(re.search(r"VmHWM:\s+(\d+)", open("/proc/self/status").read())[1]) / 2**10,
+    "worker_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 2**10,
+}))
+"""
+
+
+def generate(path: Path, rows: int, chunk_size: int = 1_000_000) -> None:
+    """
+    Écrit un fichier synthétique de `rows` lignes (colonnes `INPUT_FIELDS`), par blocs.
+    """
+    _, X_test, _, _ = load_dataset().splits()
+    sample = X_test.to_numpy()
+    rng = np.random.default_rng(0)
+    writer = None
+    with path.open("wb") as file:
+        for start in range(0, rows, chunk_size):
+            size = min(chunk_size, rows - start)
+            values = sample[rng.integers(0, len(sample), size)]
+            values = values * rng.normal(1, 0.01, size=values.shape)
+            frame = pd.DataFrame(values, columns=INPUT_FIELDS)
+            if path.suffix == ".csv":
+                frame.to_csv(file, header=start == 0, index=False)
+            elif path.suffix == ".jsonl":
+                frame.to_json(file, orient="records", lines=True)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                writer = writer or pq.ParquetWriter(file, table.schema)
+                writer.write_table(table, row_group_size=100_000)
+        if writer is not None:
+            writer.close()
+
+
+def measure(source: Path, output: Path, workers: str, chunk_size: int) -> dict:
+    """
+    Exécute une mesure dans un processus neuf et retourne ses résultats.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            MEASURE_CODE,
+            str(source),
+            str(output),
+            workers,
+            str(chunk_size),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "parquet", "jsonl"])
+    parser.add_argument(
+        "--workers", nargs="+", default=sorted({"0", "1", str(os.cpu_count())})
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    directory = Path(tempfile.mkdtemp(prefix="bench-scoring-"))
+    print(
+        f"{os.cpu_count()} cœur(s), {args.rows:,} lignes, blocs de {args.chunk_size:,}"
+    )
+    print(
+        f"{'format':<10}{'processus':>10}{'Mo':>8}{'génération s':>14}"
+        f"{'lignes/s':>12}{'parent Mio':>12}{'worker Mio':>12}"
+    )
+    for kind in args.formats:
+        source = directory / f"input.{kind}"
+        start = time.perf_counter()
+        generate(source, args.rows)
+        generation = time.perf_counter() - start
+        size = source.stat().st_size / 2**20
+        for workers in ["read", *args.workers]:
+            result = measure(source, directory / "output.csv", workers, args.chunk_size)
+            print(
+                f"{kind:<10}{workers:>10}{size:>8.0f}{generation:>14.1f}"
+                f"{result['rows_per_s']:>12,.0f}{result['parent_mib']:>12.0f}"
+                f"{result['worker_mib']:>12.0f}"
+            )
+        source.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark des caractéristiques de voisinage spatial (`src/ml/spatial.py`).
+
+Mesure, sur California Housing et sur des copies agrandies (`enlarge`) :
+
+- "construction" : construction de l'arbre KD sur les districts d'entraînement ;
+- "entraînement" : agrégats de tous les districts d'entraînement (`fit_transform`) ;
+- "lot" : agrégats de l'ensemble de test, requêtes groupées ;
+- "ligne" : latence d'une requête d'une ligne (`transform`, comme l'API), en µs.
+
+Compare ensuite les métriques de test de `evalute_model` avec et sans les
+caractéristiques spatiales, pour chaque famille de `MODEL_FAMILIES`.
+
+Usage :
+    python -m benchmarks.bench_spatial --scales 1 10 --neighbors 8
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.bench_training import enlarge
+from src.ml.dataset import load_dataset
+from src.ml.spatial import SpatialNeighborFeatures, with_spatial_features
+from src.ml.train import MODEL_FAMILIES, evalute_model
+
+
+def best_of(function, repeat: int) -> float:
+    """
+    Meilleure durée (s) de `repeat` appels.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--neighbors", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument(
+        "--families",
+        nargs="+",
+        choices=list(MODEL_FAMILIES),
+        default=["gradient_boosting"],
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    X_train, X_test, y_train, y_test = load_dataset().splits()
+    X_test_values = X_test.to_numpy()
+
+    print(
+        f"{'échelle':<10}{'districts':>12}{'construction s':>16}"
+        f"{'entraînement s':>16}{'lot s':>8}{'ligne µs':>10}"
+    )
+    for scale in args.scales:
+        X, y = enlarge(X_train.to_numpy(), y_train.to_numpy(), scale)
+        transformer = SpatialNeighborFeatures(n_neighbors=args.neighbors)
+        build = best_of(lambda: transformer.fit(X, y), args.repeat)
+        train = best_of(lambda: transformer.fit_transform(X, y), 1)
+        batch = best_of(lambda: transformer.transform(X_test_values), args.repeat)
+        row = X_test_values[:1]
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            transformer.transform(row)
+        latency = (time.perf_counter() - start) / args.iterations * 1e6
+        print(
+            f"{scale:<10}{len(X):>12,}{build:>16.3f}{train:>16.3f}"
+            f"{batch:>8.3f}{latency:>10.0f}"
+        )
+
+    print(f"\n{'modèle':<36}{'MSE':>8}{'MAE':>8}{'R2':>8}{'entraînement s':>16}")
+    for family in args.families:
+        estimator, params = MODEL_FAMILIES[family]
+        for spatial in (False, True):
+            model = estimator(**params, random_state=42)
+            if spatial:
+                model = with_spatial_features(model, args.neighbors)
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            duration = time.perf_counter() - start
+            scores = evalute_model(model, X_test, y_test)
+            name = f"{family}{' + spatial' if spatial else ''}"
+            print(
+                f"{name:<36}{scores['mean_squared_error']:>8.4f}"
+                f"{scores['mean_absolute_error']:>8.4f}{scores['r2']:>8.4f}"
+                f"{duration:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark du démarrage de l'API.
+
+Mesure, dans des processus neufs :
+- le temps d'import du module `src.api.app` ;
+- le temps entre le lancement d'uvicorn et la première réponse de "/" (vivacité) ;
+- le temps entre le lancement d'uvicorn et la première prédiction réussie de "/predict".
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python benchmarks/bench_startup.py --repeat 3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+PAYLOAD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+IMPORT_CODE = (
+    "import time; start = time.perf_counter(); import src.api.app; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import() -> float:
+    """
+    Mesure le temps d'import du module de l'API dans un interpréteur neuf.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_CODE], capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def measure_server(port: int, env: dict) -> tuple[float, float]:
+    """
+    Lance uvicorn et mesure le temps jusqu'à la première requête et la première prédiction.
+
+    Returns:
+        tuple: (secondes jusqu'à la réponse de "/", secondes jusqu'à la première prédiction)
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.api.app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, **env},
+    )
+    first_request = first_prediction = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            while first_prediction is None:
+                if time.perf_counter() - start > 300:
+                    raise RuntimeError("L'API n'a pas démarré à temps.")
+                try:
+                    if first_request is None:
+                        client.get("/").raise_for_status()
+                        first_request = time.perf_counter() - start
+                    if client.post("/predict", json=PAYLOAD).status_code == 200:
+                        first_prediction = time.perf_counter() - start
+                except httpx.TransportError:
+                    time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait()
+    return first_request, first_prediction
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--backend", default=os.getenv("INFERENCE_BACKEND", "pyfunc"))
+    args = parser.parse_args()
+
+    env = {"INFERENCE_BACKEND": args.backend}
+    imports, requests, predictions = [], [], []
+    for _ in range(args.repeat):
+        imports.append(measure_import())
+        first_request, first_prediction = measure_server(args.port, env)
+        requests.append(first_request)
+        predictions.append(first_prediction)
+
+    print(f"moteur : {args.backend} (médiane sur {args.repeat} démarrages)")
+    print(f"import de src.api.app          : {np.median(imports):.2f} s")
+    print(f'première requête ("/")         : {np.median(requests):.2f} s')
+    print(f'première prédiction ("/predict"): {np.median(predictions):.2f} s')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark d'entraînement des familles de modèles.
+
+Compare, pour chaque famille de `MODEL_FAMILIES` (hyperparamètres par défaut), le
+temps d'entraînement, le débit de prédiction, le pic de mémoire (RSS) et les
+métriques de test de `evalute_model`, sur le jeu California Housing et sur des
+copies agrandies synthétiquement (lignes dupliquées et légèrement bruitées).
+
+Chaque mesure s'exécute dans un processus neuf pour isoler le pic de mémoire.
+L'ensemble de test est toujours celui du jeu d'origine.
+
+Usage :
+    python -m benchmarks.bench_training --scales 1 10 100
+"""
+
+import argparse
+import logging
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from src.ml.dataset import load_dataset
+from src.ml.train import MODEL_FAMILIES, evalute_model
+
+
+def enlarge(X: np.ndarray, y: np.ndarray, scale: int, seed: int = 0) -> tuple:
+    """
+    Duplique `scale` fois les données, en bruitant les copies (1 % de l'écart-type).
+    """
+    if scale == 1:
+        return X, y
+    rng = np.random.default_rng(seed)
+    X_large = np.tile(X, (scale, 1))
+    y_large = np.tile(y, scale)
+    X_large += rng.normal(0, 0.01, X_large.shape) * X.std(axis=0)
+    y_large += rng.normal(0, 0.01, y_large.shape) * y.std()
+    return X_large, y_large
+
+
+def measure(family: str, scale: int, predict_rows: int) -> dict:
+    """
+    Entraîne et évalue une famille de modèles, dans un processus dédié.
+    """
+    logging.getLogger("src.ml.train").setLevel(logging.WARNING)
+    X_train, X_test, y_train, y_test = (
+        np.asarray(part) for part in load_dataset().splits()
+    )
+    X_train, y_train = enlarge(X_train, y_train, scale)
+    estimator, params = MODEL_FAMILIES[family]
+    model = estimator(**params, random_state=42)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    features = np.resize(X_test, (predict_rows, X_test.shape[1]))
+    start = time.perf_counter()
+    model.predict(features)
+    throughput = predict_rows / (time.perf_counter() - start)
+
+    return {
+        "rows": len(X_train),
+        "fit_seconds": fit_seconds,
+        "throughput": throughput,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        **evalute_model(model, X_test, y_test),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--models", nargs="+", default=list(MODEL_FAMILIES))
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--predict-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'famille':<24}{'lignes':>11}{'fit s':>9}{'prédictions/s':>15}"
+        f"{'pic RSS Mo':>12}{'MSE':>8}{'MAE':>8}{'R²':>8}"
+    )
+    for scale in args.scales:
+        for family in args.models:
+            # Processus neuf par mesure : ru_maxrss ne reflète que cet entraînement
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(
+                    measure, family, scale, args.predict_rows
+                ).result()
+            print(
+                f"{family:<24}{result['rows']:>11,}{result['fit_seconds']:>9.1f}"
+                f"{result['throughput']:>15,.0f}{result['peak_rss_mb']:>12.0f}"
+                f"{result['mean_squared_error']:>8.3f}"
+                f"{result['mean_absolute_error']:>8.3f}{result['r2']:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark du service multi-processus.
+
+Lance `python -m src.api.serve --workers N` pour plusieurs nombres de workers,
+envoie des requêtes concurrentes à "/predict" et affiche le débit ainsi que la
+mémoire totale de l'arbre de processus : RSS (pages partagées comptées dans chaque
+processus) et PSS (pages partagées réparties entre les processus, Linux uniquement).
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python benchmarks/bench_workers.py --workers 1 2 4 8 --backend mmap
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+PAYLOAD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+def process_tree(pid: int) -> list[int]:
+    """
+    Retourne le processus `pid` et tous ses descendants (lecture de /proc).
+    """
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def memory_mb(pids: list[int]) -> tuple[float, float]:
+    """
+    Somme la RSS et la PSS (en Mo) d'une liste de processus.
+    """
+    rss = pss = 0
+    for pid in pids:
+        try:
+            rollup = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+        except OSError:
+            continue
+        for line in rollup:
+            key, *value = line.split()
+            if key == "Rss:":
+                rss += int(value[0])
+            elif key == "Pss:":
+                pss += int(value[0])
+    return rss / 1024, pss / 1024
+
+
+async def load(url: str, n_requests: int, concurrency: int) -> float:
+    """
+    Envoie `n_requests` requêtes avec `concurrency` clients et retourne le débit.
+    """
+    remaining = iter(range(n_requests))
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            for _ in remaining:
+                (await client.post(url, json=PAYLOAD)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n_requests / (time.perf_counter() - start)
+
+
+def run(workers: int, backend: str, port: int, n_requests: int, concurrency: int):
+    """
+    Mesure le débit et la mémoire de l'API lancée avec `workers` processus.
+    """
+    env = {**os.environ, "INFERENCE_BACKEND": backend}
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.api.serve",
+            "--workers",
+            str(workers),
+            "--port",
+            str(port),
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 300
+        # Attendre que tous les workers aient chargé le modèle ; avec un seul worker,
+        # uvicorn sert directement depuis le processus lancé
+        n_processes = workers + 1 if workers > 1 else 1
+        while len(process_tree(process.pid)) < n_processes or not all_ready(base_url):
+            if time.monotonic() > deadline:
+                raise RuntimeError("L'API n'a pas démarré à temps.")
+            time.sleep(0.5)
+        asyncio.run(load(f"{base_url}/predict", 20 * workers, concurrency))
+        throughput = asyncio.run(load(f"{base_url}/predict", n_requests, concurrency))
+        rss, pss = memory_mb(process_tree(process.pid))
+    finally:
+        process.terminate()
+        process.wait()
+    return throughput, rss, pss
+
+
+def all_ready(base_url: str, attempts: int = 20) -> bool:
+    """
+    Vérifie que plusieurs appels successifs à "/ready" (répartis sur les workers) réussissent.
+    """
+    try:
+        with httpx.Client(base_url=base_url, timeout=5) as client:
+            return all(client.get("/ready").status_code == 200 for _ in range(attempts))
+    except httpx.TransportError:
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backend", default="mmap")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    print(f"moteur : {args.backend}, {os.cpu_count()} cœur(s)")
+    print(f"{'workers':>8}{'req/s':>10}{'RSS Mo':>10}{'PSS Mo':>10}")
+    for workers in args.workers:
+        throughput, rss, pss = run(
+            workers, args.backend, args.port, args.requests, args.concurrency
+        )
+        print(f"{workers:>8}{throughput:>10.0f}{rss:>10.0f}{pss:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
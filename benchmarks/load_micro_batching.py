@@ -0,0 +1,145 @@
+"""
+Test de charge du micro-batching de "/predict".
+
+Lance l'API dans un processus uvicorn pour chaque configuration (sans regroupement,
+puis avec plusieurs délais d'attente), envoie des requêtes concurrentes à plusieurs
+niveaux de concurrence et affiche la latence p50/p99 et le débit obtenus.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python benchmarks/load_micro_batching.py --requests 2000 --concurrency 1 8 32 128
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+PAYLOAD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+# (nom, variables d'environnement de l'API)
+CONFIGURATIONS = [
+    ("sans regroupement", {"MICRO_BATCHING_ENABLED": "0"}),
+    (
+        "regroupement 1 ms / 64",
+        {
+            "MICRO_BATCHING_ENABLED": "1",
+            "MICRO_BATCH_MAX_WAIT_MS": "1",
+            "MICRO_BATCH_MAX_SIZE": "64",
+        },
+    ),
+    (
+        "regroupement 5 ms / 256",
+        {
+            "MICRO_BATCHING_ENABLED": "1",
+            "MICRO_BATCH_MAX_WAIT_MS": "5",
+            "MICRO_BATCH_MAX_SIZE": "256",
+        },
+    ),
+]
+
+
+def start_server(env: dict, port: int) -> subprocess.Popen:
+    """
+    Lance l'API avec uvicorn et attend qu'elle réponde.
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.api.app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("L'API n'a pas démarré à temps.")
+
+
+async def run_level(url: str, n_requests: int, concurrency: int) -> dict:
+    """
+    Envoie `n_requests` requêtes avec `concurrency` clients simultanés.
+
+    Returns:
+        dict: Latences p50/p99 en millisecondes et débit en requêtes par seconde.
+    """
+    latencies = []
+    remaining = iter(range(n_requests))
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.post(url, json=PAYLOAD)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "rps": n_requests / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}/predict"
+    print(
+        f"{'configuration':<26}{'clients':>8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    )
+    for name, env in CONFIGURATIONS:
+        process = start_server(env, args.port)
+        try:
+            # Échauffement
+            asyncio.run(run_level(url, 50, 4))
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_level(url, args.requests, concurrency))
+                print(
+                    f"{name:<26}{concurrency:>8}{result['p50_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['rps']:>10.0f}"
+                )
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
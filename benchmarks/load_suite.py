@@ -0,0 +1,400 @@
+"""
+Suite de tests de charge reproductibles de l'API de prédiction.
+
+Rejoue des requêtes contre l'application FastAPI, dans ce processus (transport ASGI,
+sans réseau) ou dans un processus uvicorn local, en balayant le nombre de clients
+simultanés et la taille des requêtes (1 ligne : "/predict" ; N lignes :
+"/predict/batch"). Les requêtes proviennent :
+
+- d'une distribution synthétique (`--source synthetic`) : lignes tirées du jeu de
+  test California Housing du dépôt local, légèrement bruitées, avec une graine ;
+- d'un journal de requêtes enregistré (`--source requetes.jsonl`) : une ligne JSON
+  par enregistrement `Input`, ou un objet dont la clé "request" contient
+  l'enregistrement ou la liste d'enregistrements.
+
+Pour chaque configuration, le résultat JSON donne le débit, les percentiles de
+latence, l'utilisation CPU et la mémoire résidente du serveur (en mode "inprocess",
+celles de ce processus, client compris). `compare` confronte
+un résultat à une référence enregistrée et échoue (code 1) au-delà de la tolérance.
+
+Prérequis : un modèle enregistré (`python -m src.ml.train`).
+
+Usage :
+    python -m benchmarks.load_suite run --targets inprocess uvicorn \\
+        --concurrency 1 8 32 --batch-sizes 1 100 --output resultats.json
+    python -m benchmarks.load_suite compare resultats.json \\
+        benchmarks/baseline_load_suite.json --tolerance 0.2 \\
+        --metric-tolerance latency_p99_ms=0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Colonnes du jeu de données, dans l'ordre des champs de `Input`
+FEATURES = {
+    "medinc": "MedInc",
+    "houseage": "HouseAge",
+    "averooms": "AveRooms",
+    "avebedrms": "AveBedrms",
+    "population": "Population",
+    "aveoccup": "AveOccup",
+    "latitude": "Latitude",
+    "longitude": "Longitude",
+}
+
+# Métriques comparées à la référence : sens de l'amélioration (+1 : plus haut est mieux)
+COMPARED_METRICS = {
+    "throughput_rps": 1,
+    "latency_p50_ms": -1,
+    "latency_p99_ms": -1,
+}
+
+
+def synthetic_records(n: int, seed: int = 0, noise: float = 0.01) -> list[dict]:
+    """
+    Tire `n` enregistrements du jeu de test California Housing, bruités de `noise`
+    écart-type par caractéristique.
+    """
+    from src.ml.dataset import load_dataset
+
+    X = np.asarray(load_dataset().split("test")[0])
+    rng = np.random.default_rng(seed)
+    rows = X[rng.integers(0, len(X), n)]
+    rows = rows + rng.normal(0, noise, rows.shape) * X.std(axis=0)
+    return [dict(zip(FEATURES, map(float, row))) for row in rows]
+
+
+def replay_records(path: str | Path) -> list[dict]:
+    """
+    Lit les enregistrements d'un journal de requêtes JSONL.
+    """
+    records = []
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                entry = json.loads(line)
+                entry = entry.get("request", entry)
+                records.extend(entry if isinstance(entry, list) else [entry])
+    return records
+
+
+def make_payloads(records: list[dict], batch_size: int, n_requests: int) -> list:
+    """
+    Découpe les enregistrements en `n_requests` corps de requête de `batch_size` lignes,
+    en reprenant au début de la liste si besoin.
+    """
+    payloads = []
+    for i in range(n_requests):
+        start = (i * batch_size) % len(records)
+        rows = [records[(start + j) % len(records)] for j in range(batch_size)]
+        payloads.append(rows[0] if batch_size == 1 else rows)
+    return payloads
+
+
+def process_usage(pid: int | None) -> tuple[float, float]:
+    """
+    Temps CPU cumulé (s) et mémoire résidente (Mo) d'un processus (None : ce processus).
+    """
+    if pid is None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        rss = Path("/proc/self/statm").read_text().split()[1]
+        return (
+            usage.ru_utime + usage.ru_stime,
+            int(rss) * os.sysconf("SC_PAGE_SIZE") / 2**20,
+        )
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return cpu, int(fields[21]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+async def run_level(
+    client: httpx.AsyncClient, payloads: list, concurrency: int, pid: int | None
+) -> dict:
+    """
+    Envoie les requêtes avec `concurrency` clients simultanés et mesure le serveur.
+
+    Returns:
+        dict: Nombre de requêtes et d'erreurs, débit, latences, CPU et RSS.
+    """
+    latencies, errors = [], 0
+    remaining = iter(payloads)
+
+    async def worker() -> None:
+        nonlocal errors
+        for payload in remaining:
+            url = "/predict" if isinstance(payload, dict) else "/predict/batch"
+            start = time.perf_counter()
+            response = await client.post(url, json=payload)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    cpu_before, _ = process_usage(pid)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu_after, rss = process_usage(pid)
+
+    latencies = np.array(latencies) * 1000
+    rows = sum(1 if isinstance(payload, dict) else len(payload) for payload in payloads)
+    return {
+        "requests": len(payloads),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(payloads) / elapsed,
+        "rows_per_s": rows / elapsed,
+        "latency_mean_ms": float(latencies.mean()),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p90_ms": float(np.percentile(latencies, 90)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        "latency_max_ms": float(latencies.max()),
+        "cpu_percent": 100 * (cpu_after - cpu_before) / elapsed,
+        "rss_mb": rss,
+    }
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """
+    Lance l'API avec uvicorn et attend que le modèle soit prêt.
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.api.app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ]
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("L'API n'a pas démarré à temps.")
+
+
+async def sweep(
+    client: httpx.AsyncClient,
+    target: str,
+    records: list[dict],
+    args: argparse.Namespace,
+    pid: int | None,
+) -> list[dict]:
+    """
+    Mesure chaque combinaison (clients simultanés, taille des requêtes) sur une cible.
+    """
+    results = []
+    for batch_size in args.batch_sizes:
+        # Échauffement : chargement du modèle, connexions et caches
+        await run_level(client, make_payloads(records, batch_size, 20), 4, pid)
+        for concurrency in args.concurrency:
+            payloads = make_payloads(records, batch_size, args.requests)
+            result = await run_level(client, payloads, concurrency, pid)
+            results.append(
+                {
+                    "target": target,
+                    "concurrency": concurrency,
+                    "batch_size": batch_size,
+                    **result,
+                }
+            )
+            print(
+                f"{target:<10}{concurrency:>8}{batch_size:>8}"
+                f"{result['throughput_rps']:>10.0f}{result['latency_p50_ms']:>10.2f}"
+                f"{result['latency_p99_ms']:>10.2f}{result['cpu_percent']:>8.0f}"
+                f"{result['rss_mb']:>8.0f}"
+            )
+    return results
+
+
+async def run_target(target: str, records: list[dict], args) -> list[dict]:
+    """
+    Exécute le balayage sur l'application dans ce processus ou sur un serveur uvicorn.
+    """
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    if target == "inprocess":
+        from src.api.app import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api", limits=limits, timeout=60
+        ) as client:
+            return await sweep(client, target, records, args, None)
+
+    process = start_server(args.port)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60
+        ) as client:
+            return await sweep(client, target, records, args, process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(args: argparse.Namespace) -> dict:
+    """
+    Exécute la suite et retourne le rapport JSON (métadonnées et résultats).
+    """
+    if args.source == "synthetic":
+        records = synthetic_records(max(args.batch_sizes) * 10, seed=args.seed)
+    else:
+        records = replay_records(args.source)
+
+    print(
+        f"{'cible':<10}{'clients':>8}{'lignes':>8}{'req/s':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'CPU %':>8}{'RSS Mo':>8}"
+    )
+    results = []
+    for target in args.targets:
+        results += asyncio.run(run_target(target, records, args))
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "inference_backend": os.getenv("INFERENCE_BACKEND", "pyfunc"),
+            "source": args.source,
+            "seed": args.seed,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    tolerance: float,
+    metric_tolerances: dict[str, float] | None = None,
+) -> list[str]:
+    """
+    Compare un rapport à une référence, configuration par configuration.
+
+    Une métrique de `COMPARED_METRICS` régresse si elle se dégrade de plus de
+    `tolerance` (ex. 0.2 : débit inférieur de plus de 20 %, latence supérieure de
+    plus de 20 %). Les erreurs absentes de la référence sont aussi des régressions,
+    de même qu'une configuration présente dans un seul des deux rapports : sinon, une
+    configuration retirée de la suite ou ajoutée sans référence passerait inaperçue.
+
+    Args:
+        current (dict): Rapport à vérifier.
+        baseline (dict): Rapport de référence.
+        tolerance (float): Dégradation relative admise.
+        metric_tolerances (dict, optional): Tolérances propres à certaines métriques
+            (ex. {"latency_p99_ms": 0.5}, le p99 étant plus bruité). Defaults to None.
+
+    Returns:
+        list[str]: Description des régressions (vide si aucune).
+    """
+
+    def key(result: dict) -> tuple:
+        return result["target"], result["concurrency"], result["batch_size"]
+
+    reference = {key(result): result for result in baseline["results"]}
+    measured = {key(result) for result in current["results"]}
+    regressions = [
+        "{} clients={} lignes={} : absente du rapport".format(*configuration)
+        for configuration in reference
+        if configuration not in measured
+    ]
+    for result in current["results"]:
+        label = "{} clients={} lignes={}".format(*key(result))
+        expected = reference.get(key(result))
+        if expected is None:
+            regressions.append(f"{label} : absente de la référence")
+            continue
+        if result["errors"] > expected["errors"]:
+            regressions.append(
+                f"{label} : {result['errors']} erreurs (référence {expected['errors']})"
+            )
+        for metric, direction in COMPARED_METRICS.items():
+            change = (result[metric] - expected[metric]) / expected[metric]
+            if change * direction < -(metric_tolerances or {}).get(metric, tolerance):
+                regressions.append(
+                    f"{label} : {metric} {result[metric]:.2f} contre "
+                    f"{expected[metric]:.2f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Exécute la suite de charge.")
+    run_parser.add_argument(
+        "--targets", nargs="+", choices=["inprocess", "uvicorn"], default=["inprocess"]
+    )
+    run_parser.add_argument("--source", default="synthetic")
+    run_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    run_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100])
+    run_parser.add_argument("--requests", type=int, default=500)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--port", type=int, default=8768)
+    run_parser.add_argument("--output", help="Fichier JSON du rapport.")
+    run_parser.add_argument("--baseline", help="Rapport de référence à comparer.")
+    run_parser.add_argument("--tolerance", type=float, default=0.2)
+    run_parser.add_argument(
+        "--metric-tolerance", nargs="+", default=[], metavar="METRIQUE=TOLERANCE"
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare à une référence.")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--tolerance", type=float, default=0.2)
+    compare_parser.add_argument(
+        "--metric-tolerance", nargs="+", default=[], metavar="METRIQUE=TOLERANCE"
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run(args)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2))
+        baseline = args.baseline
+    else:
+        report = json.loads(Path(args.current).read_text())
+        baseline = args.baseline
+    if baseline is None:
+        return
+
+    metric_tolerances = {
+        metric: float(value)
+        for metric, value in (item.split("=") for item in args.metric_tolerance)
+    }
+    regressions = compare(
+        report,
+        json.loads(Path(baseline).read_text()),
+        args.tolerance,
+        metric_tolerances,
+    )
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"Aucune régression au-delà de {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,28 @@
-from fastapi import FastAPI
-import mlflow.pyfunc
+import logging
+import os
+import secrets
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
 import numpy as np
-import pandas as pd
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from src.api.backends import Backend
+from src.api.batching import MicroBatcher
+from src.api.cache import PredictionCache
+from src.api.loader import ModelLoader, ModelNotReady, ServedModel
+from src.api.metrics import ApiMetrics, MetricsMiddleware, elapsed, mark
+from src.api.prediction_log import PredictionLogger, iter_prediction_chunks
+from src.api.profiler import SamplingProfiler
+from src.ml.grid import PredictionGrid, load_grid
+from src.monitoring.drift import compute_drift, filter_window, load_reference
+
+logger = logging.getLogger(__name__)
 
 
 # Schéma pour représenter les données d'entrée sous forme structurée
@@ -17,19 +37,179 @@ class Input(BaseModel):
     longitude: float  # Longitude de la région
 
 
-# Nom et version du modèle à charger depuis MLflow
-model_name = "Production-model"
-model_version = 1
+# Champs de `Input`, dans l'ordre des colonnes `FEATURE_COLUMNS` du modèle
+INPUT_FIELDS = list(Input.model_fields)
+
+
+# Schéma d'une requête de prédiction par lot : lignes ou colonnes
+class BatchInput(BaseModel):
+    records: list[Any] | None = None  # Liste d'enregistrements au format `Input`
+    columns: dict[str, list[Any]] | None = None  # Un tableau par caractéristique
+
+
+# Schéma d'une erreur de validation rattachée à une ligne du lot
+class RowError(BaseModel):
+    index: int  # Position de la ligne dans le lot
+    errors: list[dict]  # Détail des erreurs de validation
+
+
+# Schéma de la réponse d'une prédiction par lot
+class BatchOutput(BaseModel):
+    predictions: list[float | None]  # None pour les lignes invalides
+    errors: list[RowError] = Field(default_factory=list)
+
+
+# Validateurs réutilisés pour éviter de reconstruire les schémas à chaque appel
+_records_adapter = TypeAdapter(list[Input])
+_column_adapter = TypeAdapter(list[float])
+_value_adapter = TypeAdapter(float)
+
+# Taille des paquets envoyés au modèle lors d'une prédiction par lot
+BATCH_CHUNK_SIZE = int(os.getenv("PREDICT_BATCH_CHUNK_SIZE", "10000"))
+
+# Regroupement dynamique des requêtes "/predict" concurrentes (désactivé par défaut)
+MICRO_BATCHING_ENABLED = os.getenv("MICRO_BATCHING_ENABLED", "0") == "1"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+
+# Moteur d'inférence : "pyfunc" (wrapper MLflow générique), "sklearn" (appel direct),
+# "compiled" (arbres exportés dans des tableaux NumPy), "mmap" (tableaux compilés
+# projetés en mémoire et partagés entre workers) ou "onnx" (export ONNX, onnxruntime)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "pyfunc")
+
+# Cache des prédictions de "/predict" (désactivé si la taille vaut 0)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0")) or None
+PREDICTION_CACHE_DECIMALS = (
+    int(os.environ["PREDICTION_CACHE_DECIMALS"])
+    if os.getenv("PREDICTION_CACHE_DECIMALS")
+    else None
+)
+
+# Prédictions approchées de "/predict/approximate" par la grille enregistrée avec le
+# modèle (voir `src/ml/grid.py`), chargée avec chaque version servie (désactivées par défaut)
+PREDICTION_GRID_ENABLED = os.getenv("PREDICTION_GRID_ENABLED", "0") == "1"
+
+# Attente maximale (en secondes) du chargement du modèle par une requête de prédiction
+MODEL_LOAD_TIMEOUT = float(os.getenv("MODEL_LOAD_TIMEOUT", "30"))
+
+# Journal des prédictions servies, pour le suivi de la dérive (désactivé si le
+# répertoire est vide) : taille de la file d'attente et seuils de rotation des fichiers
+PREDICTION_LOG_DIR = os.getenv("PREDICTION_LOG_DIR", "")
+PREDICTION_LOG_QUEUE_SIZE = int(os.getenv("PREDICTION_LOG_QUEUE_SIZE", "10000"))
+PREDICTION_LOG_MAX_BYTES = int(os.getenv("PREDICTION_LOG_MAX_BYTES", str(100 * 2**20)))
+PREDICTION_LOG_MAX_AGE = float(os.getenv("PREDICTION_LOG_MAX_AGE", "3600"))
+
+# Jeton des points de terminaison d'administration ("/admin/..."), désactivés s'il est vide
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Profilage à la demande : intervalle d'échantillonnage et durée maximale d'une session
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# Nom et version du modèle à charger depuis MLflow ; un alias ou un stage, s'ils
+# sont définis, désignent la version à servir à la place de `model_version`
+model_name = os.getenv("MODEL_NAME", "Production-model")
+model_version = os.getenv("MODEL_VERSION", "1")
+model_alias = os.getenv("MODEL_ALIAS") or None
+model_stage = os.getenv("MODEL_STAGE") or None
+
+# Intervalle (en secondes) de surveillance du registre pour recharger le modèle à
+# chaud quand la version désignée change ; 0 désactive la surveillance
+MODEL_POLL_INTERVAL = float(os.getenv("MODEL_POLL_INTERVAL", "0"))
+
+# Cache des prédictions, invalidé à chaque changement du modèle servi
+cache = PredictionCache(
+    max_size=PREDICTION_CACHE_SIZE,
+    ttl=PREDICTION_CACHE_TTL,
+    decimals=PREDICTION_CACHE_DECIMALS,
+)
+
+# Chargeur du modèle MLflow spécifié : le chargement se fait en arrière-plan au
+# démarrage de l'application (ou à la première requête), pas à l'import du module
+loader = ModelLoader(
+    INFERENCE_BACKEND,
+    model_name,
+    model_version,
+    alias=model_alias,
+    stage=model_stage,
+    on_load=lambda served: on_model_load(served),
+)
+
+# Compteurs et histogrammes de latence exposés sur "/metrics"
+metrics = ApiMetrics()
+
+# Journal des prédictions, écrit par un thread de fond
+prediction_log = PredictionLogger(
+    PREDICTION_LOG_DIR or None,
+    max_queue=PREDICTION_LOG_QUEUE_SIZE,
+    max_bytes=PREDICTION_LOG_MAX_BYTES,
+    max_age=PREDICTION_LOG_MAX_AGE,
+)
+
+# Références de dérive des versions du modèle déjà servies, chargées à la demande
+drift_references: dict[tuple[str, str], dict] = {}
+
+# Grilles de prédictions des versions du modèle servies, chargées avec le modèle
+prediction_grids: dict[tuple[str, str], PredictionGrid] = {}
+
+# Profileur par échantillonnage du chemin de prédiction, inactif par défaut
+profiler = SamplingProfiler(
+    interval=PROFILE_INTERVAL_MS / 1000, max_seconds=PROFILE_MAX_SECONDS
+)
+
+# Regroupeur des prédictions unitaires, démarré au lancement de l'application si activé
+batcher = MicroBatcher(
+    lambda features: predict_array(features),
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+)
+
+
+def on_model_load(served: ServedModel) -> None:
+    """
+    Prépare un modèle chargé avant qu'il ne soit servi : charge sa grille de
+    prédictions si elles sont activées, puis invalide le cache des prédictions.
+
+    Une grille indisponible (absente, registre injoignable, fichier illisible)
+    n'empêche pas de servir le modèle : seules les prédictions approchées sont
+    alors désactivées pour cette version.
+    """
+    if PREDICTION_GRID_ENABLED:
+        key = (served.name, served.version)
+        try:
+            prediction_grids[key] = load_grid(*key)
+        except Exception as exc:
+            logger.warning(f"Approximate predictions unavailable: {exc}")
+    cache.set_model(served.name, served.version)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Démarre et arrête les tâches de fond de l'application.
+    """
+    loader.start()
+    prediction_log.start()
+    if MODEL_POLL_INTERVAL > 0:
+        loader.start_watching(MODEL_POLL_INTERVAL)
+    if MICRO_BATCHING_ENABLED:
+        await batcher.start()
+    yield
+    await batcher.stop()
+    loader.stop_watching()
+    profiler.stop()
+    prediction_log.stop()
 
-# Charger le modèle MLflow spécifié
-model = mlflow.pyfunc.load_model(model_uri=f"models:/{model_name}/{model_version}")
 
 # Initialiser l'application FastAPI
 app = FastAPI(
     title="Prédiction des prix des logements en Californie",
     description="API simple pour prédire les prix des logements en Californie",
     version="0.1.0",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 @app.get("/")
@@ -42,50 +222,478 @@ async def read_main() -> dict:
     return {"msg": "Hello World"}
 
 
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """
+    Point de terminaison de disponibilité de l'API.
+
+    Contrairement à "/", qui indique seulement que le processus répond, il retourne
+    200 uniquement lorsque le modèle est chargé et prêt à prédire, 503 sinon.
+
+    Returns:
+        JSONResponse: État du chargement et informations du modèle servi.
+    """
+    return JSONResponse(loader.status(), status_code=200 if loader.ready else 503)
+
+
+@app.get("/model")
+async def model_status() -> dict:
+    """
+    Point de terminaison décrivant le modèle servi et la surveillance du registre.
+
+    Returns:
+        dict: Nom, version, date et durée de chargement du modèle servi, et état du rechargement.
+    """
+    return loader.status()
+
+
+@app.get("/metrics")
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Point de terminaison exposant les métriques de l'API au format Prometheus.
+
+    Returns:
+        PlainTextResponse: Nombre de requêtes et d'erreurs, histogrammes de latence
+            totale et par étape (validation, caractéristiques, inférence, sérialisation).
+    """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def check_admin_token(token: str | None) -> None:
+    """
+    Vérifie le jeton d'un appel d'administration.
+
+    Raises:
+        HTTPException: 404 si l'administration est désactivée (`ADMIN_TOKEN` vide),
+            403 si le jeton est absent ou invalide.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide.")
+
+
+@app.post("/admin/profile")
+async def start_profile(
+    seconds: float | None = Query(default=None, gt=0),
+    requests: int | None = Query(default=None, ge=1),
+    x_admin_token: str | None = Header(default=None),
+) -> dict:
+    """
+    Démarre le profilage par échantillonnage du chemin de prédiction.
+
+    La session s'arrête après `seconds` secondes ou `requests` prédictions (hors succès
+    du cache), et au plus tard après `PROFILE_MAX_SECONDS`.
+
+    Args:
+        seconds (float, optional): Durée de la session.
+        requests (int, optional): Nombre de prédictions à profiler.
+        x_admin_token (str): Jeton d'administration (en-tête "X-Admin-Token").
+
+    Returns:
+        dict: État de la session démarrée.
+    """
+    check_admin_token(x_admin_token)
+    try:
+        profiler.start(seconds=seconds, requests=requests)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return profiler.status()
+
+
+@app.get("/admin/profile")
+async def profile_report(
+    x_admin_token: str | None = Header(default=None),
+) -> PlainTextResponse:
+    """
+    Retourne les piles échantillonnées de la session en cours ou de la dernière session.
+
+    Args:
+        x_admin_token (str): Jeton d'administration (en-tête "X-Admin-Token").
+
+    Returns:
+        PlainTextResponse: Piles repliées ("racine;...;feuille nombre"), à passer à
+            flamegraph.pl ou speedscope ; l'état de la session est dans les en-têtes
+            "X-Profile-Active", "X-Profile-Samples" et "X-Profile-Requests".
+    """
+    check_admin_token(x_admin_token)
+    status = profiler.status()
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Active": str(status["active"]).lower(),
+            "X-Profile-Samples": str(status["samples"]),
+            "X-Profile-Requests": str(status["requests"]),
+        },
+    )
+
+
+def get_model() -> ServedModel:
+    """
+    Retourne le modèle servi, en attendant la fin de son chargement si nécessaire.
+
+    Returns:
+        ServedModel: Modèle chargé.
+
+    Raises:
+        HTTPException: 503 si le modèle n'est pas disponible à temps.
+    """
+    try:
+        return loader.wait(MODEL_LOAD_TIMEOUT)
+    except ModelNotReady as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+def set_model_headers(response: Response, served: ServedModel) -> None:
+    """
+    Indique dans les en-têtes de la réponse le modèle qui a produit la prédiction.
+    """
+    response.headers["X-Model-Name"] = served.name
+    response.headers["X-Model-Version"] = served.version
+    response.headers["X-Model-Loaded-At"] = f"{served.loaded_at:.3f}"
+
+
 @app.post("/predict")
-def predict(input_data: Input) -> dict:
+async def predict(input_data: Input, response: Response) -> dict:
     """
     Point de terminaison pour effectuer une prédiction des prix des logements.
 
     Args:
         input_data (Input): Données d'entrée structurées contenant les caractéristiques nécessaires pour la prédiction.
+        response (Response): Réponse, complétée des en-têtes décrivant le modèle servi.
 
     Returns:
         dict: Prédiction du prix du logement sous la forme d'un dictionnaire.
     """
-    # Convertir les données d'entrée en tableau NumPy
-    features = np.array(
-        [
+    mark("parse")
+    # Extraire les caractéristiques dans l'ordre attendu par le modèle
+    values = [getattr(input_data, field) for field in INPUT_FIELDS]
+
+    # Récupérer le modèle servi, sans passer par un thread s'il est déjà chargé
+    served = loader.served or await run_in_threadpool(get_model)
+    set_model_headers(response, served)
+    mark("features", served.version)
+
+    # Réutiliser une prédiction déjà calculée pour ces caractéristiques
+    prediction = None
+    if cache.enabled:
+        key = cache.key(served.name, served.version, values)
+        prediction = cache.get(key)
+
+    # Sinon, effectuer une prédiction avec le modèle chargé, regroupée avec les
+    # requêtes concurrentes si le micro-batching est actif
+    if prediction is None:
+        if batcher.running:
+            # Prédit par le modèle résolu par la requête, même s'il est remplacé
+            # pendant la collecte du lot
+            prediction = await batcher.submit(np.array(values), served.backend.predict)
+        else:
+            prediction = await run_in_threadpool(served.backend.predict_row, values)
+        prediction = float(prediction)
+        mark("inference")
+        if profiler.active:
+            profiler.request_done()
+        if cache.enabled:
+            cache.put(key, prediction)
+
+    if prediction_log.enabled:
+        prediction_log.log(
+            "/predict", served.name, served.version, values, prediction, elapsed()
+        )
+
+    # Retourner le résultat sous forme de JSON
+    return {"prediction": prediction}
+
+
+@app.post("/predict/approximate")
+async def predict_approximate(input_data: Input, response: Response) -> dict:
+    """
+    Point de terminaison de prédiction approchée, lue dans la grille précalculée du modèle.
+
+    La prédiction est interpolée dans la grille enregistrée avec le modèle servi, sans
+    appel au modèle ; "/predict" reste la prédiction exacte.
+
+    Args:
+        input_data (Input): Données d'entrée structurées.
+        response (Response): Réponse, complétée des en-têtes décrivant le modèle servi.
+
+    Returns:
+        dict: Prédiction approchée et borne d'erreur ("error_bound" : écart au modèle
+            exact non dépassé par 95 % des lignes de validation).
+
+    Raises:
+        HTTPException: 404 si les prédictions approchées sont désactivées ou si le
+            modèle servi n'a pas de grille.
+    """
+    if not PREDICTION_GRID_ENABLED:
+        raise HTTPException(
+            status_code=404, detail="Les prédictions approchées sont désactivées."
+        )
+    served = loader.served or await run_in_threadpool(get_model)
+    set_model_headers(response, served)
+    grid = prediction_grids.get((served.name, served.version))
+    if grid is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Pas de grille de prédictions pour le modèle '{served.name}' "
+            f"version {served.version}.",
+        )
+    values = np.array([[getattr(input_data, field) for field in INPUT_FIELDS]])
+    return {
+        "prediction": float(grid.predict(values)[0]),
+        "error_bound": grid.error_bound,
+    }
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    """
+    Point de terminaison exposant l'état et les compteurs du cache des prédictions.
+
+    Returns:
+        dict: Taille, configuration et compteurs (succès, échecs, évictions...).
+    """
+    return cache.stats()
+
+
+@app.get("/prediction-log/stats")
+async def prediction_log_stats() -> dict:
+    """
+    Point de terminaison exposant l'état et les compteurs du journal des prédictions.
+
+    Returns:
+        dict: Répertoire, file d'attente et compteurs (lignes écrites, perdues, rotations).
+    """
+    return prediction_log.stats()
+
+
+@app.get("/drift")
+def drift(since: datetime | None = None, until: datetime | None = None) -> dict:
+    """
+    Point de terminaison comparant le trafic journalisé à la distribution d'entraînement.
+
+    Les prédictions journalisées dans la fenêtre [since, until[ (tout le journal par
+    défaut) sont comparées, par blocs, à la référence enregistrée avec le modèle servi.
+
+    Args:
+        since (datetime, optional): Début de la fenêtre (UTC si sans fuseau horaire).
+        until (datetime, optional): Fin de la fenêtre (UTC si sans fuseau horaire).
+
+    Returns:
+        dict: Modèle de référence, nombre de lignes, caractéristiques en dérive et
+            statistiques par caractéristique (PSI, KS, décalages de la moyenne et des quantiles).
+
+    Raises:
+        HTTPException: 404 si le journal des prédictions est désactivé ou si le modèle
+            servi n'a pas de référence de dérive.
+    """
+    if not prediction_log.enabled:
+        raise HTTPException(
+            status_code=404, detail="Le journal des prédictions est désactivé."
+        )
+    served = get_model()
+    key = (served.name, served.version)
+    reference = drift_references.get(key)
+    if reference is None:
+        try:
+            reference = drift_references[key] = load_reference(*key)
+        except LookupError as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
+    chunks = filter_window(
+        iter_prediction_chunks(prediction_log.directory), since, until
+    )
+    return {
+        "model_name": served.name,
+        "model_version": served.version,
+        "since": since,
+        "until": until,
+        **compute_drift(reference, chunks),
+    }
+
+
+@app.post("/predict/batch")
+def predict_batch(
+    batch: BatchInput | list[Any],
+    response: Response,
+    chunk_size: int | None = Query(default=None, ge=1),
+) -> BatchOutput:
+    """
+    Point de terminaison pour prédire les prix d'un lot de logements.
+
+    Le lot est fourni soit sous forme d'une liste d'enregistrements (directement ou
+    dans `records`), soit sous forme de colonnes (`columns`, un tableau par champ
+    de `Input`). Les lignes invalides sont signalées dans `errors` sans faire
+    échouer le reste du lot.
+
+    Args:
+        batch (BatchInput | list): Lot de données d'entrée.
+        response (Response): Réponse, complétée des en-têtes décrivant le modèle servi.
+        chunk_size (int, optional): Nombre de lignes par appel au modèle.
+            Defaults to `PREDICT_BATCH_CHUNK_SIZE`.
+
+    Returns:
+        BatchOutput: Prédictions dans l'ordre du lot et erreurs par ligne.
+    """
+    mark("parse")
+    if isinstance(batch, list):
+        batch = BatchInput(records=batch)
+    if (batch.records is None) == (batch.columns is None):
+        raise RequestValidationError(
             [
-                input_data.medinc,
-                input_data.houseage,
-                input_data.averooms,
-                input_data.avebedrms,
-                input_data.population,
-                input_data.aveoccup,
-                input_data.latitude,
-                input_data.longitude,
+                {
+                    "type": "value_error",
+                    "loc": ("body",),
+                    "msg": "Fournir exactement un champ parmi 'records' et 'columns'.",
+                    "input": None,
+                }
             ]
-        ]
+        )
+    if batch.records is not None:
+        features, errors = records_to_array(batch.records)
+    else:
+        features, errors = columns_to_array(batch.columns)
+
+    valid = np.ones(len(features), dtype=bool)
+    valid[[error.index for error in errors]] = False
+    # Tout le lot est prédit par le même modèle, même si un rechargement a lieu entre-temps
+    served = get_model()
+    set_model_headers(response, served)
+    mark("features", served.version)
+    predictions = np.full(len(features), np.nan)
+    predictions[valid] = predict_array(
+        features[valid], chunk_size or BATCH_CHUNK_SIZE, served.backend
     )
+    mark("inference")
+    if profiler.active:
+        profiler.request_done()
+    if prediction_log.enabled:
+        prediction_log.log(
+            "/predict/batch",
+            served.name,
+            served.version,
+            features[valid],
+            predictions[valid],
+            elapsed(),
+        )
 
-    # Transformer les données en DataFrame pour correspondre au format attendu par le modèle
-    features = pd.DataFrame(
-        features,
-        columns=[
-            "MedInc",
-            "HouseAge",
-            "AveRooms",
-            "AveBedrms",
-            "Population",
-            "AveOccup",
-            "Latitude",
-            "Longitude",
+    return BatchOutput(
+        predictions=[
+            None if not ok else value for ok, value in zip(valid, predictions.tolist())
         ],
+        errors=errors,
     )
 
-    # Effectuer une prédiction avec le modèle chargé
-    prediction = model.predict(features)
 
-    # Retourner le résultat sous forme de JSON
-    return {"prediction": float(prediction[0])}
+def predict_array(
+    features: np.ndarray,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    backend: Backend | None = None,
+) -> np.ndarray:
+    """
+    Prédit les prix pour un tableau de caractéristiques, par paquets.
+
+    Args:
+        features (np.ndarray): Tableau (n, 8) dans l'ordre de `FEATURE_COLUMNS`.
+        chunk_size (int, optional): Nombre de lignes par appel au modèle.
+        backend (Backend, optional): Moteur d'inférence. Defaults to celui du modèle servi.
+
+    Returns:
+        np.ndarray: Prédictions, dans l'ordre des lignes.
+    """
+    backend = backend or get_model().backend
+    predictions = np.empty(len(features))
+    for start in range(0, len(features), chunk_size):
+        chunk = features[start : start + chunk_size]
+        predictions[start : start + len(chunk)] = backend.predict(chunk)
+    return predictions
+
+
+def records_to_array(records: list[Any]) -> tuple[np.ndarray, list[RowError]]:
+    """
+    Valide une liste d'enregistrements et la convertit en tableau NumPy.
+
+    Args:
+        records (list): Enregistrements au format `Input`.
+
+    Returns:
+        tuple: Tableau (n, 8) (lignes invalides à NaN) et erreurs par ligne.
+    """
+    try:
+        # Cas nominal : validation de tout le lot en un seul appel
+        rows = _records_adapter.validate_python(records)
+        errors = []
+    except ValidationError:
+        rows, errors = [], []
+        for index, record in enumerate(records):
+            try:
+                rows.append(Input.model_validate(record))
+            except ValidationError as exc:
+                rows.append(None)
+                errors.append(RowError(index=index, errors=_clean_errors(exc)))
+
+    features = np.full((len(records), len(INPUT_FIELDS)), np.nan)
+    for index, row in enumerate(rows):
+        if row is not None:
+            features[index] = [getattr(row, field) for field in INPUT_FIELDS]
+    return features, errors
+
+
+def columns_to_array(
+    columns: dict[str, list[Any]],
+) -> tuple[np.ndarray, list[RowError]]:
+    """
+    Valide un lot en colonnes et le convertit en tableau NumPy.
+
+    Args:
+        columns (dict): Un tableau de valeurs par champ de `Input`.
+
+    Returns:
+        tuple: Tableau (n, 8) (lignes invalides à NaN) et erreurs par ligne.
+    """
+    missing = [field for field in INPUT_FIELDS if field not in columns]
+    lengths = {len(columns[field]) for field in INPUT_FIELDS if field in columns}
+    if missing or len(lengths) > 1:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("body", "columns"),
+                    "msg": f"Colonnes manquantes {missing} ou de longueurs différentes.",
+                    "input": None,
+                }
+            ]
+        )
+
+    n_rows = lengths.pop() if lengths else 0
+    features = np.empty((n_rows, len(INPUT_FIELDS)))
+    row_errors: dict[int, list[dict]] = {}
+    for j, field in enumerate(INPUT_FIELDS):
+        values = columns[field]
+        try:
+            features[:, j] = _column_adapter.validate_python(values)
+        except ValidationError as exc:
+            invalid = set()
+            for error in _clean_errors(exc):
+                index = error["loc"][0]
+                error["loc"] = (field,)
+                row_errors.setdefault(index, []).append(error)
+                invalid.add(index)
+            # Revalider valeur par valeur en ignorant les lignes invalides
+            features[:, j] = [
+                np.nan if index in invalid else _value_adapter.validate_python(value)
+                for index, value in enumerate(values)
+            ]
+
+    errors = [
+        RowError(index=index, errors=row_errors[index]) for index in sorted(row_errors)
+    ]
+    return features, errors
+
+
+def _clean_errors(exc: ValidationError) -> list[dict]:
+    """
+    Extrait les erreurs d'une `ValidationError` sous une forme sérialisable en JSON.
+    """
+    return exc.errors(include_url=False, include_context=False, include_input=False)
@@ -0,0 +1,526 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+# MLflow, scikit-learn et pandas sont importés au chargement du modèle (dans le
+# thread de fond) et non à l'import de l'API, dont ils représentent l'essentiel
+# du temps de démarrage
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+    from src.ml.compiled import CompiledGradientBoosting
+
+logger = logging.getLogger(__name__)
+
+# Répertoire où les modèles compilés sont écrits pour être projetés en mémoire
+MODEL_MMAP_DIR = Path(
+    os.getenv("MODEL_MMAP_DIR", Path(tempfile.gettempdir()) / "mlops-immobilier-models")
+)
+
+# Précision des moteurs compilés ("compiled" et "mmap") : "float64" ou "float32".
+# En float32, le moteur n'est retenu qu'après validation au chargement : sur un
+# échantillon, ses prédictions ne doivent pas s'écarter de celles du modèle de
+# référence de plus de `INFERENCE_PRECISION_MAX_ERROR` (en unités de la cible,
+# centaines de milliers de dollars : 1e-5 correspond à un dollar)
+INFERENCE_PRECISION = os.getenv("INFERENCE_PRECISION", "float64")
+INFERENCE_PRECISION_MAX_ERROR = float(
+    os.getenv("INFERENCE_PRECISION_MAX_ERROR", "1e-5")
+)
+# Échantillon de validation (CSV ou Parquet) ; à défaut, tiré de la référence de
+# dérive enregistrée avec le modèle (voir `src/monitoring/drift.py`)
+INFERENCE_PRECISION_SAMPLE = os.getenv("INFERENCE_PRECISION_SAMPLE", "")
+INFERENCE_PRECISION_SAMPLE_SIZE = int(
+    os.getenv("INFERENCE_PRECISION_SAMPLE_SIZE", "10000")
+)
+
+# Threads d'onnxruntime pour un appel du moteur "onnx" (0 : un par cœur). Un seul
+# par défaut : les requêtes unitaires ne gagnent rien à être découpées, et l'API en
+# traite déjà plusieurs à la fois
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "1"))
+
+# Noms des colonnes attendues par le modèle, dans l'ordre des champs de `Input`
+FEATURE_COLUMNS = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+
+
+class Backend:
+    """
+    Interface commune des moteurs d'inférence servis par l'API.
+
+    Les caractéristiques sont passées sous forme de tableau NumPy float64 (n, 8),
+    dans l'ordre de `FEATURE_COLUMNS`.
+    """
+
+    name = "base"
+    precision = "float64"
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Prédit les prix pour un tableau de caractéristiques.
+
+        Args:
+            features (np.ndarray): Tableau (n, 8) dans l'ordre de `FEATURE_COLUMNS`.
+
+        Returns:
+            np.ndarray: Prédictions, dans l'ordre des lignes.
+        """
+        raise NotImplementedError
+
+    def predict_row(self, values: Sequence[float]) -> float:
+        """
+        Prédit le prix d'une seule observation.
+
+        Args:
+            values (Sequence[float]): Les 8 caractéristiques dans l'ordre de `FEATURE_COLUMNS`.
+
+        Returns:
+            float: Prédiction.
+        """
+        return float(self.predict(np.array([values], dtype=np.float64))[0])
+
+
+class PyfuncBackend(Backend):
+    """
+    Moteur d'inférence générique passant par le wrapper `mlflow.pyfunc`.
+
+    Chaque appel construit un DataFrame pandas et applique la vérification de
+    schéma de MLflow.
+    """
+
+    name = "pyfunc"
+
+    def __init__(self, model_uri: str) -> None:
+        """
+        Args:
+            model_uri (str): URI MLflow du modèle (ex. "models:/Production-model/1").
+        """
+        import mlflow.pyfunc
+
+        self.model = mlflow.pyfunc.load_model(model_uri=model_uri)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        import pandas as pd
+
+        # Transformer les données en DataFrame pour correspondre au format attendu par le modèle
+        frame = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+        return np.asarray(self.model.predict(frame), dtype=np.float64)
+
+
+class SklearnBackend(Backend):
+    """
+    Moteur d'inférence rapide appelant directement l'estimateur scikit-learn.
+
+    L'ordre des caractéristiques est vérifié une seule fois au chargement, par
+    rapport à la signature journalisée avec le modèle. Les prédictions unitaires
+    réutilisent ensuite un tampon float64 préalloué (un par thread), sans pandas
+    ni vérification de schéma MLflow.
+    """
+
+    name = "sklearn"
+
+    def __init__(self, model_uri: str) -> None:
+        """
+        Args:
+            model_uri (str): URI MLflow du modèle (ex. "models:/Production-model/1").
+
+        Raises:
+            ValueError: Si la signature ou l'estimateur n'utilisent pas l'ordre `FEATURE_COLUMNS`.
+        """
+        self.model = load_sklearn_model(model_uri)
+        self._local = threading.local()
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict(features), dtype=np.float64)
+
+    def predict_row(self, values: Sequence[float]) -> float:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = np.empty((1, len(FEATURE_COLUMNS)))
+        buffer[0] = values
+        return float(self.model.predict(buffer)[0])
+
+
+class CompiledBackend(Backend):
+    """
+    Moteur d'inférence compilé : l'ensemble d'arbres est exporté dans des tableaux
+    NumPy plats et évalué niveau par niveau (voir `CompiledGradientBoosting`), en
+    float64 ou, après validation, en float32 (voir `compile_model`).
+    """
+
+    name = "compiled"
+
+    def __init__(self, model_uri: str, precision: str | None = None) -> None:
+        """
+        Args:
+            model_uri (str): URI MLflow d'un `GradientBoostingRegressor`.
+            precision (str, optional): "float64" ou "float32". Defaults to `INFERENCE_PRECISION`.
+        """
+        self.model = compile_model(model_uri, precision)
+        self.precision = self.model.dtype.name
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.model.predict(features)
+
+
+class MmapBackend(Backend):
+    """
+    Moteur compilé partagé entre processus : les tableaux des arbres sont écrits une
+    seule fois sur disque puis projetés en mémoire en lecture seule par chaque worker.
+
+    La mémoire résidente du modèle est ainsi partagée par tous les workers (cache de
+    pages du système), et un worker qui trouve les tableaux déjà écrits n'importe pas
+    scikit-learn : il interroge seulement le registre MLflow pour vérifier qu'ils
+    proviennent de l'exécution de la version servie (voir `cache_name`).
+    """
+
+    name = "mmap"
+
+    def __init__(self, model_uri: str, precision: str | None = None) -> None:
+        """
+        Args:
+            model_uri (str): URI MLflow d'un `GradientBoostingRegressor`.
+            precision (str, optional): "float64" ou "float32". Defaults to `INFERENCE_PRECISION`.
+        """
+        from src.ml.compiled import CompiledGradientBoosting
+
+        self.path = materialize_model(model_uri, precision=precision)
+        self.model = CompiledGradientBoosting.load(self.path, mmap=True)
+        self.precision = self.model.dtype.name
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.model.predict(features)
+
+
+class OnnxBackend(Backend):
+    """
+    Moteur d'inférence onnxruntime (CPU) sur l'export ONNX du modèle (`log_model(..., onnx=True)`).
+
+    Le fichier ONNX est copié une fois sur disque (voir `materialize_onnx`) : un
+    worker qui le trouve n'utilise MLflow que pour vérifier l'exécution dont il
+    provient (voir `cache_name`), sans charger le modèle scikit-learn. Le graphe
+    est en float32, à moins de `ONNX_MAX_ERROR` des prédictions de scikit-learn
+    (vérifié à l'export).
+    """
+
+    name = "onnx"
+    precision = "float32"
+
+    def __init__(self, model_uri: str, threads: int | None = None) -> None:
+        """
+        Args:
+            model_uri (str): URI MLflow d'un modèle enregistré avec son export ONNX.
+            threads (int, optional): Threads par appel. Defaults to `ONNX_INTRA_OP_THREADS`.
+        """
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = (
+            ONNX_INTRA_OP_THREADS if threads is None else threads
+        )
+        options.inter_op_num_threads = 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self.path = materialize_onnx(model_uri)
+        self.session = onnxruntime.InferenceSession(
+            str(self.path), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features, dtype=np.float32)
+        (predictions,) = self.session.run(None, {self.input_name: features})
+        return predictions.ravel().astype(np.float64)
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (
+        PyfuncBackend,
+        SklearnBackend,
+        CompiledBackend,
+        MmapBackend,
+        OnnxBackend,
+    )
+}
+
+
+def model_run_id(model_uri: str) -> str:
+    """
+    Identifiant de l'exécution MLflow qui a produit un modèle.
+    """
+    from mlflow.models import get_model_info
+
+    return get_model_info(model_uri).run_id
+
+
+def cache_name(model_uri: str, run_id: str | None = None) -> str:
+    """
+    Nom des fichiers d'un modèle dans `MODEL_MMAP_DIR` : son URI et l'exécution qui
+    l'a produit. Si le registre est reconstruit (`mlruns` supprimé puis modèle
+    réentraîné), la même URI désigne un autre modèle, qui n'a pas le même nom.
+
+    Args:
+        model_uri (str): URI MLflow du modèle.
+        run_id (str, optional): Identifiant de l'exécution, résolu s'il est omis.
+
+    Returns:
+        str: Nom de fichier sûr.
+    """
+    run_id = run_id or model_run_id(model_uri)
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", f"{model_uri}-{run_id}").strip("-")
+
+
+def materialize_model(
+    model_uri: str, directory: Path | None = None, precision: str | None = None
+) -> Path:
+    """
+    Compile un modèle MLflow et écrit ses tableaux sur disque, s'ils n'y sont pas déjà.
+
+    Le répertoire est nommé d'après l'URI et l'exécution MLflow du modèle (voir
+    `cache_name`). En float32, la validation n'a lieu qu'une fois, à l'écriture : le
+    répertoire contient alors les tableaux float32, ou float64 si la validation a échoué.
+
+    Args:
+        model_uri (str): URI MLflow d'un `GradientBoostingRegressor`.
+        directory (Path, optional): Répertoire racine. Defaults to `MODEL_MMAP_DIR`.
+        precision (str, optional): "float64" ou "float32". Defaults to `INFERENCE_PRECISION`.
+
+    Returns:
+        Path: Répertoire contenant les tableaux du modèle compilé.
+    """
+    directory = directory or MODEL_MMAP_DIR
+    precision = precision or INFERENCE_PRECISION
+    name = cache_name(model_uri)
+    if precision != "float64":
+        name = f"{name}-{precision}"
+    path = directory / name
+    if not path.exists():
+        logger.info(f"Materializing compiled model {model_uri} to {path}...")
+        compile_model(model_uri, precision).save(path)
+    return path
+
+
+def materialize_onnx(model_uri: str, directory: Path | None = None) -> Path:
+    """
+    Copie sur disque l'export ONNX d'un modèle MLflow, s'il n'y est pas déjà.
+
+    Le fichier est écrit sous un nom temporaire puis renommé : un worker concurrent
+    ne lit jamais un fichier incomplet.
+
+    Args:
+        model_uri (str): URI MLflow du modèle.
+        directory (Path, optional): Répertoire racine. Defaults to `MODEL_MMAP_DIR`.
+
+    Returns:
+        Path: Fichier ONNX du modèle.
+
+    Raises:
+        LookupError: Si le modèle a été enregistré sans export ONNX.
+    """
+    directory = directory or MODEL_MMAP_DIR
+    run_id = model_run_id(model_uri)
+    path = directory / f"{cache_name(model_uri, run_id)}.onnx"
+    if path.exists():
+        return path
+
+    import mlflow
+    from mlflow.exceptions import MlflowException
+
+    from src.ml.onnx_export import ONNX_ARTIFACT, ONNX_FILE
+
+    logger.info(f"Materializing ONNX model {model_uri} to {path}...")
+    directory.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        try:
+            downloaded = mlflow.artifacts.download_artifacts(
+                f"runs:/{run_id}/{ONNX_ARTIFACT}/{ONNX_FILE}", dst_path=tmp
+            )
+        except (MlflowException, OSError) as exc:
+            raise LookupError(
+                f"Pas d'export ONNX pour {model_uri} "
+                "(entraîner avec `python -m src.ml.train --onnx`)."
+            ) from exc
+        os.replace(downloaded, path)
+    return path
+
+
+def compile_model(
+    model_uri: str, precision: str | None = None
+) -> "CompiledGradientBoosting":
+    """
+    Compile un modèle MLflow, en float32 si cette précision est demandée et validée.
+
+    Le moteur float32 n'est retenu que si, sur l'échantillon de validation
+    (`precision_sample`), ses prédictions restent à moins de
+    `INFERENCE_PRECISION_MAX_ERROR` de celles de l'estimateur scikit-learn. Sinon
+    (écart trop grand ou pas d'échantillon), le moteur float64 est conservé.
+
+    Args:
+        model_uri (str): URI MLflow d'un `GradientBoostingRegressor`.
+        precision (str, optional): "float64" ou "float32". Defaults to `INFERENCE_PRECISION`.
+
+    Returns:
+        CompiledGradientBoosting: Moteur compilé.
+    """
+    from src.ml.compiled import CompiledGradientBoosting
+
+    precision = precision or INFERENCE_PRECISION
+    if precision not in ("float64", "float32"):
+        raise ValueError(
+            f"Précision inconnue '{precision}', choisir parmi ['float64', 'float32']."
+        )
+    model = load_sklearn_model(model_uri)
+    compiled = CompiledGradientBoosting.from_sklearn(model)
+    if precision == "float64":
+        return compiled
+
+    try:
+        sample = precision_sample(model_uri)
+    except LookupError as exc:
+        logger.warning(f"float32 inference disabled for {model_uri}: {exc}")
+        return compiled
+    reduced = compiled.astype(np.float32)
+    error = float(np.max(np.abs(reduced.predict(sample) - model.predict(sample))))
+    if error > INFERENCE_PRECISION_MAX_ERROR:
+        logger.warning(
+            f"float32 inference disabled for {model_uri}: max error {error:.3g} "
+            f"above {INFERENCE_PRECISION_MAX_ERROR:.3g} on {len(sample)} rows."
+        )
+        return compiled
+    logger.info(
+        f"float32 inference enabled for {model_uri} "
+        f"(max error {error:.3g} on {len(sample)} rows)."
+    )
+    return reduced
+
+
+def precision_sample(model_uri: str) -> np.ndarray:
+    """
+    Échantillon de validation de l'inférence float32.
+
+    Les `INFERENCE_PRECISION_SAMPLE_SIZE` premières lignes de `INFERENCE_PRECISION_SAMPLE`
+    si ce fichier est défini, sinon de l'ensemble de test du jeu de données par défaut
+    s'il est présent dans le dépôt local (`src/ml/dataset.py`). À défaut, des lignes
+    sont tirées des distributions d'entraînement enregistrées avec le modèle (référence
+    de dérive) : chaque caractéristique y est tirée indépendamment, si bien que ces
+    lignes couvrent moins bien les combinaisons réelles.
+
+    Args:
+        model_uri (str): URI MLflow du modèle ("models:/<nom>/<version>").
+
+    Returns:
+        np.ndarray: Tableau (n, 8) dans l'ordre de `FEATURE_COLUMNS`.
+
+    Raises:
+        LookupError: Si aucun échantillon n'est disponible.
+    """
+    size = INFERENCE_PRECISION_SAMPLE_SIZE
+    if INFERENCE_PRECISION_SAMPLE:
+        from src.ml.streaming import iter_chunks
+
+        chunk = next(iter_chunks(INFERENCE_PRECISION_SAMPLE, size))
+        return chunk[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+    # Jeu déjà ingéré uniquement : pas de téléchargement au chargement du modèle
+    from src.ml.dataset import DATASET_DIR, DEFAULT_DATASET, Dataset
+
+    path = DATASET_DIR / DEFAULT_DATASET
+    if (path / "manifest.json").exists():
+        X_test, _ = Dataset(path).split("test")
+        if set(FEATURE_COLUMNS) <= set(X_test.columns):
+            return X_test.iloc[:size][FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+    from src.monitoring.drift import load_reference, sample_reference
+
+    match = re.fullmatch(r"models:/([^/]+)/(\d+)", model_uri)
+    if match is None:
+        raise LookupError(f"Pas d'échantillon de validation pour {model_uri}.")
+    return sample_reference(load_reference(*match.groups()), size)
+
+
+def load_sklearn_model(model_uri: str) -> "BaseEstimator":
+    """
+    Charge l'estimateur scikit-learn d'un modèle MLflow et vérifie l'ordre de ses caractéristiques.
+
+    Args:
+        model_uri (str): URI MLflow du modèle.
+
+    Returns:
+        BaseEstimator: Estimateur prêt à prédire sur un tableau NumPy.
+
+    Raises:
+        ValueError: Si la signature ou l'estimateur n'utilisent pas l'ordre `FEATURE_COLUMNS`.
+    """
+    import mlflow.sklearn
+    from mlflow.models import get_model_info
+
+    signature = get_model_info(model_uri).signature
+    if signature is not None:
+        check_feature_order(signature.inputs.input_names(), "signature")
+    model = mlflow.sklearn.load_model(model_uri)
+    # Pour un Pipeline, les noms des caractéristiques sont portés par la première étape
+    first_step = model.steps[0][1] if hasattr(model, "steps") else model
+    feature_names = getattr(first_step, "feature_names_in_", None)
+    if feature_names is not None:
+        check_feature_order(list(feature_names), "estimateur")
+        # L'ordre étant vérifié, on retire les noms pour que scikit-learn accepte
+        # un tableau NumPy sans avertissement à chaque appel
+        del first_step.feature_names_in_
+    return model
+
+
+def check_feature_order(names: list[str], source: str) -> None:
+    """
+    Vérifie que des noms de colonnes correspondent exactement à `FEATURE_COLUMNS`.
+
+    Args:
+        names (list[str]): Noms des colonnes à vérifier.
+        source (str): Origine des noms, utilisée dans le message d'erreur.
+
+    Raises:
+        ValueError: Si les noms ou leur ordre diffèrent.
+    """
+    if list(names) != FEATURE_COLUMNS:
+        raise ValueError(
+            f"Ordre des caractéristiques du modèle ({source}) {list(names)} "
+            f"différent de celui de l'API {FEATURE_COLUMNS}."
+        )
+
+
+def load_backend(name: str, model_uri: str) -> Backend:
+    """
+    Charge un modèle MLflow avec le moteur d'inférence demandé.
+
+    Args:
+        name (str): Nom du moteur ("pyfunc", "sklearn", "compiled", "mmap" ou "onnx").
+        model_uri (str): URI MLflow du modèle.
+
+    Returns:
+        Backend: Moteur d'inférence prêt à prédire.
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Moteur d'inférence inconnu '{name}', choisir parmi {list(BACKENDS)}."
+        )
+    if INFERENCE_PRECISION != "float64" and name not in ("compiled", "mmap"):
+        logger.warning(
+            f"INFERENCE_PRECISION={INFERENCE_PRECISION} ignored by the '{name}' backend."
+        )
+    logger.info(f"Loading model {model_uri} with the '{name}' backend...")
+    return BACKENDS[name](model_uri)
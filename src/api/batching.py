@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Regroupe les prédictions unitaires concurrentes en un seul appel vectorisé au modèle.
+
+    Les requêtes sont placées dans une file asyncio. Une tâche de fond attend la
+    première requête, puis en collecte d'autres pendant au plus `max_wait_ms`
+    millisecondes ou jusqu'à `max_batch_size` lignes, exécute une seule prédiction
+    dans un thread et résout le futur de chaque appelant.
+
+    Chaque requête peut désigner sa fonction de prédiction (celle du modèle qu'elle a
+    résolu) : les lignes d'un lot sont regroupées par fonction, si bien qu'un
+    changement de modèle pendant la collecte ne fait pas prédire une requête par un
+    autre modèle que le sien.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        """
+        Args:
+            predict_fn (Callable): Fonction de prédiction par défaut, sur un tableau
+                (n, n_features).
+            max_batch_size (int, optional): Nombre maximal de lignes par lot. Defaults to 64.
+            max_wait_ms (float, optional): Attente maximale en millisecondes après la
+                première requête d'un lot. Defaults to 2.0.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size doit être supérieur ou égal à 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms doit être positif.")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_count = 0
+        self.row_count = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        # Lot en cours de collecte ou de prédiction, annulé si la tâche est arrêtée
+        self._batch: list[tuple[np.ndarray, Callable, asyncio.Future]] = []
+
+    @property
+    def running(self) -> bool:
+        """
+        Indique si la tâche de regroupement est active.
+        """
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        Démarre la tâche de regroupement dans la boucle d'événements courante.
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Micro-batching started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:g})."
+        )
+
+    async def stop(self) -> None:
+        """
+        Arrête la tâche de regroupement et annule les requêtes encore en attente,
+        y compris celles du lot en cours de collecte ou de prédiction.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        self._task = None
+        logger.info("Micro-batching stopped.")
+
+    async def submit(
+        self,
+        row: np.ndarray,
+        predict_fn: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> float:
+        """
+        Soumet une ligne de caractéristiques et attend sa prédiction.
+
+        Args:
+            row (np.ndarray): Caractéristiques d'une seule observation.
+            predict_fn (Callable, optional): Fonction de prédiction de cette ligne, par
+                exemple `backend.predict` du modèle résolu par la requête. Defaults to
+                `self.predict_fn`.
+
+        Returns:
+            float: Prédiction associée à la ligne.
+        """
+        if not self.running:
+            raise RuntimeError("Le micro-batching n'est pas démarré.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, predict_fn or self.predict_fn, future))
+        return await future
+
+    async def _collect(
+        self, items: list[tuple[np.ndarray, Callable, asyncio.Future]]
+    ) -> None:
+        """
+        Attend la première requête puis complète le lot `items` jusqu'à la taille ou au
+        délai maximal. Le lot est rempli sur place, pour rester visible de `_run` si la
+        tâche est annulée pendant la collecte.
+        """
+        items.append(await self._queue.get())
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch_size:
+            # Vider sans attendre ce qui est déjà en file
+            while len(items) < self.max_batch_size and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            remaining = deadline - time.monotonic()
+            if len(items) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        """
+        Boucle principale : collecte un lot, prédit en une fois par fonction de
+        prédiction et résout les futurs.
+
+        À l'annulation (`stop`), les futurs du lot en cours sont annulés : leurs
+        appelants ne restent pas bloqués.
+        """
+        try:
+            while True:
+                self._batch = []
+                await self._collect(self._batch)
+                # Ignorer les appelants qui ont abandonné (déconnexion, timeout), et
+                # regrouper les autres par fonction de prédiction, dans l'ordre
+                groups: dict[Callable, list] = {}
+                for row, predict_fn, future in self._batch:
+                    if not future.done():
+                        groups.setdefault(predict_fn, []).append((row, future))
+                for predict_fn, items in groups.items():
+                    await self._predict(predict_fn, items)
+        finally:
+            for *_, future in self._batch:
+                if not future.done():
+                    future.cancel()
+            self._batch = []
+
+    async def _predict(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        items: list[tuple[np.ndarray, asyncio.Future]],
+    ) -> None:
+        """
+        Prédit les lignes d'un groupe en un seul appel, dans un thread, et résout leurs
+        futurs (ou leur transmet l'exception).
+        """
+        features = np.vstack([row for row, _ in items])
+        try:
+            predictions = await asyncio.to_thread(predict_fn, features)
+        except Exception as exc:
+            logger.exception("Micro-batch prediction failed.")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batch_count += 1
+        self.row_count += len(items)
+        for (_, future), prediction in zip(items, predictions.tolist()):
+            if not future.done():
+                future.set_result(prediction)
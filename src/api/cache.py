@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Sequence
+
+
+class PredictionCache:
+    """
+    Cache en mémoire des prédictions, indexé par le modèle servi et les caractéristiques.
+
+    - Taille bornée avec éviction LRU (l'entrée la moins récemment utilisée sort en premier).
+    - Durée de vie optionnelle des entrées (TTL).
+    - Arrondi optionnel des caractéristiques pour regrouper des requêtes quasi identiques
+      (la prédiction retournée est alors celle de la première requête du groupe).
+    - Invalidation automatique lorsque le modèle servi (nom ou version) change.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float | None = None,
+        decimals: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_size (int, optional): Nombre maximal d'entrées ; 0 désactive le cache. Defaults to 10000.
+            ttl (float, optional): Durée de vie des entrées en secondes. Defaults to None (illimitée).
+            decimals (int, optional): Nombre de décimales conservées dans la clé. Defaults to None (exacte).
+            clock (Callable, optional): Horloge utilisée pour le TTL. Defaults to time.monotonic.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.decimals = decimals
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._model: tuple[str, str] | None = None
+        self._entries: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indique si le cache peut contenir des entrées.
+        """
+        return self.max_size > 0
+
+    def set_model(self, model_name: str, model_version: str | int) -> None:
+        """
+        Déclare le modèle servi ; vide le cache s'il diffère du précédent.
+
+        Args:
+            model_name (str): Nom du modèle servi.
+            model_version (str | int): Version du modèle servi.
+        """
+        model = (model_name, str(model_version))
+        with self._lock:
+            if model != self._model:
+                if self._model is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._model = model
+
+    def key(
+        self, model_name: str, model_version: str | int, values: Sequence[float]
+    ) -> tuple:
+        """
+        Construit la clé d'une requête : modèle servi et caractéristiques (éventuellement arrondies).
+        """
+        if self.decimals is not None:
+            values = [round(value, self.decimals) for value in values]
+        return (model_name, str(model_version), *values)
+
+    def get(self, key: tuple) -> float | None:
+        """
+        Retourne la prédiction en cache pour une clé, ou None si absente ou expirée.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            prediction, expires_at = entry
+            if expires_at < self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prediction
+
+    def put(self, key: tuple, prediction: float) -> None:
+        """
+        Ajoute une prédiction au cache, si elle provient du modèle actuellement servi.
+        """
+        if not self.enabled or key[:2] != self._model:
+            return
+        expires_at = self.clock() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (prediction, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Vide le cache sans réinitialiser les compteurs.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Retourne la configuration, la taille et les compteurs du cache.
+        """
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "decimals": self.decimals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,366 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from src.api.backends import Backend, load_backend
+
+logger = logging.getLogger(__name__)
+
+# Observations synthétiques utilisées pour préchauffer un modèle avant de le servir,
+# dans l'ordre de `FEATURE_COLUMNS`
+WARMUP_ROWS = np.array(
+    [
+        [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23],
+        [3.87, 29.0, 5.43, 1.1, 1425.0, 3.07, 35.63, -119.57],
+        [1.5, 10.0, 3.0, 1.0, 3000.0, 5.0, 33.0, -117.0],
+    ]
+)
+
+
+class ModelNotReady(RuntimeError):
+    """
+    Levée lorsque le modèle n'est pas (encore) disponible pour prédire.
+    """
+
+
+@dataclass(frozen=True)
+class ServedModel:
+    """
+    Modèle chargé et servi par l'API.
+    """
+
+    backend: Backend  # Moteur d'inférence prêt à prédire
+    name: str  # Nom du modèle dans le registre MLflow
+    version: str  # Version du modèle dans le registre MLflow
+    loaded_at: float  # Horodatage (epoch) de fin de chargement
+    load_seconds: float  # Durée du chargement (préchauffage compris)
+
+
+def resolve_model_version(
+    model_name: str,
+    model_version: str | int | None = None,
+    alias: str | None = None,
+    stage: str | None = None,
+) -> str:
+    """
+    Détermine la version concrète d'un modèle à servir depuis le registre MLflow.
+
+    Priorité : alias, puis stage, puis version ("latest" désigne la plus récente).
+
+    Args:
+        model_name (str): Nom du modèle dans le registre.
+        model_version (str | int, optional): Numéro de version ou "latest".
+        alias (str, optional): Alias de la version (ex. "champion").
+        stage (str, optional): Stage de la version (ex. "Production").
+
+    Returns:
+        str: Numéro de version.
+    """
+    if alias is None and stage is None and str(model_version).isdigit():
+        return str(model_version)
+
+    from mlflow import MlflowClient
+
+    client = MlflowClient()
+    if alias is not None:
+        return str(client.get_model_version_by_alias(model_name, alias).version)
+    if stage is not None:
+        versions = client.get_latest_versions(model_name, stages=[stage])
+    else:
+        versions = client.search_model_versions(f"name='{model_name}'")
+    if not versions:
+        raise LookupError(f"Aucune version du modèle '{model_name}' à servir.")
+    return str(max(int(version.version) for version in versions))
+
+
+class ModelLoader:
+    """
+    Charge le modèle MLflow dans un thread de fond, hors du démarrage de l'API.
+
+    L'import du module et la création de l'application ne dépendent plus du
+    registre MLflow : le chargement démarre avec l'application (ou à la première
+    requête) et son état est exposé pour distinguer vivacité et disponibilité.
+
+    Un second thread peut surveiller le registre : lorsqu'une nouvelle version est
+    désignée (alias, stage ou "latest"), elle est chargée et préchauffée hors du
+    chemin des requêtes, puis remplace le modèle servi en une seule affectation.
+    Les requêtes en cours gardent leur référence et se terminent sur l'ancien modèle.
+    """
+
+    def __init__(
+        self,
+        backend_name: str,
+        model_name: str,
+        model_version: str | int = "latest",
+        alias: str | None = None,
+        stage: str | None = None,
+        on_load: Callable[[ServedModel], None] | None = None,
+        load_fn: Callable[[str, str], Backend] = load_backend,
+        resolve_fn: Callable[..., str] = resolve_model_version,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            backend_name (str): Nom du moteur d'inférence (voir `load_backend`).
+            model_name (str): Nom du modèle dans le registre MLflow.
+            model_version (str | int, optional): Version à charger ou "latest". Defaults to "latest".
+            alias (str, optional): Alias désignant la version à servir. Defaults to None.
+            stage (str, optional): Stage désignant la version à servir. Defaults to None.
+            on_load (Callable, optional): Fonction appelée avec chaque modèle chargé,
+                juste avant qu'il soit servi.
+            load_fn (Callable, optional): Fonction de chargement (nom du moteur, URI).
+                Defaults to `load_backend`.
+            resolve_fn (Callable, optional): Fonction de résolution de la version.
+                Defaults to `resolve_model_version`.
+            retry_interval (float, optional): Délai en secondes avant de retenter un
+                chargement initial en échec (registre pas encore joignable au démarrage
+                du conteneur...), doublé à chaque échec ; 0 pour ne pas réessayer.
+                Defaults to 1.0.
+            max_retry_interval (float, optional): Délai maximal entre deux tentatives.
+                Defaults to 60.0.
+        """
+        self.backend_name = backend_name
+        self.model_name = model_name
+        self.model_version = str(model_version)
+        self.alias = alias
+        self.stage = stage
+        self.on_load = on_load
+        self.load_fn = load_fn
+        self.resolve_fn = resolve_fn
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.served: ServedModel | None = None
+        self.error: BaseException | None = None
+        self.last_checked_at: float | None = None
+        self.reload_error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        self._watcher: threading.Thread | None = None
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indique si un modèle est chargé et prêt à prédire.
+        """
+        return self.served is not None
+
+    @property
+    def state(self) -> str:
+        """
+        État du chargement : "idle", "loading", "ready" ou "failed".
+        """
+        if self.served is not None:
+            return "ready"
+        if self.error is not None:
+            return "failed"
+        return "idle" if self._thread is None else "loading"
+
+    def start(self) -> None:
+        """
+        Démarre le chargement dans un thread de fond, s'il n'est pas déjà lancé ou
+        si le précédent s'est terminé sans modèle (nouvelles tentatives désactivées ou
+        arrêtées).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._done.clear()
+            self._thread = threading.Thread(
+                target=self._load, name="model-loader", daemon=True
+            )
+            self._thread.start()
+
+    def start_watching(self, interval: float) -> None:
+        """
+        Démarre la surveillance périodique du registre MLflow.
+
+        Args:
+            interval (float): Délai en secondes entre deux vérifications.
+        """
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="model-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """
+        Arrête la surveillance du registre MLflow et les nouvelles tentatives du
+        chargement initial.
+        """
+        self._stop.set()
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.join(timeout=5)
+
+    def wait(self, timeout: float | None = None) -> ServedModel:
+        """
+        Attend la fin du chargement (en le démarrant si besoin) et retourne le modèle.
+
+        Args:
+            timeout (float, optional): Attente maximale en secondes. Defaults to None.
+
+        Returns:
+            ServedModel: Modèle chargé.
+
+        Raises:
+            ModelNotReady: Si le chargement a échoué ou n'est pas terminé à temps.
+        """
+        served = self.served
+        if served is not None:
+            return served
+        self.start()
+        self._done.wait(timeout)
+        if self.served is not None:
+            return self.served
+        if self.error is not None:
+            raise ModelNotReady(f"Échec du chargement du modèle : {self.error}")
+        raise ModelNotReady("Le modèle est en cours de chargement.")
+
+    def check_for_update(self) -> bool:
+        """
+        Vérifie la version désignée dans le registre et la sert si elle a changé.
+
+        Returns:
+            bool: True si un nouveau modèle est désormais servi.
+        """
+        with self._reload_lock:
+            self.last_checked_at = time.time()
+            version = self._resolve()
+            if self.served is not None and version == self.served.version:
+                return False
+            self._serve(self._build(version))
+            self.error = None
+            return True
+
+    def status(self) -> dict:
+        """
+        Retourne l'état du chargement et les informations du modèle servi.
+        """
+        served = self.served
+        status = {
+            "status": self.state,
+            "model_name": self.model_name,
+            "model_version": served.version if served else self.model_version,
+            "backend": self.backend_name,
+            "alias": self.alias,
+            "stage": self.stage,
+            "watching": self._watcher is not None,
+            "last_checked_at": self.last_checked_at,
+        }
+        if served is not None:
+            status["precision"] = served.backend.precision
+            status["loaded_at"] = served.loaded_at
+            status["load_seconds"] = served.load_seconds
+        if self.error is not None:
+            status["error"] = str(self.error)
+        if self.reload_error is not None:
+            status["reload_error"] = str(self.reload_error)
+        return status
+
+    def _resolve(self) -> str:
+        """
+        Résout la version à servir selon l'alias, le stage ou la version configurés.
+        """
+        return self.resolve_fn(
+            self.model_name, self.model_version, alias=self.alias, stage=self.stage
+        )
+
+    def _build(self, version: str) -> ServedModel:
+        """
+        Charge et préchauffe une version du modèle, sans la servir.
+        """
+        model_uri = f"models:/{self.model_name}/{version}"
+        start = time.perf_counter()
+        backend = self.load_fn(self.backend_name, model_uri)
+        # Préchauffage : premières prédictions hors du chemin des requêtes, et
+        # vérification que le modèle produit des valeurs exploitables
+        predictions = np.asarray(backend.predict(WARMUP_ROWS))
+        if (
+            predictions.shape != (len(WARMUP_ROWS),)
+            or not np.isfinite(predictions).all()
+        ):
+            raise ValueError(f"Préchauffage du modèle {model_uri} invalide.")
+        backend.predict_row(WARMUP_ROWS[0].tolist())
+        served = ServedModel(
+            backend=backend,
+            name=self.model_name,
+            version=version,
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - start,
+        )
+        logger.info(f"Model {model_uri} loaded in {served.load_seconds:.2f}s.")
+        return served
+
+    def _serve(self, served: ServedModel) -> None:
+        """
+        Remplace le modèle servi ; une seule affectation, atomique pour les requêtes.
+        """
+        if self.on_load is not None:
+            self.on_load(served)
+        previous, self.served = self.served, served
+        if previous is not None:
+            logger.info(
+                f"Now serving {served.name} version {served.version} "
+                f"(was version {previous.version})."
+            )
+
+    def _load(self) -> None:
+        """
+        Chargement initial : enregistre le modèle servi ou l'erreur.
+
+        En cas d'échec, l'erreur reste exposée (`state` "failed") et le chargement est
+        retenté après `retry_interval` secondes, délai doublé à chaque échec jusqu'à
+        `max_retry_interval`, tant que `stop_watching` n'a pas été appelé.
+        """
+        delay = self.retry_interval
+        while True:
+            try:
+                with self._reload_lock:
+                    if self.served is None:
+                        self._serve(self._build(self._resolve()))
+                self.error = None
+                self._done.set()
+                return
+            except Exception as exc:
+                logger.exception(f"Failed to load model {self.model_name}.")
+                self.error = exc
+            if delay <= 0:
+                # Abandon : un prochain `start` (ou `wait`) relancera le chargement
+                with self._lock:
+                    self._thread = None
+            # Les appelants de `wait` sont prévenus dès la première tentative
+            self._done.set()
+            if delay <= 0:
+                return
+            if self._stop.wait(delay):
+                with self._lock:
+                    self._thread = None
+                return
+            logger.info(f"Retrying to load model {self.model_name}...")
+            delay = min(delay * 2, self.max_retry_interval)
+
+    def _watch(self, interval: float) -> None:
+        """
+        Boucle de surveillance : vérifie le registre toutes les `interval` secondes.
+        """
+        self._done.wait()
+        while not self._stop.wait(interval):
+            try:
+                self.check_for_update()
+                self.reload_error = None
+            except Exception as exc:
+                # Le modèle actuel reste servi ; nouvelle tentative au prochain cycle
+                logger.exception(f"Failed to reload model {self.model_name}.")
+                self.reload_error = exc
@@ -0,0 +1,271 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+# Bornes (en secondes) des histogrammes de latence, communes à toutes les séries
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Étapes du traitement d'une requête de prédiction, dans l'ordre :
+# - "parse" : lecture du corps et validation pydantic, jusqu'à l'entrée du point de terminaison ;
+# - "features" : construction du tableau de caractéristiques ;
+# - "inference" : appel au modèle (ou au regroupeur de requêtes) ;
+# - "serialize" : construction de la réponse, jusqu'à l'envoi de ses en-têtes.
+STAGES = ("parse", "features", "inference", "serialize")
+
+# Libellé des requêtes ne correspondant à aucune route (évite une série par URL)
+OTHER_ENDPOINT = "other"
+
+
+class Histogram:
+    """
+    Histogramme à bornes fixes, au format Prometheus.
+
+    Les compteurs sont alloués une fois pour toutes : une observation se réduit à une
+    recherche dichotomique dans les bornes et à deux incréments. Sans verrou, les
+    observations doivent venir d'un seul thread (la boucle d'événements, voir
+    `MetricsMiddleware`).
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Dernier compteur : au-delà (+Inf)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Ajoute une observation.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        """
+        Lignes d'exposition Prometheus de l'histogramme (compteurs cumulés).
+
+        Args:
+            name (str): Nom de la métrique.
+            labels (str): Étiquettes déjà formatées (ex. 'endpoint="/predict"').
+
+        Returns:
+            list[str]: Lignes "_bucket", "_sum" et "_count".
+        """
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class RequestTiming:
+    """
+    Horodatages d'une requête : début, puis fin de chaque étape de `STAGES`.
+
+    Les étapes non atteintes (ex. "inference" lors d'un succès du cache) restent à None.
+    """
+
+    __slots__ = ("start", "model_version", *STAGES)
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.model_version = None
+        self.parse = self.features = self.inference = self.serialize = None
+
+
+class EndpointMetrics:
+    """
+    Compteurs et histogrammes d'un point de terminaison.
+    """
+
+    def __init__(self) -> None:
+        self.requests: dict[int, int] = {}  # Nombre de réponses par code de statut
+        self.errors = 0  # Réponses en erreur (statut >= 400)
+        self.duration = Histogram()
+        # Un histogramme par étape, pour chaque version du modèle servi
+        self.stages: dict[str, tuple[Histogram, ...]] = {}
+
+    def record(self, status: int, duration: float, timing: RequestTiming) -> None:
+        """
+        Enregistre une requête terminée et la durée de chacune de ses étapes.
+        """
+        self.requests[status] = self.requests.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+        self.duration.observe(duration)
+
+        version = timing.model_version
+        if version is None:
+            return
+        histograms = self.stages.get(version)
+        if histograms is None:
+            histograms = self.stages[version] = tuple(Histogram() for _ in STAGES)
+        previous = timing.start
+        for histogram, end in zip(
+            histograms,
+            (timing.parse, timing.features, timing.inference, timing.serialize),
+        ):
+            if end is not None:
+                histogram.observe(end - previous)
+                previous = end
+
+
+class ApiMetrics:
+    """
+    Registre des métriques de l'API, exposé au format texte de Prometheus.
+
+    Chaque worker tient son propre registre, mis à jour depuis sa boucle d'événements.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, path: str) -> EndpointMetrics:
+        """
+        Retourne (en les créant au premier appel) les métriques d'un point de terminaison.
+        """
+        metrics = self.endpoints.get(path)
+        if metrics is None:
+            metrics = self.endpoints[path] = EndpointMetrics()
+        return metrics
+
+    def reset(self) -> None:
+        """
+        Remet toutes les métriques à zéro.
+        """
+        self.endpoints = {}
+
+    def render(self) -> str:
+        """
+        Exporte les métriques au format texte de Prometheus (version 0.0.4).
+
+        Returns:
+            str: Compteurs de requêtes et d'erreurs, histogrammes de latence totale et
+                par étape (par point de terminaison et version du modèle).
+        """
+        endpoints = sorted(self.endpoints.items())
+        lines = [
+            "# HELP api_requests_total Requêtes traitées, par point de terminaison et statut.",
+            "# TYPE api_requests_total counter",
+        ]
+        for path, metrics in endpoints:
+            for status, count in sorted(metrics.requests.items()):
+                lines.append(
+                    f'api_requests_total{{endpoint="{path}",status="{status}"}} {count}'
+                )
+        lines += [
+            "# HELP api_request_errors_total Réponses en erreur (statut >= 400).",
+            "# TYPE api_request_errors_total counter",
+        ]
+        for path, metrics in endpoints:
+            lines.append(
+                f'api_request_errors_total{{endpoint="{path}"}} {metrics.errors}'
+            )
+        lines += [
+            "# HELP api_request_duration_seconds Durée totale des requêtes.",
+            "# TYPE api_request_duration_seconds histogram",
+        ]
+        for path, metrics in endpoints:
+            lines += metrics.duration.render(
+                "api_request_duration_seconds", f'endpoint="{path}"'
+            )
+        lines += [
+            "# HELP api_stage_duration_seconds Durée de chaque étape d'une prédiction.",
+            "# TYPE api_stage_duration_seconds histogram",
+        ]
+        for path, metrics in endpoints:
+            for version, histograms in sorted(metrics.stages.items()):
+                for stage, histogram in zip(STAGES, histograms):
+                    lines += histogram.render(
+                        "api_stage_duration_seconds",
+                        f'endpoint="{path}",stage="{stage}",model_version="{version}"',
+                    )
+        return "\n".join(lines) + "\n"
+
+
+# Horodatages de la requête en cours, posés par `MetricsMiddleware`
+_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def mark(stage: str, model_version: str | None = None) -> None:
+    """
+    Marque la fin d'une étape de la requête en cours (sans effet hors requête).
+
+    Args:
+        stage (str): Étape terminée, parmi `STAGES`.
+        model_version (str, optional): Version du modèle qui traite la requête.
+    """
+    timing = _timing.get()
+    if timing is not None:
+        setattr(timing, stage, time.perf_counter())
+        if model_version is not None:
+            timing.model_version = model_version
+
+
+def elapsed() -> float | None:
+    """
+    Durée écoulée depuis le début de la requête en cours, en secondes (None hors requête).
+    """
+    timing = _timing.get()
+    return None if timing is None else time.perf_counter() - timing.start
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI mesurant chaque requête HTTP.
+
+    Il horodate le début de la requête et l'envoi des en-têtes de la réponse, et
+    enregistre la requête sous le chemin de la route correspondante (et non sous
+    l'URL, pour borner le nombre de séries). L'enregistrement a lieu dans la boucle
+    d'événements, même pour les points de terminaison exécutés dans un thread : les
+    métriques n'ont pas besoin de verrou.
+    """
+
+    def __init__(self, app, metrics: ApiMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(time.perf_counter())
+        token = _timing.set(timing)
+        status = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing.serialize = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timing.reset(token)
+            route = scope.get("route")
+            path = route.path if route is not None else OTHER_ENDPOINT
+            self.metrics.endpoint(path).record(
+                status, time.perf_counter() - timing.start, timing
+            )
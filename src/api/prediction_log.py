@@ -0,0 +1,354 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.api.backends import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Champs de `Input` (colonnes `FEATURE_COLUMNS` en minuscules), clés de "request"
+INPUT_FIELDS = [column.lower() for column in FEATURE_COLUMNS]
+
+
+def _finite_list(values: np.ndarray) -> list:
+    """
+    Convertit un tableau en liste Python, les valeurs non finies (NaN, ±inf) devenant
+    None : `json.dumps` les écrirait sinon en `NaN` ou `Infinity`, qui ne sont pas du
+    JSON valide.
+
+    Args:
+        values (np.ndarray): Tableau numérique.
+
+    Returns:
+        list: Liste (imbriquée) de flottants et de None.
+    """
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    if finite.all():
+        return values.tolist()
+    return np.where(finite, values, None).tolist()
+
+
+class PredictionLogger:
+    """
+    Journal des prédictions servies, écrit hors du chemin des requêtes.
+
+    Chaque prédiction est placée dans une file bornée en mémoire ; un thread de fond
+    la vide par paquets et écrit une ligne JSON par ligne prédite dans des fichiers
+    en ajout seul, `predictions-<date>-<pid>.jsonl`. Le fichier courant est fermé et
+    un nouveau ouvert lorsqu'il dépasse `max_bytes` ou `max_age` secondes. Les valeurs
+    non finies (NaN, ±inf) sont écrites `null`.
+
+    Si la file est pleine, la prédiction n'est pas journalisée et est comptée dans
+    `dropped` : la requête n'attend jamais l'écriture.
+
+    Format d'une ligne (relisible par `read_predictions` et rejouable par
+    `benchmarks/load_suite.py`) :
+        {"timestamp": ..., "endpoint": "/predict", "model_name": ..., "model_version": ...,
+         "latency_ms": ..., "request": {"medinc": ..., ...}, "prediction": ...}
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None,
+        max_queue: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        max_bytes: int = 100 * 2**20,
+        max_age: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+            directory (str | Path, optional): Répertoire des journaux ; None désactive la journalisation.
+            max_queue (int, optional): Nombre maximal de requêtes en attente d'écriture. Defaults to 10000.
+            batch_size (int, optional): Nombre maximal de requêtes écrites par paquet. Defaults to 512.
+            flush_interval (float, optional): Délai maximal avant l'écriture d'une
+                requête, en secondes. Defaults to 1.0.
+            max_bytes (int, optional): Taille d'un fichier déclenchant la rotation. Defaults to 100 Mo.
+            max_age (float, optional): Âge d'un fichier déclenchant la rotation, en secondes. Defaults to 3600.
+        """
+        self.directory = Path(directory) if directory else None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.logged = 0  # Lignes écrites
+        self.dropped = 0  # Lignes perdues, file pleine
+        self.rotations = 0  # Fichiers remplacés (taille ou âge)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indique si les prédictions sont journalisées.
+        """
+        return self.directory is not None
+
+    def start(self) -> None:
+        """
+        Démarre le thread d'écriture, s'il n'est pas déjà lancé.
+        """
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(
+                target=self._run, name="prediction-log", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Écrit les prédictions en attente, arrête le thread et ferme le fichier courant.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def log(
+        self,
+        endpoint: str,
+        model_name: str,
+        model_version: str,
+        features: list[float] | np.ndarray,
+        predictions: float | np.ndarray,
+        latency: float | None,
+    ) -> None:
+        """
+        Met une requête en file d'écriture, sans jamais bloquer.
+
+        Args:
+            endpoint (str): Point de terminaison appelé.
+            model_name (str): Nom du modèle servi.
+            model_version (str): Version du modèle servi.
+            features (list[float] | np.ndarray): Caractéristiques d'une ligne, ou tableau (n, 8).
+            predictions (float | np.ndarray): Prédiction, ou prédictions des n lignes.
+            latency (float, optional): Durée de la requête jusqu'à la prédiction, en secondes.
+        """
+        if self._thread is None:
+            self.start()
+        entry = (time.time(), endpoint, model_name, model_version, latency)
+        try:
+            self._queue.put_nowait((entry, features, predictions))
+        except queue.Full:
+            self.dropped += np.size(predictions)
+
+    def _run(self) -> None:
+        """
+        Boucle d'écriture : vide la file par paquets, jusqu'au signal d'arrêt (None).
+        """
+        running = True
+        while running:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                items = []
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                running = False
+                items = [item for item in items if item is not None]
+            try:
+                if items:
+                    self._write(items)
+                elif self._file is not None and self._expired():
+                    self._rotate()
+            except Exception:
+                logger.exception("Failed to write the prediction log.")
+                self.dropped += sum(np.size(item[2]) for item in items)
+        self._close()
+
+    def _write(self, items: list) -> None:
+        """
+        Sérialise un paquet de requêtes et l'écrit en un seul appel.
+        """
+        lines = []
+        for entry, features, predictions in items:
+            timestamp, endpoint, name, version, latency = entry
+            features = _finite_list(np.atleast_2d(features))
+            predictions = _finite_list(np.atleast_1d(predictions))
+            header = {
+                "timestamp": datetime.fromtimestamp(
+                    timestamp, timezone.utc
+                ).isoformat(),
+                "endpoint": endpoint,
+                "model_name": name,
+                "model_version": version,
+                "latency_ms": None if latency is None else round(latency * 1000, 3),
+            }
+            for row, prediction in zip(features, predictions):
+                record = {
+                    **header,
+                    "request": dict(zip(INPUT_FIELDS, row)),
+                    "prediction": prediction,
+                }
+                lines.append(json.dumps(record, allow_nan=False) + "\n")
+
+        if self._file is not None and self._expired():
+            self._rotate()
+        if self._file is None:
+            self._open()
+        self._file.write("".join(lines))
+        self._file.flush()
+        self.logged += len(lines)
+
+    def _expired(self) -> bool:
+        """
+        Indique si le fichier courant doit être remplacé (taille ou âge).
+        """
+        return (
+            self._file.tell() >= self.max_bytes
+            or time.monotonic() - self._opened_at >= self.max_age
+        )
+
+    def _open(self) -> None:
+        """
+        Ouvre un nouveau fichier, en ajout seul.
+        """
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = self.directory / f"predictions-{stamp}-{os.getpid()}.jsonl"
+        self._file = open(path, "a", encoding="utf-8")
+        self._opened_at = time.monotonic()
+
+    def _rotate(self) -> None:
+        """
+        Ferme le fichier courant ; le prochain paquet ouvrira un nouveau fichier.
+        """
+        self._close()
+        self.rotations += 1
+
+    def _close(self) -> None:
+        """
+        Ferme le fichier courant, s'il est ouvert.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        """
+        Retourne la configuration et les compteurs du journal.
+        """
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory) if self.enabled else None,
+            "queued": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "logged": self.logged,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+        }
+
+
+def read_predictions(directory: str | Path) -> Iterator[dict]:
+    """
+    Relit, dans l'ordre des fichiers, les prédictions journalisées dans un répertoire.
+
+    Une dernière ligne incomplète (fichier en cours d'écriture) est ignorée.
+
+    Args:
+        directory (str | Path): Répertoire des journaux.
+
+    Yields:
+        dict: Une prédiction journalisée.
+    """
+    for path in sorted(Path(directory).glob("predictions-*.jsonl")):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+
+
+def _read_blocks(path: Path, block_size: int) -> Iterator[bytes]:
+    """
+    Lit un fichier par blocs d'environ `block_size` octets, coupés après une fin de
+    ligne. Une dernière ligne incomplète (fichier en cours d'écriture) est ignorée.
+    """
+    with open(path, "rb") as file:
+        rest = b""
+        while block := file.read(block_size):
+            block = rest + block
+            end = block.rfind(b"\n") + 1
+            if end:
+                yield block[:end]
+            rest = block[end:]
+
+
+def iter_prediction_chunks(
+    directory: str | Path, chunk_size: int = 100_000, block_size: int = 16 * 2**20
+) -> Iterator[pd.DataFrame]:
+    """
+    Relit les prédictions journalisées par blocs, pour l'analyse de dérive.
+
+    Chaque fichier est lu par blocs de `block_size` octets, analysés par le lecteur
+    JSON de pyarrow (multithread, schéma explicite), plusieurs fois plus rapide qu'un
+    `json.loads` par ligne ; la mémoire utilisée ne dépend pas de la taille des
+    fichiers. Une dernière ligne incomplète est ignorée, comme dans `read_predictions`.
+
+    Args:
+        directory (str | Path): Répertoire des journaux.
+        chunk_size (int, optional): Nombre maximal de lignes par bloc. Defaults to 100_000.
+        block_size (int, optional): Taille des lectures, en octets. Defaults to 16 Mo.
+
+    Yields:
+        pd.DataFrame: Caractéristiques (colonnes `FEATURE_COLUMNS`), "prediction",
+            "model_version" et "timestamp".
+    """
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+
+    schema = pa.schema(
+        [
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("model_version", pa.string()),
+            ("request", pa.struct([(field, pa.float64()) for field in INPUT_FIELDS])),
+            ("prediction", pa.float64()),
+        ]
+    )
+    options = pa_json.ParseOptions(
+        explicit_schema=schema, unexpected_field_behavior="ignore"
+    )
+    columns = [*FEATURE_COLUMNS, "prediction", "model_version", "timestamp"]
+
+    def to_frame(table: pa.Table) -> pd.DataFrame:
+        frame = table.flatten().to_pandas()
+        frame.columns = [
+            (
+                FEATURE_COLUMNS[INPUT_FIELDS.index(name[len("request.") :])]
+                if name.startswith("request.")
+                else name
+            )
+            for name in frame.columns
+        ]
+        return frame[columns]
+
+    for path in sorted(Path(directory).glob("predictions-*.jsonl")):
+        pending = None
+        for block in _read_blocks(path, block_size):
+            table = pa_json.read_json(pa.BufferReader(block), parse_options=options)
+            if pending is not None:
+                table = pa.concat_tables([pending, table])
+            while table.num_rows >= chunk_size:
+                yield to_frame(table.slice(0, chunk_size))
+                table = table.slice(chunk_size)
+            pending = table
+        if pending is not None and pending.num_rows:
+            yield to_frame(pending)
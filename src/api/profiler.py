@@ -0,0 +1,180 @@
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Threads de fond de l'API, hors du chemin des requêtes : écriture du journal des
+# prédictions (`PredictionLogger`), chargement et surveillance du modèle (`ModelLoader`)
+BACKGROUND_THREADS = ("prediction-log", "model-loader", "model-watcher")
+
+
+class SamplingProfiler:
+    """
+    Profileur statistique à la demande, par échantillonnage des piles d'appels.
+
+    Une fois démarré, un thread de fond relève à intervalle régulier la pile de chaque
+    thread (`sys._current_frames`) et ne conserve que celles qui traversent le code
+    des modules `roots` (par défaut l'API), c'est-à-dire le chemin de prédiction, du
+    point de terminaison jusqu'au wrapper `mlflow.pyfunc` et aux fonctions de
+    scikit-learn. Les threads de fond de l'API (`BACKGROUND_THREADS`), qui traversent
+    aussi ces modules mais attendent le plus souvent, sont ignorés. Les piles
+    identiques sont agrégées.
+
+    La session s'arrête après `seconds` secondes ou `requests` requêtes (signalées par
+    `request_done`). Inactif, le profileur n'a pas de thread et ne coûte qu'un test
+    de l'attribut `active` par requête.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        max_seconds: float = 60.0,
+        roots: tuple[str, ...] = ("src.api",),
+        ignored_threads: tuple[str, ...] = BACKGROUND_THREADS,
+    ) -> None:
+        """
+        Args:
+            interval (float, optional): Intervalle entre deux relevés, en secondes. Defaults to 0.005.
+            max_seconds (float, optional): Durée maximale d'une session. Defaults to 60.0.
+            roots (tuple[str, ...], optional): Préfixes des modules dont les piles sont
+                conservées. Defaults to ("src.api",).
+            ignored_threads (tuple[str, ...], optional): Noms des threads jamais
+                relevés. Defaults to `BACKGROUND_THREADS`.
+        """
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.roots = roots
+        self.ignored_threads = ignored_threads
+        self.active = False
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0  # Relevés effectués, y compris sans pile conservée
+        self.request_count = 0
+        self.max_requests: int | None = None
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self._deadline = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self, seconds: float | None = None, requests: int | None = None) -> None:
+        """
+        Démarre une session, en effaçant les piles de la précédente.
+
+        Args:
+            seconds (float, optional): Durée de la session, bornée par `max_seconds`.
+                Defaults to None (`max_seconds`).
+            requests (int, optional): Nombre de requêtes après lequel la session s'arrête.
+                Defaults to None (pas de limite).
+
+        Raises:
+            RuntimeError: Si une session est déjà en cours.
+        """
+        with self._lock:
+            if self.active:
+                raise RuntimeError("Une session de profilage est déjà en cours.")
+            self.samples = Counter()
+            self.sample_count = self.request_count = 0
+            self.max_requests = requests
+            self.started_at, self.stopped_at = time.time(), None
+            self._deadline = time.monotonic() + min(
+                seconds or self.max_seconds, self.max_seconds
+            )
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sampling-profiler", daemon=True
+            )
+            self.active = True
+            self._thread.start()
+        logger.info(
+            f"Profiling started (seconds={seconds}, requests={requests}, "
+            f"interval={self.interval * 1000:.1f}ms)."
+        )
+
+    def request_done(self) -> None:
+        """
+        Signale la fin d'une requête profilée ; arrête la session au-delà de `max_requests`.
+        """
+        self.request_count += 1
+        if self.max_requests is not None and self.request_count >= self.max_requests:
+            self._stop.set()
+
+    def stop(self) -> None:
+        """
+        Arrête la session en cours et attend la fin du thread d'échantillonnage.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        """
+        Boucle d'échantillonnage, jusqu'à l'échéance ou la demande d'arrêt.
+        """
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            if time.monotonic() >= self._deadline:
+                break
+            ignored = {own_id}
+            ignored.update(
+                thread.ident
+                for thread in threading.enumerate()
+                if thread.name in self.ignored_threads
+            )
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id not in ignored:
+                    stack = self._stack(frame)
+                    if stack is not None:
+                        self.samples[stack] += 1
+            self.sample_count += 1
+        self.active = False
+        self.stopped_at = time.time()
+        logger.info(
+            f"Profiling stopped after {self.sample_count} samples and "
+            f"{self.request_count} requests."
+        )
+
+    def _stack(self, frame) -> tuple[str, ...] | None:
+        """
+        Pile d'un thread, de la racine à la fonction en cours, ou None si elle ne
+        traverse aucun module de `roots`.
+        """
+        stack, kept = [], False
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "?")
+            kept = kept or module.startswith(self.roots)
+            stack.append(f"{module}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        return tuple(reversed(stack)) if kept else None
+
+    def collapsed(self) -> str:
+        """
+        Rapport au format « piles repliées » (une ligne "racine;...;feuille nombre"),
+        lu par flamegraph.pl, speedscope ou inferno.
+
+        Returns:
+            str: Piles agrégées, de la plus fréquente à la moins fréquente.
+        """
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+    def status(self) -> dict:
+        """
+        Retourne l'état de la session en cours ou de la dernière session.
+        """
+        return {
+            "active": self.active,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+            "interval": self.interval,
+            "samples": self.sample_count,
+            "stacks": len(self.samples),
+            "requests": self.request_count,
+            "max_requests": self.max_requests,
+        }
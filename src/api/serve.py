@@ -0,0 +1,76 @@
+import argparse
+import logging
+import os
+
+import uvicorn
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Lit les options de lancement de l'API.
+
+    Returns:
+        argparse.Namespace: Hôte, port et nombre de workers.
+    """
+    parser = argparse.ArgumentParser(
+        description="Lance l'API de prédiction, éventuellement sur plusieurs processus."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("API_WORKERS", "1")),
+        help="Nombre de processus uvicorn (défaut : API_WORKERS ou 1).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Lance uvicorn avec le nombre de workers demandé.
+
+    Avec plusieurs workers, le moteur "mmap" est utilisé par défaut : le modèle est
+    compilé et écrit sur disque une seule fois ici, avant la création des workers,
+    qui projettent ensuite les mêmes fichiers en mémoire en lecture seule. Le moteur
+    "onnx" copie de même le fichier ONNX une seule fois.
+    """
+    args = parse_args()
+    if args.workers > 1:
+        os.environ.setdefault("INFERENCE_BACKEND", "mmap")
+
+    # Import après la configuration de l'environnement, lue à l'import du module
+    from src.api import app as api
+
+    if api.INFERENCE_BACKEND in ("mmap", "onnx"):
+        from src.api.backends import materialize_model, materialize_onnx
+        from src.api.loader import resolve_model_version
+
+        version = resolve_model_version(
+            api.model_name,
+            api.model_version,
+            alias=api.model_alias,
+            stage=api.model_stage,
+        )
+        materialize = (
+            materialize_onnx if api.INFERENCE_BACKEND == "onnx" else materialize_model
+        )
+        path = materialize(f"models:/{api.model_name}/{version}")
+        logger.info(
+            f"Workers will load the '{api.INFERENCE_BACKEND}' model from {path}."
+        )
+
+    logger.info(
+        f"Starting API with {args.workers} worker(s) and the "
+        f"'{api.INFERENCE_BACKEND}' backend..."
+    )
+    uvicorn.run("src.api.app:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
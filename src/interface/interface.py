@@ -1,5 +1,37 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+import pandas as pd
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Adresse de l'API (service "fastapi" de docker-compose par défaut)
+API_URL = os.getenv("API_URL", "http://fastapi:8000").rstrip("/")
+# Délais maximaux (en secondes) d'établissement de la connexion et de lecture de la réponse
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "10"))
+# Nouvelles tentatives après une erreur de connexion ou une réponse 502, 503 ou 504,
+# espacées de API_BACKOFF * 2**(n - 1) secondes
+API_RETRIES = int(os.getenv("API_RETRIES", "2"))
+API_BACKOFF = float(os.getenv("API_BACKOFF", "0.2"))
+# Prédiction d'un fichier : lignes par requête "/predict/batch" et requêtes simultanées
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "4"))
+
+# Champs attendus par l'API, dans l'ordre de `Input`
+INPUT_FIELDS = [
+    "medinc",
+    "houseage",
+    "averooms",
+    "avebedrms",
+    "population",
+    "aveoccup",
+    "latitude",
+    "longitude",
+]
 
 st.markdown("# Prédiction des prix des logements en Californie")
 st.write(
@@ -8,25 +40,138 @@ st.write(
 )
 
 
-def model_prediction(input: dict) -> str:
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    Retourne la session HTTP partagée par toutes les exécutions du script.
+
+    Les connexions vers l'API restent ouvertes (keep-alive) et sont réutilisées d'un
+    clic à l'autre ; le pool en garde au plus `BULK_CONCURRENCY`. Les erreurs de
+    connexion et les réponses 502, 503 et 504 sont retentées `API_RETRIES` fois,
+    avec un délai croissant (les prédictions peuvent être rejouées sans effet de bord).
+
+    Returns:
+        requests.Session: Session configurée.
+    """
+    retry = Retry(
+        total=API_RETRIES,
+        backoff_factor=API_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=max(BULK_CONCURRENCY, 1), max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post(path: str, payload) -> requests.Response:
+    """
+    Envoie une requête POST à l'API avec la session partagée et les délais configurés.
+    """
+    return get_session().post(
+        f"{API_URL}{path}",
+        json=payload,
+        timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+    )
+
+
+def model_prediction(input: dict, approximate: bool = False) -> str:
     """
     Envoie les données au modèle via une requête POST et récupère la prédiction.
     Args:
         input (dict): Les données d'entrée au format JSON.
+        approximate (bool, optional): Prédiction approchée lue dans la grille précalculée
+            ("/predict/approximate"), exacte si l'API n'en propose pas. Defaults to False.
     Returns:
         str: La prédiction ou un message d'erreur.
     """
-    url = "http://fastapi:8000/predict" #"http://localhost:8000/predict"
     try:
-        response = requests.post(url, json=input)
+        response = post("/predict/approximate" if approximate else "/predict", input)
+        if approximate and response.status_code == 404:
+            approximate = False
+            response = post("/predict", input)
     except requests.exceptions.RequestException:
         return "Erreur : le modèle n'a pas pu effectuer une prédiction."
     if response.status_code != 200:
         return "Erreur : le modèle n'a pas pu effectuer une prédiction."
     prediction = response.json()["prediction"]
+    if approximate:
+        error_bound = response.json()["error_bound"]
+        return (
+            f"Le prix estimé pour le logement est d'environ {prediction*(10**5):.0f} "
+            f"dollars (± {error_bound*(10**5):.0f} dollars)."
+        )
     return f"Le prix prédit pour le logement est : {prediction*(10**5):.0f} dollars."
 
 
+def score_frame(
+    frame: pd.DataFrame,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    concurrency: int = BULK_CONCURRENCY,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> tuple[pd.Series, int]:
+    """
+    Prédit les prix d'un tableau de districts, par paquets envoyés en parallèle à "/predict/batch".
+
+    Les colonnes sont reconnues sans tenir compte de la casse ("MedInc" ou "medinc").
+    Les lignes invalides (valeur manquante ou non numérique) et celles d'un paquet en
+    échec, même après les nouvelles tentatives, restent sans prédiction.
+
+    Args:
+        frame (pd.DataFrame): Districts, une colonne par champ de `INPUT_FIELDS`.
+        chunk_size (int, optional): Lignes par requête. Defaults to `BULK_CHUNK_SIZE`.
+        concurrency (int, optional): Requêtes simultanées. Defaults to `BULK_CONCURRENCY`.
+        on_progress (Callable, optional): Appelée après chaque paquet avec le nombre de
+            lignes traitées et le nombre total, depuis le thread appelant.
+
+    Returns:
+        tuple: (prédictions alignées sur les lignes, NaN si absente ; nombre de lignes sans prédiction)
+
+    Raises:
+        KeyError: Si des colonnes manquent.
+    """
+    columns = {column.lower(): column for column in frame.columns}
+    missing = [field for field in INPUT_FIELDS if field not in columns]
+    if missing:
+        raise KeyError(f"Colonnes manquantes : {', '.join(missing)}.")
+    values = frame[[columns[field] for field in INPUT_FIELDS]]
+    # Les valeurs manquantes sont envoyées comme null (JSON ne connaît pas NaN)
+    values = values.astype(object).where(values.notna(), None)
+    values.columns = INPUT_FIELDS
+    records = values.to_dict("records")
+
+    predictions = [None] * len(records)
+
+    def score(start: int) -> list:
+        response = post("/predict/batch", records[start : start + chunk_size])
+        response.raise_for_status()
+        return response.json()["predictions"]
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        futures = {
+            executor.submit(score, start): start
+            for start in range(0, len(records), chunk_size)
+        }
+        for future in as_completed(futures):
+            start = futures[future]
+            try:
+                predictions[start : start + chunk_size] = future.result()
+            except (requests.exceptions.RequestException, KeyError, ValueError):
+                pass
+            done += min(chunk_size, len(records) - start)
+            if on_progress is not None:
+                on_progress(done, len(records))
+
+    series = pd.Series(predictions, index=frame.index, dtype=float)
+    return series, int(series.isna().sum())
+
+
 medinc = st.text_input("Revenu médian des ménages", value=0.0)
 houseage = st.text_input("Âge moyen des maisons", value=0.0)
 averooms = st.text_input("Nombre moyen de pièces par logement", value=0.0)
@@ -36,6 +181,11 @@ aveoccup = st.text_input("Nombre moyen d'occupants par logement", value=0.0)
 latitude = st.text_input("Latitude de la région", value=0.0)
 longitude = st.text_input("Longitude de la région", value=0.0)
 
+approximate = st.checkbox(
+    "Prédiction approchée (instantanée)",
+    help="Lue dans une grille précalculée ; la borne couvre 95 % des écarts au modèle exact.",
+)
+
 # Bouton pour déclencher la prédiction
 if st.button("Prédire"):
     try:
@@ -58,7 +208,34 @@ if st.button("Prédire"):
             "latitude": latitude,
             "longitude": longitude,
         }
-        prediction = model_prediction(input=input)
+        prediction = model_prediction(input=input, approximate=approximate)
         st.write(prediction)
     except ValueError:
         st.write("Veuillez entrer des nombres valides dans tous les champs.")
+
+# Prédiction d'un fichier CSV de districts (une colonne par caractéristique)
+st.subheader("Prédiction d'un fichier de districts")
+uploaded = st.file_uploader("Fichier CSV des districts", type="csv")
+if uploaded is not None and st.button("Prédire le fichier"):
+    districts = pd.read_csv(uploaded)
+    progress = st.progress(0.0, text="Prédiction en cours...")
+    try:
+        predictions, failed = score_frame(
+            districts,
+            on_progress=lambda done, total: progress.progress(
+                done / total, text=f"{done} / {total} districts prédits"
+            ),
+        )
+    except KeyError as exc:
+        st.error(exc.args[0])
+    else:
+        districts["prix_predit"] = (predictions * 10**5).round()
+        if failed:
+            st.warning(f"{failed} districts n'ont pas pu être prédits.")
+        st.dataframe(districts)
+        st.download_button(
+            "Télécharger les prédictions",
+            districts.to_csv(index=False),
+            file_name="predictions.csv",
+            mime="text/csv",
+        )
@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# scikit-learn n'est nécessaire que pour compiler un modèle, pas pour évaluer des
+# tableaux déjà exportés (voir `CompiledGradientBoosting.load`)
+if TYPE_CHECKING:
+    from sklearn.ensemble import GradientBoostingRegressor
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGradientBoosting:
+    """
+    Moteur d'inférence compilé pour un `GradientBoostingRegressor` entraîné.
+
+    Chaque arbre est complété en arbre binaire parfait de profondeur `depth` (les
+    feuilles peu profondes sont prolongées par des nœuds qui envoient toujours à
+    gauche), puis l'ensemble est stocké dans des tableaux NumPy contigus :
+
+    - `feature` (n_arbres, 2**depth - 1) : caractéristique testée par chaque nœud interne ;
+    - `threshold` (n_arbres, 2**depth - 1) : seuil de chaque nœud interne ;
+    - `value` (n_arbres, 2**depth) : valeur des feuilles, multipliée par le taux d'apprentissage.
+
+    Les enfants du nœud `i` sont implicitement `2i + 1` et `2i + 2`, ce qui permet de
+    parcourir tous les arbres niveau par niveau avec des opérations vectorisées.
+
+    La précision du moteur est celle de `threshold` : en float32 (voir `astype`),
+    caractéristiques, seuils et valeurs des feuilles occupent moitié moins de mémoire
+    et les prédictions s'écartent légèrement de celles de scikit-learn (somme des
+    feuilles en float32).
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        value: np.ndarray,
+        init: float,
+        chunk_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            feature (np.ndarray): Indices des caractéristiques des nœuds internes.
+            threshold (np.ndarray): Seuils des nœuds internes.
+            value (np.ndarray): Valeurs des feuilles (taux d'apprentissage inclus).
+            init (float): Prédiction initiale de l'ensemble.
+            chunk_size (int, optional): Nombre de lignes évaluées à la fois ; les
+                indices intermédiaires (n_arbres, chunk_size) restent ainsi dans le
+                cache du processeur. Defaults to 256.
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.init = float(init)
+        self.chunk_size = chunk_size
+        self.dtype = threshold.dtype
+        self.n_trees, n_internal = feature.shape
+        self.depth = int(np.log2(n_internal + 1))
+        if value.shape != (self.n_trees, n_internal + 1):
+            raise ValueError(
+                "Dimensions incohérentes entre nœuds internes et feuilles."
+            )
+        # Décalage de chaque arbre dans les tableaux aplatis
+        self._offset = (np.arange(self.n_trees) * n_internal)[:, None]
+        self._leaf_offset = np.arange(self.n_trees)[:, None] - n_internal
+        self._feature = feature.ravel()
+        self._threshold = threshold.ravel()
+        self._value = value.ravel()
+
+    @classmethod
+    def from_sklearn(
+        cls, model: "GradientBoostingRegressor", dtype=np.float64, **kwargs
+    ) -> "CompiledGradientBoosting":
+        """
+        Exporte un `GradientBoostingRegressor` entraîné dans des tableaux plats.
+
+        Args:
+            model (GradientBoostingRegressor): Modèle entraîné.
+            dtype (optional): Précision du moteur, np.float64 ou np.float32 (voir `astype`).
+                Defaults to np.float64.
+
+        Returns:
+            CompiledGradientBoosting: Moteur compilé équivalent.
+        """
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        if not isinstance(model, GradientBoostingRegressor):
+            raise TypeError(
+                f"Seul GradientBoostingRegressor est compilable, reçu {type(model).__name__}."
+            )
+        if model.init_ == "zero":
+            init = 0.0
+        elif isinstance(model.init_, DummyRegressor):
+            init = float(np.ravel(model.init_.constant_)[0])
+        else:
+            raise TypeError("Estimateur initial non supporté par le moteur compilé.")
+
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        depth = max(tree.max_depth for tree in trees)
+        n_internal = 2**depth - 1
+        feature = np.zeros((len(trees), n_internal), dtype=np.intp)
+        threshold = np.full((len(trees), n_internal), np.inf)
+        value = np.zeros((len(trees), n_internal + 1))
+
+        for t, tree in enumerate(trees):
+            # Parcours en profondeur : (nœud sklearn, position dans l'arbre parfait, niveau)
+            stack = [(0, 0, 0)]
+            while stack:
+                node, position, level = stack.pop()
+                left, right = tree.children_left[node], tree.children_right[node]
+                if level == depth:
+                    value[t, position - n_internal] = (
+                        model.learning_rate * tree.value[node, 0, 0]
+                    )
+                elif left == -1:
+                    # Feuille peu profonde : seuil infini, les deux enfants la prolongent
+                    stack.append((node, 2 * position + 1, level + 1))
+                    stack.append((node, 2 * position + 2, level + 1))
+                else:
+                    feature[t, position] = tree.feature[node]
+                    threshold[t, position] = tree.threshold[node]
+                    stack.append((left, 2 * position + 1, level + 1))
+                    stack.append((right, 2 * position + 2, level + 1))
+
+        logger.info(f"Compiled {len(trees)} trees of depth {depth}.")
+        return cls(feature, threshold, value, init, **kwargs).astype(dtype)
+
+    def astype(self, dtype) -> "CompiledGradientBoosting":
+        """
+        Convertit le moteur dans une autre précision.
+
+        En float32, chaque seuil est arrondi au plus grand float32 inférieur ou égal :
+        pour une caractéristique float32 `x`, `x > seuil_float32` équivaut alors
+        exactement à `x > seuil`, et chaque ligne atteint les mêmes feuilles qu'avec
+        scikit-learn. Seule la somme des valeurs des feuilles perd en précision.
+
+        Args:
+            dtype: np.float64 ou np.float32.
+
+        Returns:
+            CompiledGradientBoosting: Moteur converti (lui-même s'il est déjà dans cette précision).
+        """
+        dtype = np.dtype(dtype)
+        if dtype == self.dtype:
+            return self
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"Précision non supportée : {dtype}.")
+        threshold = self.threshold.astype(dtype)
+        above = threshold > self.threshold
+        threshold[above] = np.nextafter(threshold[above], dtype.type(-np.inf))
+        return type(self)(
+            self.feature,
+            threshold,
+            self.value.astype(dtype),
+            self.init,
+            chunk_size=self.chunk_size,
+        )
+
+    def save(self, path: str | Path) -> Path:
+        """
+        Écrit les tableaux du moteur dans un répertoire, un fichier `.npy` par tableau.
+
+        Le répertoire est d'abord écrit sous un nom temporaire puis renommé : un
+        lecteur concurrent ne voit jamais de fichiers incomplets. Si le répertoire
+        existe déjà (écrit par un autre processus), il est conservé tel quel.
+
+        Args:
+            path (str | Path): Répertoire de destination.
+
+        Returns:
+            Path: Répertoire contenant les tableaux.
+        """
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        tmp.mkdir(parents=True, exist_ok=True)
+        for name in ("feature", "threshold", "value"):
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        (tmp / "meta.json").write_text(json.dumps({"init": self.init}))
+        try:
+            tmp.rename(path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not path.exists():
+                raise
+        return path
+
+    @classmethod
+    def load(
+        cls, path: str | Path, mmap: bool = True, **kwargs
+    ) -> "CompiledGradientBoosting":
+        """
+        Charge un moteur écrit par `save`.
+
+        Args:
+            path (str | Path): Répertoire contenant les tableaux.
+            mmap (bool, optional): Projeter les fichiers en mémoire en lecture seule
+                plutôt que les copier ; les pages sont alors partagées entre tous
+                les processus qui chargent le même répertoire. Defaults to True.
+
+        Returns:
+            CompiledGradientBoosting: Moteur prêt à prédire.
+        """
+        path = Path(path)
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in ("feature", "threshold", "value")
+        }
+        meta = json.loads((path / "meta.json").read_text())
+        return cls(**arrays, init=meta["init"], **kwargs)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Prédit les valeurs pour un tableau de caractéristiques.
+
+        Args:
+            X (np.ndarray): Tableau (n, n_features), dans l'ordre d'entraînement.
+
+        Returns:
+            np.ndarray: Prédictions float64.
+        """
+        # scikit-learn compare des caractéristiques arrondies en float32 aux seuils
+        X = np.asarray(X, dtype=np.float32)
+        if self.dtype != X.dtype:
+            X = X.astype(self.dtype)
+        predictions = np.empty(len(X))
+        for start in range(0, len(X), self.chunk_size):
+            chunk = X[start : start + self.chunk_size]
+            predictions[start : start + len(chunk)] = self._predict_chunk(chunk)
+        return predictions
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """
+        Parcourt tous les arbres niveau par niveau pour un paquet de lignes.
+        """
+        n_rows, n_features = X.shape
+        values = X.ravel()
+        row_start = np.arange(n_rows) * n_features
+        # Indice global (dans les tableaux aplatis) du nœud courant de chaque arbre
+        node = np.repeat(self._offset, n_rows, axis=1)
+        for _ in range(self.depth):
+            x = np.take(values, np.take(self._feature, node) + row_start)
+            go_right = x > np.take(self._threshold, node)
+            # Enfant gauche 2i + 1 ou droit 2i + 2, en position locale à l'arbre ;
+            # mis à jour sur place, sans tableau intermédiaire
+            node *= 2
+            node -= self._offset - 1
+            node += go_right
+        # Les feuilles suivent les nœuds internes : position locale - n_internal
+        leaves = node + self._leaf_offset
+        return self.init + np.take(self._value, leaves).sum(axis=0)
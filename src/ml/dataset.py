@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+from pandas import DataFrame, Series
+
+logger = logging.getLogger(__name__)
+
+# Répertoire des jeux de données ingérés (un sous-dossier par jeu de données)
+DATASET_DIR = Path(
+    os.getenv("DATASET_DIR", Path.home() / ".cache" / "mlops-immobilier" / "datasets")
+)
+
+DEFAULT_DATASET = "california_housing"
+DEFAULT_TARGET = "MedHouseVal"
+
+FILES = ("features.npy", "target.npy")
+
+
+class Dataset:
+    """
+    Jeu de données ingéré dans un format colonnaire sur disque.
+
+    Le dossier du jeu de données contient :
+
+    - `features.npy` (n_lignes, n_caractéristiques) en ordre Fortran : chaque colonne
+      est contiguë sur disque ;
+    - `target.npy` (n_lignes,) : la cible ;
+    - `manifest.json` : noms des colonnes, type, découpage et sommes de contrôle SHA-256.
+
+    Les lignes sont rangées à l'ingestion dans l'ordre du découpage entraînement/test
+    (`train_test_split`) : chaque sous-ensemble est une tranche contiguë, projetée en
+    mémoire sans copie ni analyse au chargement.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path (Path): Dossier du jeu de données.
+        """
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        self.name = self.manifest["name"]
+        self.feature_names = self.manifest["features"]
+        self.target_name = self.manifest["target"]
+        self.rows = self.manifest["rows"]
+        self.train_rows = self.manifest["split"]["train_rows"]
+
+    @cached_property
+    def features(self) -> np.ndarray:
+        """
+        Caractéristiques de toutes les lignes, projetées en mémoire en lecture seule.
+        """
+        return np.load(self.path / "features.npy", mmap_mode="r")
+
+    @cached_property
+    def target(self) -> np.ndarray:
+        """
+        Cible de toutes les lignes, projetée en mémoire en lecture seule.
+        """
+        return np.load(self.path / "target.npy", mmap_mode="r")
+
+    def split(self, subset: str = "train") -> tuple[DataFrame, Series]:
+        """
+        Retourne un sous-ensemble sous forme de vues sur les fichiers projetés.
+
+        Args:
+            subset (str, optional): "train", "test" ou "all". Defaults to "train".
+
+        Returns:
+            tuple: (caractéristiques, cible)
+        """
+        rows = {
+            "train": slice(0, self.train_rows),
+            "test": slice(self.train_rows, None),
+            "all": slice(None),
+        }[subset]
+        X = DataFrame(self.features[rows], columns=self.feature_names, copy=False)
+        y = Series(self.target[rows], name=self.target_name, copy=False)
+        return X, y
+
+    def splits(self) -> tuple[DataFrame, DataFrame, Series, Series]:
+        """
+        Retourne X_train, X_test, y_train, y_test, comme `train_test_split`.
+        """
+        X_train, y_train = self.split("train")
+        X_test, y_test = self.split("test")
+        return X_train, X_test, y_train, y_test
+
+    def verify(self) -> None:
+        """
+        Vérifie les sommes de contrôle des fichiers du jeu de données.
+
+        Raises:
+            ValueError: Si un fichier a été modifié ou corrompu.
+        """
+        for file, checksum in self.manifest["files"].items():
+            if file_checksum(self.path / file) != checksum:
+                raise ValueError(f"Somme de contrôle invalide pour {self.path / file}.")
+
+
+def file_checksum(path: Path) -> str:
+    """
+    Calcule la somme SHA-256 d'un fichier, par blocs.
+    """
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def read_source(
+    source: str | Path | None, target: str = DEFAULT_TARGET
+) -> tuple[DataFrame, Series]:
+    """
+    Lit un jeu de données brut : California Housing ou un fichier CSV/Parquet local.
+
+    Args:
+        source (str | Path, optional): Fichier .csv ou .parquet ; None pour California Housing.
+        target (str, optional): Colonne cible d'un fichier local. Defaults to "MedHouseVal".
+
+    Returns:
+        tuple: (caractéristiques, cible)
+    """
+    if source is None:
+        from sklearn.datasets import fetch_california_housing
+
+        housing = fetch_california_housing(as_frame=True)
+        return housing.data, housing.target
+
+    import pandas as pd
+
+    path = Path(source)
+    if path.suffix == ".csv":
+        frame = pd.read_csv(path)
+    elif path.suffix in (".parquet", ".pq"):
+        frame = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Format de source non supporté : {path.suffix}.")
+    if target not in frame.columns:
+        raise ValueError(f"Colonne cible '{target}' absente de {path}.")
+    return frame.drop(columns=target), frame[target]
+
+
+def ingest(
+    name: str = DEFAULT_DATASET,
+    source: str | Path | None = None,
+    target: str = DEFAULT_TARGET,
+    dtype: str = "float64",
+    test_size: float = 0.2,
+    random_state: int = 42,
+    directory: Path | None = None,
+) -> Dataset:
+    """
+    Ingère un jeu de données brut dans le format colonnaire du dépôt local.
+
+    Les fichiers sont écrits dans un dossier temporaire puis renommés, pour qu'un
+    lecteur ne voie jamais un jeu de données partiel ; un jeu existant est remplacé.
+
+    Args:
+        name (str, optional): Nom du jeu de données. Defaults to "california_housing".
+        source (str | Path, optional): Fichier CSV/Parquet ; None pour California Housing.
+        target (str, optional): Colonne cible d'un fichier local. Defaults to "MedHouseVal".
+        dtype (str, optional): "float64" ou "float32". Defaults to "float64".
+        test_size (float, optional): Proportion de l'ensemble de test. Defaults to 0.2.
+        random_state (int, optional): Graine du découpage. Defaults to 42.
+        directory (Path, optional): Dépôt local. Defaults to `DATASET_DIR`.
+
+    Returns:
+        Dataset: Jeu de données ingéré.
+    """
+    from sklearn.model_selection import train_test_split
+
+    start = time.perf_counter()
+    X, y = read_source(source, target)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+    features = np.asfortranarray(
+        np.concatenate([X_train.to_numpy(dtype), X_test.to_numpy(dtype)])
+    )
+    target_values = np.concatenate([y_train.to_numpy(dtype), y_test.to_numpy(dtype)])
+
+    path = Path(directory or DATASET_DIR) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f"{path.name}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    np.save(tmp / "features.npy", features)
+    np.save(tmp / "target.npy", target_values)
+    manifest = {
+        "name": name,
+        "source": str(source) if source is not None else DEFAULT_DATASET,
+        "features": list(X.columns),
+        "target": y.name,
+        "dtype": dtype,
+        "rows": len(features),
+        "split": {
+            "test_size": test_size,
+            "random_state": random_state,
+            "train_rows": len(X_train),
+        },
+        "files": {file: file_checksum(tmp / file) for file in FILES},
+        "ingested_at": time.time(),
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    logger.info(
+        f"Dataset '{name}' ingested ({len(features)} rows) to {path} "
+        f"in {time.perf_counter() - start:.2f}s."
+    )
+    return Dataset(path)
+
+
+def load_dataset(
+    name: str = DEFAULT_DATASET,
+    source: str | Path | None = None,
+    target: str = DEFAULT_TARGET,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    directory: Path | None = None,
+    verify: bool = False,
+) -> Dataset:
+    """
+    Ouvre un jeu de données du dépôt local, en l'ingérant à la première utilisation.
+
+    Le jeu est ingéré à nouveau si la source, la cible ou le découpage demandés
+    diffèrent de ceux du manifeste. Sans source, un jeu nommé est réutilisé tel qu'il a
+    été ingéré, sauf le jeu par défaut, qui doit provenir de California Housing.
+
+    Args:
+        name (str, optional): Nom du jeu de données. Defaults to "california_housing".
+        source (str | Path, optional): Fichier CSV/Parquet ; None pour California Housing.
+        target (str, optional): Colonne cible d'un fichier local. Defaults to "MedHouseVal".
+        test_size (float, optional): Proportion de l'ensemble de test. Defaults to 0.2.
+        random_state (int, optional): Graine du découpage. Defaults to 42.
+        directory (Path, optional): Dépôt local. Defaults to `DATASET_DIR`.
+        verify (bool, optional): Vérifie les sommes de contrôle à l'ouverture. Defaults to False.
+
+    Returns:
+        Dataset: Jeu de données prêt à être découpé.
+    """
+    path = Path(directory or DATASET_DIR) / name
+    if (path / "manifest.json").exists():
+        dataset = Dataset(path)
+        manifest, split = dataset.manifest, dataset.manifest["split"]
+        if source is not None:
+            same_source = (
+                manifest["source"] == str(source) and manifest["target"] == target
+            )
+        else:
+            same_source = (
+                name != DEFAULT_DATASET or manifest["source"] == DEFAULT_DATASET
+            )
+        if (
+            same_source
+            and split["test_size"] == test_size
+            and split["random_state"] == random_state
+        ):
+            if verify:
+                dataset.verify()
+            return dataset
+    return ingest(
+        name,
+        source,
+        target,
+        test_size=test_size,
+        random_state=random_state,
+        directory=directory,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ingère un jeu de données dans le dépôt local."
+    )
+    parser.add_argument("--name", default=DEFAULT_DATASET)
+    parser.add_argument(
+        "--source", help="Fichier CSV ou Parquet (défaut : California Housing)."
+    )
+    parser.add_argument("--target", default=DEFAULT_TARGET)
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Vérifie les sommes de contrôle du jeu existant au lieu de l'ingérer.",
+    )
+    args = parser.parse_args()
+    if args.source and args.name == DEFAULT_DATASET:
+        parser.error(f"--source requiert --name (autre que {DEFAULT_DATASET}).")
+
+    if args.verify:
+        Dataset(DATASET_DIR / args.name).verify()
+        logger.info(f"Dataset '{args.name}' checksums verified.")
+    else:
+        ingest(args.name, args.source, args.target, dtype=args.dtype)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    main()
@@ -0,0 +1,206 @@
+from typing import Callable, Iterable
+
+import numpy as np
+from pandas import DataFrame, Series
+
+# Bornes des tranches de revenu médian (MedInc, en dizaines de milliers de dollars)
+MEDINC_EDGES = [2, 4, 6, 8]
+
+# Pas de la grille latitude/longitude des régions, en degrés
+REGION_STEP = 2.0
+
+
+class RunningMetrics:
+    """
+    Accumulateurs des métriques de régression, mis à jour bloc par bloc en un passage.
+
+    - MSE et MAE sont maintenues comme des moyennes courantes ;
+    - la moyenne et la somme des carrés des écarts de la cible (M2, dénominateur du R²)
+      suivent l'algorithme de Welford, étendu aux blocs (combinaison de Chan et al.),
+      numériquement stable même pour de très grands effectifs.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0  # Moyenne de la cible
+        self.m2 = 0.0  # Somme des carrés des écarts de la cible à sa moyenne
+        self.squared_error = 0.0  # Moyenne des erreurs au carré
+        self.absolute_error = 0.0  # Moyenne des erreurs absolues
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """
+        Ajoute un bloc d'observations.
+
+        Args:
+            y_true (np.ndarray): Valeurs réelles du bloc.
+            y_pred (np.ndarray): Prédictions du bloc.
+        """
+        if len(y_true) == 0:
+            return
+        errors = y_true - y_pred
+        mean = y_true.mean()
+        self.merge(
+            len(y_true),
+            mean,
+            np.sum((y_true - mean) ** 2),
+            np.mean(errors**2),
+            np.mean(np.abs(errors)),
+        )
+
+    def merge(
+        self,
+        count: int,
+        mean: float,
+        m2: float,
+        squared_error: float,
+        absolute_error: float,
+    ) -> None:
+        """
+        Combine les statistiques d'un bloc (effectif, moyenne, M2, MSE, MAE) aux accumulateurs.
+        """
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.mean += delta * count / total
+        self.squared_error += (squared_error - self.squared_error) * count / total
+        self.absolute_error += (absolute_error - self.absolute_error) * count / total
+        self.count = total
+
+    def result(self) -> dict:
+        """
+        Retourne les métriques accumulées, avec les clés de `evalute_model`.
+
+        Comme `r2_score`, un R² dont le dénominateur est nul vaut 1.0 si les
+        prédictions sont parfaites, 0.0 sinon.
+        """
+        residual = self.squared_error * self.count
+        if self.m2 > 0:
+            r2 = 1 - residual / self.m2
+        else:
+            r2 = 1.0 if residual == 0 else 0.0
+        return {
+            "mean_squared_error": float(self.squared_error),
+            "mean_absolute_error": float(self.absolute_error),
+            "r2": float(r2),
+        }
+
+
+class SlicedMetrics:
+    """
+    Métriques par tranche (ex. région, tranche de revenu), calculées dans le même passage.
+
+    Pour chaque bloc, les statistiques de chaque tranche sont agrégées de façon
+    vectorisée (`np.bincount`) puis combinées aux accumulateurs de la tranche.
+    """
+
+    def __init__(self, slicer: Callable[[DataFrame], Iterable]) -> None:
+        """
+        Args:
+            slicer (Callable): Fonction associant une étiquette de tranche à chaque ligne.
+        """
+        self.slicer = slicer
+        self.slices: dict[str, RunningMetrics] = {}
+
+    def update(self, X: DataFrame, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """
+        Ajoute un bloc d'observations, réparties selon leur tranche.
+        """
+        labels, inverse = np.unique(np.asarray(self.slicer(X)), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(labels))
+        means = np.bincount(inverse, y_true, len(labels)) / counts
+        m2 = np.bincount(inverse, (y_true - means[inverse]) ** 2, len(labels))
+        errors = y_true - y_pred
+        squared = np.bincount(inverse, errors**2, len(labels)) / counts
+        absolute = np.bincount(inverse, np.abs(errors), len(labels)) / counts
+        for i, label in enumerate(labels):
+            metrics = self.slices.setdefault(str(label), RunningMetrics())
+            metrics.merge(counts[i], means[i], m2[i], squared[i], absolute[i])
+
+    def result(self) -> dict[str, dict]:
+        """
+        Retourne les métriques et l'effectif de chaque tranche, par étiquette triée.
+        """
+        return {
+            label: {**metrics.result(), "count": metrics.count}
+            for label, metrics in sorted(self.slices.items())
+        }
+
+
+def medinc_bucket(X: DataFrame) -> np.ndarray:
+    """
+    Tranche de revenu médian de chaque ligne (ex. "2-4" pour 2 <= MedInc < 4,
+    "8-inf" au-delà de la dernière borne).
+    """
+    edges = [0, *MEDINC_EDGES, "inf"]
+    names = np.array([f"{low}-{high}" for low, high in zip(edges, edges[1:])])
+    return names[np.digitize(X["MedInc"], MEDINC_EDGES)]
+
+
+def region(X: DataFrame) -> np.ndarray:
+    """
+    Case de la grille latitude/longitude (pas `REGION_STEP`) de chaque ligne,
+    désignée par son coin sud-ouest (ex. "lat34_lon-120").
+    """
+    latitude = np.floor(X["Latitude"] / REGION_STEP) * REGION_STEP
+    longitude = np.floor(X["Longitude"] / REGION_STEP) * REGION_STEP
+    return (
+        "lat"
+        + latitude.astype(int).astype(str)
+        + "_lon"
+        + longitude.astype(int).astype(str)
+    ).to_numpy()
+
+
+# Découpages disponibles pour les métriques par tranche
+SLICES = {"medinc": medinc_bucket, "region": region}
+
+
+def evaluate_chunks(
+    model,
+    chunks: Iterable[tuple[DataFrame, Series]],
+    slices: dict[str, Callable[[DataFrame], Iterable]] | None = None,
+) -> dict:
+    """
+    Évalue un modèle en un seul passage sur un flux de blocs (caractéristiques, cible).
+
+    Chaque bloc est prédit puis intégré aux accumulateurs : aucun vecteur de
+    prédictions complet n'est conservé.
+
+    Args:
+        model: Modèle exposant `predict`.
+        chunks (Iterable): Blocs (caractéristiques, cible).
+        slices (dict, optional): Découpages des métriques par tranche, par nom. Defaults to None.
+
+    Returns:
+        dict: "mean_squared_error", "mean_absolute_error", "r2", puis pour chaque
+            découpage et chaque tranche des clés "<découpage>/<tranche>/<métrique>"
+            (métriques et effectif "count").
+    """
+    overall = RunningMetrics()
+    sliced = {name: SlicedMetrics(slicer) for name, slicer in (slices or {}).items()}
+    for X, y in chunks:
+        y_true = np.asarray(y, dtype=float)
+        y_pred = np.asarray(model.predict(X), dtype=float)
+        overall.update(y_true, y_pred)
+        for metrics in sliced.values():
+            metrics.update(X, y_true, y_pred)
+
+    scores = overall.result()
+    for name, metrics in sliced.items():
+        for label, values in metrics.result().items():
+            for key, value in values.items():
+                scores[f"{name}/{label}/{key}"] = value
+    return scores
+
+
+def iter_frame(X, y, chunk_size: int) -> Iterable[tuple]:
+    """
+    Découpe un jeu de données en mémoire (DataFrame ou tableau NumPy) en blocs
+    successifs de `chunk_size` lignes, sans copie.
+    """
+    for start in range(0, len(X), chunk_size):
+        rows = slice(start, start + chunk_size)
+        yield (
+            X.iloc[rows] if hasattr(X, "iloc") else X[rows],
+            y.iloc[rows] if hasattr(y, "iloc") else y[rows],
+        )
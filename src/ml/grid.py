@@ -0,0 +1,245 @@
+import itertools
+import logging
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# scikit-learn n'est nécessaire que pour construire la grille, pas pour l'interroger
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+logger = logging.getLogger(__name__)
+
+# Chemin de la grille dans les artefacts de l'exécution MLflow du modèle
+GRID_ARTIFACT = "grid/prediction_grid.npz"
+
+# Quantiles de l'erreur absolue mesurés sur l'échantillon de validation ; le
+# deuxième (95 %) sert de borne d'erreur annoncée par l'API
+ERROR_QUANTILES = (0.5, 0.95, 0.99, 1.0)
+ERROR_BOUND_QUANTILE = 0.95
+
+# Bornes de la grille : percentiles d'entraînement de chaque caractéristique
+GRID_PERCENTILES = (0.5, 99.5)
+
+
+class PredictionGrid:
+    """
+    Grille de prédictions précalculées, interrogée en temps constant.
+
+    La grille porte sur les `k` caractéristiques les plus influentes du modèle : en
+    chaque point d'une grille régulière de `resolution` valeurs par caractéristique,
+    elle stocke la dépendance partielle du modèle (prédiction moyenne sur les
+    districts d'entraînement, les autres caractéristiques gardant leurs valeurs).
+    Une prédiction approchée est l'interpolation multilinéaire des 2**k points qui
+    entourent la ligne, plus une constante d'ajustement ; les caractéristiques hors
+    grille sont ignorées et les valeurs hors bornes ramenées aux bords.
+
+    - `features` (k,) : positions des caractéristiques de la grille ;
+    - `lower`, `upper` (k,) : bornes de la grille ;
+    - `table` (resolution,) * k : dépendance partielle, float32 ;
+    - `offset` : constante ajoutée aux valeurs interpolées ;
+    - `errors` : quantiles `ERROR_QUANTILES` de l'erreur absolue par rapport au modèle exact.
+    """
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        table: np.ndarray,
+        offset: float,
+        errors: np.ndarray | None = None,
+    ) -> None:
+        self.features = np.asarray(features, dtype=np.intp)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.table = np.ascontiguousarray(table, dtype=np.float32)
+        self.offset = float(offset)
+        self.errors = (
+            np.full(len(ERROR_QUANTILES), np.nan) if errors is None else errors
+        )
+        self._last = np.array(self.table.shape) - 1
+        # Un axe de largeur nulle (caractéristique constante) garde l'indice 0
+        width = self.upper - self.lower
+        self._scale = np.divide(
+            self._last, width, out=np.zeros_like(width), where=width > 0
+        )
+        # Décalages, dans la table aplatie, des 2**k coins d'une cellule
+        self._strides = np.array(self.table.strides) // self.table.itemsize
+        self._corners = np.array(
+            list(itertools.product((0, 1), repeat=len(self.features))), dtype=bool
+        )
+        self._corner_offsets = self._corners @ self._strides
+
+    @classmethod
+    def build(
+        cls,
+        model: "BaseEstimator",
+        X,
+        X_validation,
+        n_features: int = 3,
+        resolution: int = 32,
+        features: list[int] | None = None,
+    ) -> "PredictionGrid":
+        """
+        Construit la grille d'un modèle entraîné et mesure son erreur.
+
+        La dépendance partielle est calculée par la méthode "recursion" de
+        scikit-learn (parcours pondéré des arbres, sans prédire chaque point de la
+        grille sur chaque district), disponible pour les ensembles d'arbres.
+
+        Args:
+            model (BaseEstimator): Ensemble d'arbres entraîné (ex. `GradientBoostingRegressor`).
+            X (DataFrame | np.ndarray): Caractéristiques d'entraînement (bornes, ajustement).
+            X_validation (DataFrame | np.ndarray): Lignes de mesure de l'erreur.
+            n_features (int, optional): Nombre de caractéristiques de la grille,
+                choisies par amplitude décroissante de leur dépendance partielle. Defaults to 3.
+            resolution (int, optional): Valeurs par caractéristique. Defaults to 32.
+            features (list[int], optional): Positions imposées des caractéristiques.
+
+        Returns:
+            PredictionGrid: Grille prête à interroger.
+        """
+        from sklearn.inspection import partial_dependence
+
+        if resolution < 2:
+            raise ValueError("La grille doit compter au moins 2 valeurs par axe.")
+        values = np.asarray(X, dtype=np.float64)
+        lower, upper = np.percentile(values, GRID_PERCENTILES, axis=0)
+        axes = [np.linspace(a, b, resolution) for a, b in zip(lower, upper)]
+
+        if features is None:
+            spread = [
+                np.ptp(
+                    partial_dependence(
+                        model,
+                        values,
+                        [feature],
+                        method="recursion",
+                        custom_values={feature: axes[feature]},
+                    )["average"]
+                )
+                for feature in range(values.shape[1])
+            ]
+            features = sorted(np.argsort(spread)[::-1][:n_features])
+        features = [int(feature) for feature in features]
+        table = partial_dependence(
+            model,
+            values,
+            features,
+            method="recursion",
+            custom_values={feature: axes[feature] for feature in features},
+        )["average"][0]
+
+        grid = cls(features, lower[features], upper[features], table, 0.0)
+        # La méthode "recursion" ignore la prédiction initiale du boosting : constante
+        # ajustée sur l'entraînement pour que l'erreur moyenne y soit nulle
+        grid.offset = float(np.mean(model.predict(values) - grid.predict(values)))
+        validation = np.asarray(X_validation, dtype=np.float64)
+        error = np.abs(grid.predict(validation) - model.predict(validation))
+        grid.errors = np.quantile(error, ERROR_QUANTILES)
+        logger.info(
+            f"Prediction grid over features {features} ({resolution} steps, "
+            f"{grid.table.nbytes / 2**10:.0f} KiB): p95 error {grid.error_bound:.3g}."
+        )
+        return grid
+
+    @property
+    def error_bound(self) -> float:
+        """
+        Erreur absolue non dépassée par 95 % des lignes de validation.
+        """
+        return float(self.errors[ERROR_QUANTILES.index(ERROR_BOUND_QUANTILE)])
+
+    @property
+    def resolution(self) -> int:
+        """
+        Nombre de valeurs de la grille par caractéristique.
+        """
+        return self.table.shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Prédictions approchées par interpolation multilinéaire dans la grille.
+
+        Args:
+            X (DataFrame | np.ndarray): Caractéristiques (n, 8) dans l'ordre de `FEATURE_COLUMNS`.
+
+        Returns:
+            np.ndarray: Prédictions approchées.
+        """
+        values = np.asarray(X, dtype=np.float64)[:, self.features]
+        position = np.clip((values - self.lower) * self._scale, 0, self._last)
+        cell = np.minimum(position.astype(np.intp), self._last - 1)
+        fraction = position - cell
+        # Poids (n, 2**k) et valeurs des coins de la cellule de chaque ligne
+        weights = np.where(
+            self._corners, fraction[:, None, :], 1 - fraction[:, None, :]
+        ).prod(axis=2)
+        corners = self.table.ravel()[
+            (cell @ self._strides)[:, None] + self._corner_offsets
+        ]
+        return (weights * corners).sum(axis=1) + self.offset
+
+    def save(self, path: str | Path) -> Path:
+        """
+        Écrit la grille dans un fichier NumPy `.npz`.
+        """
+        path = Path(path)
+        with path.open("wb") as file:
+            np.savez(
+                file,
+                features=self.features,
+                lower=self.lower,
+                upper=self.upper,
+                table=self.table,
+                offset=self.offset,
+                errors=self.errors,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PredictionGrid":
+        """
+        Charge une grille écrite par `save`.
+        """
+        with np.load(path) as arrays:
+            return cls(**{name: arrays[name] for name in arrays.files})
+
+
+def log_grid(grid: PredictionGrid) -> None:
+    """
+    Enregistre la grille dans l'exécution MLflow active (artefact `GRID_ARTIFACT`).
+    """
+    import mlflow
+
+    directory, name = GRID_ARTIFACT.rsplit("/", 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        mlflow.log_artifact(grid.save(Path(tmp) / name), directory)
+
+
+def load_grid(model_name: str, model_version: str | int) -> PredictionGrid:
+    """
+    Charge la grille de prédictions enregistrée avec une version du modèle.
+
+    Raises:
+        LookupError: Si la version n'a pas de grille (entraînée sans `--prediction-grid`).
+    """
+    import mlflow
+    from mlflow import MlflowClient
+    from mlflow.exceptions import MlflowException
+
+    run_id = MlflowClient().get_model_version(model_name, str(model_version)).run_id
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            path = mlflow.artifacts.download_artifacts(
+                f"runs:/{run_id}/{GRID_ARTIFACT}", dst_path=tmp
+            )
+        except (MlflowException, OSError) as exc:
+            raise LookupError(
+                f"Pas de grille de prédictions pour le modèle '{model_name}' "
+                f"version {model_version}."
+            ) from exc
+        return PredictionGrid.load(path)
@@ -0,0 +1,90 @@
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# skl2onnx et onnxruntime sont des dépendances optionnelles (voir le README),
+# importées seulement à l'export
+if TYPE_CHECKING:
+    from onnx import ModelProto
+    from sklearn.base import BaseEstimator
+
+logger = logging.getLogger(__name__)
+
+# Chemin de l'artefact ONNX dans l'exécution MLflow du modèle, et nom du fichier
+# écrit par la saveur `mlflow.onnx`
+ONNX_ARTIFACT = "onnx-model"
+ONNX_FILE = "model.onnx"
+# Version de l'ensemble d'opérateurs ONNX standard
+ONNX_OPSET = 17
+# Nom du tenseur d'entrée (n, 8), dans l'ordre de `FEATURE_COLUMNS`
+ONNX_INPUT = "features"
+# Écart maximal toléré entre onnxruntime et scikit-learn à l'export (un dollar)
+ONNX_MAX_ERROR = 1e-5
+
+
+def to_onnx(
+    model: "BaseEstimator", X_sample, max_error: float = ONNX_MAX_ERROR
+) -> "ModelProto":
+    """
+    Convertit un régresseur scikit-learn en graphe ONNX float32 et vérifie sa parité.
+
+    Le convertisseur (skl2onnx) produit un opérateur `TreeEnsembleRegressor` dont les
+    seuils sont arrondis au float32 inférieur : comme scikit-learn compare déjà les
+    caractéristiques en float32, chaque ligne atteint les mêmes feuilles. Seule la
+    somme des feuilles perd en précision.
+
+    Args:
+        model (BaseEstimator): Régresseur entraîné (`GradientBoostingRegressor` ou
+            `HistGradientBoostingRegressor`).
+        X_sample (DataFrame | np.ndarray): Lignes de validation de la parité.
+        max_error (float, optional): Écart maximal toléré avec `model.predict`.
+            Defaults to `ONNX_MAX_ERROR`.
+
+    Returns:
+        ModelProto: Modèle ONNX, entrée `ONNX_INPUT` (n, 8) float32.
+
+    Raises:
+        ValueError: Si l'écart avec scikit-learn dépasse `max_error`.
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    n_features = model.n_features_in_
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[(ONNX_INPUT, FloatTensorType([None, n_features]))],
+        target_opset=ONNX_OPSET,
+    )
+
+    X_sample = np.asarray(X_sample, dtype=np.float64)
+    error = float(
+        np.max(np.abs(onnx_predict(onnx_model, X_sample) - model.predict(X_sample)))
+    )
+    if error > max_error:
+        raise ValueError(
+            f"Export ONNX rejeté : écart maximal {error:.3g} avec scikit-learn "
+            f"(tolérance {max_error:.3g}) sur {len(X_sample)} lignes."
+        )
+    logger.info(f"ONNX export validated (max error {error:.3g}).")
+    return onnx_model
+
+
+def onnx_predict(onnx_model: "ModelProto", X: np.ndarray) -> np.ndarray:
+    """
+    Prédit avec onnxruntime à partir d'un modèle ONNX en mémoire.
+
+    Args:
+        onnx_model (ModelProto): Modèle produit par `to_onnx`.
+        X (np.ndarray): Caractéristiques (n, 8).
+
+    Returns:
+        np.ndarray: Prédictions float64.
+    """
+    import onnxruntime
+
+    session = onnxruntime.InferenceSession(
+        onnx_model.SerializeToString(), providers=["CPUExecutionProvider"]
+    )
+    (predictions,) = session.run(None, {ONNX_INPUT: X.astype(np.float32)})
+    return predictions.ravel().astype(np.float64)
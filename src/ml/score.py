@@ -0,0 +1,427 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.api.backends import BACKENDS, FEATURE_COLUMNS, Backend, load_backend
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Champs d'une ligne d'entrée, comme ceux de `Input` dans l'API ("medinc", ...)
+INPUT_FIELDS = [column.lower() for column in FEATURE_COLUMNS]
+
+# Formats reconnus d'après l'extension des fichiers
+CSV_SUFFIXES = (".csv",)
+PARQUET_SUFFIXES = (".parquet", ".pq")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# Moteur d'inférence des processus de calcul, chargé une fois dans le processus
+# parent puis hérité par chaque processus au fork (voir `score_file`)
+_backend: Backend | None = None
+
+
+def _format(path: Path) -> str:
+    """
+    Format d'un fichier d'après son extension : "csv", "parquet" ou "jsonl".
+    """
+    for name, suffixes in (
+        ("csv", CSV_SUFFIXES),
+        ("parquet", PARQUET_SUFFIXES),
+        ("jsonl", JSONL_SUFFIXES),
+    ):
+        if path.suffix in suffixes:
+            return name
+    raise ValueError(f"Format de fichier non supporté : {path.suffix}.")
+
+
+def _select_columns(names: list[str], source: Path) -> list[str]:
+    """
+    Colonnes d'un fichier correspondant à `INPUT_FIELDS`, sans tenir compte de la casse.
+
+    Raises:
+        KeyError: Si des colonnes manquent.
+    """
+    columns = {name.lower(): name for name in names}
+    missing = [field for field in INPUT_FIELDS if field not in columns]
+    if missing:
+        raise KeyError(f"Colonnes manquantes dans {source} : {', '.join(missing)}.")
+    return [columns[field] for field in INPUT_FIELDS]
+
+
+def read_chunks(
+    source: str | Path, chunk_size: int = 100_000, start: int = 0
+) -> Iterator[np.ndarray]:
+    """
+    Lit les caractéristiques d'un fichier CSV, Parquet ou JSONL par blocs.
+
+    Les colonnes sont celles de `Input` ("medinc" ou "MedInc"), dans n'importe quel
+    ordre ; les autres sont ignorées. Une valeur manquante ou non numérique devient NaN.
+
+    Args:
+        source (str | Path): Fichier .csv, .parquet ou .jsonl (un objet JSON par ligne).
+        chunk_size (int, optional): Nombre maximal de lignes par bloc. Defaults to 100_000.
+        start (int, optional): Nombre de lignes à sauter (reprise). Defaults to 0.
+
+    Yields:
+        np.ndarray: Bloc (n, 8) float64 dans l'ordre de `FEATURE_COLUMNS`.
+    """
+    path = Path(source)
+    kind = _format(path)
+    if kind == "csv":
+        columns = _select_columns(list(pd.read_csv(path, nrows=0).columns), path)
+        # Lignes sautées après analyse, comptées comme à la prédiction (lignes vides
+        # ignorées) ; les blocs sautés sont libérés un à un
+        skip = start
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk.iloc[dropped:], skip - dropped
+                if len(chunk):
+                    yield _to_values(chunk[columns])
+    elif kind == "parquet":
+        import pyarrow.parquet as pq
+
+        file = pq.ParquetFile(path)
+        columns = _select_columns(file.schema_arrow.names, path)
+        # Groupes de lignes entièrement sautés sans être lus
+        groups, skip = [], start
+        for index in range(file.num_row_groups):
+            rows = file.metadata.row_group(index).num_rows
+            if skip >= rows and not groups:
+                skip -= rows
+            else:
+                groups.append(index)
+        if not groups:
+            return
+        for batch in file.iter_batches(
+            batch_size=chunk_size, row_groups=groups, columns=columns
+        ):
+            if skip:
+                dropped = min(skip, len(batch))
+                batch, skip = batch.slice(dropped), skip - dropped
+            if len(batch):
+                yield _to_values(batch.to_pandas())
+    else:
+        import pyarrow as pa
+        import pyarrow.json as pa_json
+
+        options = pa_json.ParseOptions(
+            explicit_schema=pa.schema(
+                [(field, pa.float64()) for field in INPUT_FIELDS]
+            ),
+            unexpected_field_behavior="ignore",
+        )
+        with path.open("rb") as file:
+            # Les lignes vides ne sont pas des lignes d'entrée (ni prédites, ni comptées
+            # dans `start`)
+            records = (line for line in file if not line.isspace())
+            for _ in islice(records, start):
+                pass
+            while lines := list(islice(records, chunk_size)):
+                table = pa_json.read_json(
+                    pa.BufferReader(b"".join(lines)), parse_options=options
+                )
+                yield _to_values(table.select(INPUT_FIELDS).to_pandas())
+
+
+def _to_values(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Convertit un bloc en tableau float64, les valeurs non numériques devenant NaN.
+    """
+    if any(dtype == object for dtype in frame.dtypes):
+        frame = frame.apply(pd.to_numeric, errors="coerce")
+    return frame.to_numpy(dtype=np.float64)
+
+
+def _score_chunk(values: np.ndarray) -> np.ndarray:
+    """
+    Prédit un bloc dans un processus de calcul ; les lignes incomplètes restent à NaN.
+    """
+    predictions = np.full(len(values), np.nan)
+    valid = ~np.isnan(values).any(axis=1)
+    if valid.any():
+        predictions[valid] = _backend.predict(values[valid])
+    return predictions
+
+
+def _init_worker() -> None:
+    """
+    Limite chaque processus de calcul à un thread (OpenMP/BLAS), pour ne pas
+    surcharger les cœurs déjà occupés par les autres processus.
+    """
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+
+
+class PredictionWriter:
+    """
+    Écrit les prédictions dans l'ordre des lignes d'entrée, de façon reprenable.
+
+    - CSV et JSONL : un seul fichier, complété bloc par bloc. À la reprise, il est
+      tronqué à la taille enregistrée au dernier point de reprise, ce qui efface un
+      bloc à moitié écrit ;
+    - Parquet : un répertoire, un fichier `part-<première ligne>.parquet` par bloc,
+      relu dans l'ordre par `pd.read_parquet(répertoire)`. À la reprise, les fichiers
+      postérieurs au point de reprise sont supprimés.
+
+    Chaque bloc est écrit sur le disque (`fsync`) avant d'être compté dans `rows`.
+    """
+
+    def __init__(self, output: str | Path, rows: int = 0, size: int = 0) -> None:
+        """
+        Args:
+            output (str | Path): Fichier .csv ou .jsonl, ou répertoire .parquet.
+            rows (int, optional): Lignes déjà écrites (reprise). Defaults to 0.
+            size (int, optional): Taille du fichier CSV/JSONL à conserver (reprise). Defaults to 0.
+        """
+        self.path = Path(output)
+        self.kind = _format(self.path)
+        self.rows = rows
+        self._file = None
+        if self.kind == "parquet":
+            self.path.mkdir(parents=True, exist_ok=True)
+            for part in self.path.glob("part-*.parquet"):
+                if int(part.stem.split("-")[1]) >= rows:
+                    part.unlink()
+        else:
+            self._file = open(self.path, "r+b" if rows else "wb")
+            self._file.truncate(size)
+            self._file.seek(size)
+            if not rows and self.kind == "csv":
+                self._file.write(b"prediction\n")
+
+    @property
+    def size(self) -> int:
+        """
+        Taille du fichier CSV/JSONL écrit (0 pour Parquet).
+        """
+        return self._file.tell() if self._file is not None else 0
+
+    def write(self, predictions: np.ndarray) -> None:
+        """
+        Ajoute les prédictions d'un bloc à la suite des précédentes.
+        """
+        if self.kind == "parquet":
+            part = self.path / f"part-{self.rows:012d}.parquet"
+            pd.DataFrame({"prediction": predictions}).to_parquet(part, index=False)
+        else:
+            # Représentation exacte des flottants ; "" (CSV, comme pandas : une ligne
+            # vide serait ignorée à la relecture) ou null (JSONL) pour une ligne sans
+            # prédiction
+            empty, line = (
+                ('""', "{}\n")
+                if self.kind == "csv"
+                else ("null", '{{"prediction": {}}}\n')
+            )
+            text = "".join(
+                line.format(empty if value != value else repr(value))
+                for value in predictions.tolist()
+            )
+            self._file.write(text.encode())
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.rows += len(predictions)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def checkpoint_path(output: str | Path) -> Path:
+    """
+    Fichier de reprise associé à une sortie (`<sortie>.checkpoint.json`).
+    """
+    output = Path(output)
+    return output.with_name(output.name + ".checkpoint.json")
+
+
+def save_checkpoint(
+    path: Path, source: Path, model_uri: str, writer: PredictionWriter
+) -> None:
+    """
+    Enregistre atomiquement le nombre de lignes écrites et la taille de la sortie.
+    """
+    state = {
+        "source": str(source.resolve()),
+        "model_uri": model_uri,
+        "rows": writer.rows,
+        "size": writer.size,
+    }
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(state))
+    os.replace(temporary, path)
+
+
+def score_file(
+    source: str | Path,
+    output: str | Path,
+    model_uri: str,
+    backend: str = "sklearn",
+    workers: int | None = None,
+    chunk_size: int = 100_000,
+    resume: bool = False,
+) -> int:
+    """
+    Prédit toutes les lignes d'un fichier, par blocs, dans un pool de processus.
+
+    Le pipeline enchaîne trois étapes :
+
+    1. le processus parent lit les blocs (`read_chunks`) et les soumet au pool ;
+    2. chaque processus de calcul prédit ses blocs avec le moteur d'inférence, chargé
+       une seule fois dans le parent et hérité au fork, sans copie ni rechargement ;
+    3. le parent écrit les prédictions dans l'ordre de soumission (`PredictionWriter`)
+       puis met à jour le point de reprise.
+
+    Au plus `2 * workers` blocs sont en cours à la fois : la mémoire reste bornée par
+    la taille des blocs, quelle que soit la taille du fichier.
+
+    Args:
+        source (str | Path): Fichier d'entrée .csv, .parquet ou .jsonl.
+        output (str | Path): Fichier .csv ou .jsonl, ou répertoire .parquet de sortie.
+        model_uri (str): URI MLflow du modèle (ex. "models:/Production-model/1").
+        backend (str, optional): Moteur d'inférence (voir `BACKENDS`). Defaults to "sklearn".
+        workers (int, optional): Processus de calcul ; None pour un par cœur, 0 pour
+            prédire dans le processus courant. Defaults to None.
+        chunk_size (int, optional): Lignes par bloc. Defaults to 100_000.
+        resume (bool, optional): Reprend après le dernier bloc écrit d'une exécution
+            interrompue, d'après le point de reprise de la sortie. Defaults to False.
+
+    Returns:
+        int: Nombre de lignes prédites par cet appel.
+
+    Raises:
+        ValueError: Si le point de reprise a été écrit pour un autre fichier d'entrée
+            ou un autre modèle.
+    """
+    global _backend
+
+    source = Path(source)
+    checkpoint = checkpoint_path(output)
+    rows, size = 0, 0
+    if resume and checkpoint.exists():
+        state = json.loads(checkpoint.read_text())
+        if (state["source"], state["model_uri"]) != (str(source.resolve()), model_uri):
+            raise ValueError(
+                f"Le point de reprise {checkpoint} concerne {state['source']} et le "
+                f"modèle {state['model_uri']}, pas {source} et {model_uri}."
+            )
+        rows, size = state["rows"], state["size"]
+        logger.info(f"Resuming after {rows} rows from {checkpoint}.")
+
+    workers = os.cpu_count() if workers is None else workers
+    _backend = load_backend(backend, model_uri)
+    writer = PredictionWriter(output, rows, size)
+    start, missing = time.perf_counter(), 0
+
+    def write(predictions: np.ndarray) -> None:
+        nonlocal missing
+        writer.write(predictions)
+        save_checkpoint(checkpoint, source, model_uri, writer)
+        missing += int(np.isnan(predictions).sum())
+
+    chunks = read_chunks(source, chunk_size, rows)
+    try:
+        if workers == 0:
+            for values in chunks:
+                write(_score_chunk(values))
+        else:
+            # "fork" : les processus héritent du moteur déjà chargé par le parent
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+            ) as executor:
+                pending: deque[Future] = deque()
+                for values in chunks:
+                    pending.append(executor.submit(_score_chunk, values))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        writer.close()
+
+    scored = writer.rows - rows
+    duration = time.perf_counter() - start
+    logger.info(
+        f"Scored {scored} rows in {duration:.1f}s ({scored / max(duration, 1e-9):,.0f} rows/s, "
+        f"{workers} worker(s)), {missing} without prediction, written to {output}."
+    )
+    return scored
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Lit les options de la commande de prédiction par lot.
+
+    Returns:
+        argparse.Namespace: Fichiers, modèle, moteur, parallélisme et reprise.
+    """
+    parser = argparse.ArgumentParser(
+        description="Prédit les prix d'un fichier de districts avec le modèle enregistré."
+    )
+    parser.add_argument("source", help="Fichier .csv, .parquet ou .jsonl à prédire.")
+    parser.add_argument(
+        "output", help="Fichier .csv ou .jsonl, ou répertoire .parquet de sortie."
+    )
+    parser.add_argument("--model-name", default="Production-model")
+    parser.add_argument(
+        "--model-version", default="1", help='Numéro de version ou "latest".'
+    )
+    parser.add_argument("--model-alias", default=None)
+    parser.add_argument(
+        "--backend",
+        default="sklearn",
+        choices=list(BACKENDS),
+        help="Moteur d'inférence.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processus de calcul (défaut : un par cœur ; 0 : processus courant).",
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprend une exécution interrompue après son dernier bloc écrit.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    from src.api.loader import resolve_model_version
+
+    args = parse_args()
+    version = resolve_model_version(
+        args.model_name, args.model_version, alias=args.model_alias
+    )
+    score_file(
+        args.source,
+        args.output,
+        f"models:/{args.model_name}/{version}",
+        backend=args.backend,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        resume=args.resume,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+import mlflow
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from threadpoolctl import threadpool_limits
+
+logger = logging.getLogger(__name__)
+
+# Espaces de recherche par défaut, par famille de modèles (voir `MODEL_FAMILIES`
+# dans train.py)
+SEARCH_SPACES = {
+    "gradient_boosting": {
+        "n_estimators": [100, 150, 300],
+        "max_depth": [3, 4, 5, 6],
+        "learning_rate": [0.05, 0.1, 0.15, 0.2],
+        "subsample": [0.8, 1.0],
+    },
+    "hist_gradient_boosting": {
+        "max_iter": [100, 200, 400],
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_leaf_nodes": [15, 31, 63],
+        "min_samples_leaf": [10, 20, 50],
+        "l2_regularization": [0.0, 1.0],
+    },
+}
+DEFAULT_SPACE = SEARCH_SPACES["gradient_boosting"]
+
+# État des processus de recherche, initialisé une fois par processus (voir `_init_worker`)
+_worker: dict = {}
+
+
+@dataclass
+class Trial:
+    """
+    Résultat de la validation croisée d'une configuration d'hyperparamètres.
+    """
+
+    number: int  # Numéro de l'essai
+    params: dict  # Hyperparamètres évalués
+    status: str  # "completed", "pruned", "timeout" ou "failed"
+    metrics: dict = field(default_factory=dict)  # Moyenne sur les plis évalués
+    folds: int = 0  # Nombre de plis évalués
+    seconds: float = 0.0  # Durée de l'essai
+
+
+def candidate_params(
+    space: dict,
+    strategy: str = "random",
+    n_iter: int = 20,
+    random_state: int | None = None,
+) -> list[dict]:
+    """
+    Énumère les configurations à évaluer.
+
+    Args:
+        space (dict): Valeurs possibles de chaque hyperparamètre.
+        strategy (str, optional): "grid" (toutes les combinaisons) ou "random". Defaults to "random".
+        n_iter (int, optional): Nombre de configurations tirées en recherche aléatoire. Defaults to 20.
+        random_state (int, optional): Graine du tirage. Defaults to None.
+
+    Returns:
+        list[dict]: Configurations à évaluer.
+    """
+    if strategy == "grid":
+        return list(ParameterGrid(space))
+    if strategy == "random":
+        n_iter = min(n_iter, len(ParameterGrid(space)))
+        return list(ParameterSampler(space, n_iter, random_state=random_state))
+    raise ValueError(f"Stratégie de recherche inconnue : {strategy}.")
+
+
+def _init_worker(
+    X: np.ndarray,
+    y: np.ndarray,
+    folds: list,
+    model_factory: Callable[..., BaseEstimator],
+    best_score,
+    deadline: float,
+    prune_ratio: float,
+    threads: int,
+) -> None:
+    """
+    Reçoit une seule fois par processus les données, les plis et l'état partagé.
+    """
+    # Les modèles multi-threads (ex. HistGradientBoostingRegressor) se partagent
+    # les cœurs entre processus au lieu de les sursouscrire
+    threadpool_limits(threads)
+    # Les journaux d'évaluation de chaque pli restent dans le processus parent
+    logging.getLogger("src.ml.train").setLevel(logging.WARNING)
+    _worker.update(
+        X=X,
+        y=y,
+        folds=folds,
+        model_factory=model_factory,
+        best_score=best_score,
+        deadline=deadline,
+        prune_ratio=prune_ratio,
+    )
+
+
+def evaluate_params(number: int, params: dict) -> Trial:
+    """
+    Évalue une configuration par validation croisée, dans un processus de recherche.
+
+    L'essai s'arrête avant la fin des plis si la moyenne de son erreur quadratique
+    dépasse `prune_ratio` fois celle du meilleur essai terminé ("pruned"), ou si le
+    budget de temps est écoulé ("timeout").
+
+    Args:
+        number (int): Numéro de l'essai.
+        params (dict): Hyperparamètres à évaluer.
+
+    Returns:
+        Trial: Résultat de l'essai.
+    """
+    from src.ml.train import evalute_model
+
+    start = time.perf_counter()
+    X, y = _worker["X"], _worker["y"]
+    scores = []
+    status = "completed"
+    try:
+        for train_index, test_index in _worker["folds"]:
+            if time.time() > _worker["deadline"]:
+                status = "timeout"
+                break
+            model = _worker["model_factory"](**params)
+            model.fit(X[train_index], y[train_index])
+            scores.append(evalute_model(model, X[test_index], y[test_index]))
+            mse = np.mean([score["mean_squared_error"] for score in scores])
+            if len(scores) < len(_worker["folds"]) and (
+                mse > _worker["prune_ratio"] * _worker["best_score"].value
+            ):
+                status = "pruned"
+                break
+    except Exception as exc:
+        logger.warning(f"Trial {number} failed: {exc}")
+        status = "failed"
+    metrics = (
+        {key: float(np.mean([score[key] for score in scores])) for key in scores[0]}
+        if scores
+        else {}
+    )
+    return Trial(
+        number=number,
+        params=params,
+        status=status,
+        metrics=metrics,
+        folds=len(scores),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def run_search(
+    X,
+    y,
+    space: dict = DEFAULT_SPACE,
+    strategy: str = "random",
+    n_iter: int = 20,
+    cv: int = 3,
+    n_jobs: int | None = None,
+    budget: float | None = None,
+    prune_ratio: float = 1.5,
+    model_factory: Callable[..., BaseEstimator] = GradientBoostingRegressor,
+    random_state: int | None = None,
+    on_trial: Callable[[Trial], None] | None = None,
+) -> list[Trial]:
+    """
+    Recherche d'hyperparamètres par validation croisée, en parallèle sur un pool de processus.
+
+    Les essais sont soumis au fur et à mesure que des processus se libèrent : une fois le
+    budget de temps écoulé, aucun nouvel essai ne démarre et les essais en cours s'arrêtent
+    après leur pli courant. La meilleure erreur quadratique moyenne est partagée entre les
+    processus pour interrompre tôt les configurations nettement moins bonnes.
+
+    Args:
+        X: Caractéristiques d'entraînement.
+        y: Cibles d'entraînement.
+        space (dict, optional): Valeurs possibles de chaque hyperparamètre. Defaults to DEFAULT_SPACE.
+        strategy (str, optional): "grid" ou "random". Defaults to "random".
+        n_iter (int, optional): Nombre de configurations en recherche aléatoire. Defaults to 20.
+        cv (int, optional): Nombre de plis de la validation croisée. Defaults to 3.
+        n_jobs (int, optional): Nombre de processus. Defaults to None (tous les cœurs).
+        budget (float, optional): Durée maximale de la recherche en secondes. Defaults to None.
+        prune_ratio (float, optional): Seuil d'arrêt anticipé, relatif au meilleur essai. Defaults to 1.5.
+        model_factory (Callable, optional): Constructeur du modèle. Defaults to GradientBoostingRegressor.
+        random_state (int, optional): Graine des plis, du tirage et des modèles. Defaults to None.
+        on_trial (Callable, optional): Fonction appelée, dans ce processus, avec chaque essai terminé.
+
+    Returns:
+        list[Trial]: Essais évalués, par ordre de fin.
+    """
+    X, y = np.asarray(X), np.asarray(y)
+    candidates = candidate_params(space, strategy, n_iter, random_state)
+    if random_state is not None:
+        candidates = [{"random_state": random_state, **params} for params in candidates]
+    folds = list(KFold(cv, shuffle=True, random_state=random_state).split(X))
+    n_jobs = n_jobs or os.cpu_count() or 1
+    deadline = time.time() + budget if budget is not None else math.inf
+    best_score = multiprocessing.Value("d", math.inf)
+    logger.info(
+        f"Starting {strategy} search over {len(candidates)} configurations "
+        f"with {n_jobs} process(es)..."
+    )
+
+    trials = []
+    remaining = iter(enumerate(candidates))
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_worker,
+        initargs=(
+            X,
+            y,
+            folds,
+            model_factory,
+            best_score,
+            deadline,
+            prune_ratio,
+            max(1, (os.cpu_count() or 1) // n_jobs),
+        ),
+    ) as executor:
+
+        def submit_next() -> None:
+            if time.time() < deadline:
+                for number, params in remaining:
+                    pending.add(executor.submit(evaluate_params, number, params))
+                    return
+
+        pending = set()
+        for _ in range(n_jobs):
+            submit_next()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial = future.result()
+                if trial.status == "completed":
+                    with best_score.get_lock():
+                        best_score.value = min(
+                            best_score.value, trial.metrics["mean_squared_error"]
+                        )
+                logger.info(
+                    f"Trial {trial.number} {trial.status} in {trial.seconds:.1f}s: "
+                    f"{trial.params} {trial.metrics}"
+                )
+                trials.append(trial)
+                if on_trial is not None:
+                    on_trial(trial)
+                submit_next()
+
+    skipped = len(candidates) - len(trials)
+    if skipped:
+        logger.info(f"Time budget exhausted, {skipped} configuration(s) not evaluated.")
+    return trials
+
+
+def best_trial(trials: list[Trial]) -> Trial | None:
+    """
+    Retourne l'essai terminé de plus faible erreur quadratique moyenne, ou None.
+    """
+    completed = [trial for trial in trials if trial.status == "completed"]
+    if not completed:
+        return None
+    return min(completed, key=lambda trial: trial.metrics["mean_squared_error"])
+
+
+def log_trial(trial: Trial) -> None:
+    """
+    Enregistre un essai comme exécution MLflow imbriquée dans l'exécution active.
+
+    Seuls les paramètres, les métriques de validation croisée et l'état de l'essai sont
+    enregistrés ; le modèle n'est journalisé que pour la meilleure configuration.
+
+    Args:
+        trial (Trial): Essai à enregistrer.
+    """
+    with mlflow.start_run(run_name=f"trial-{trial.number}", nested=True):
+        mlflow.log_params(trial.params)
+        mlflow.log_metrics(trial.metrics)
+        mlflow.log_metrics({"cv_folds": trial.folds, "trial_seconds": trial.seconds})
+        mlflow.set_tag("status", trial.status)
@@ -0,0 +1,195 @@
+from typing import Callable
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.neighbors import KDTree
+from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import check_is_fitted
+
+# Kilomètres par degré de latitude (rayon terrestre moyen de 6371 km)
+KM_PER_DEGREE = 6371.0 * np.pi / 180
+
+# Colonnes ajoutées par `SpatialNeighborFeatures`, dans l'ordre
+NEIGHBOR_FEATURES = ["neighbor_medinc", "neighbor_target", "neighbor_distance"]
+
+# Noms attendus aux positions `columns` (revenu médian, latitude, longitude)
+COLUMN_NAMES = ("MedInc", "Latitude", "Longitude")
+
+
+class SpatialNeighborFeatures(TransformerMixin, BaseEstimator):
+    """
+    Ajoute à chaque district des agrégats de ses k plus proches voisins d'entraînement.
+
+    À l'entraînement, les districts sont indexés dans un arbre KD
+    (`sklearn.neighbors.KDTree`) sur leurs coordonnées projetées en kilomètres
+    (projection équirectangulaire autour de la latitude moyenne, précise à mieux
+    que 1 % à l'échelle de la Californie). Colonnes ajoutées (`NEIGHBOR_FEATURES`) :
+
+    - "neighbor_medinc" : revenu médian moyen des voisins ;
+    - "neighbor_target" : cible moyenne des voisins (encodage spatial par la cible) ;
+    - "neighbor_distance" : distance moyenne aux voisins, en km (densité du voisinage).
+
+    Dans `fit_transform` (entraînement), chaque district est retiré de ses propres
+    voisins : l'encodage par la cible ne voit jamais la cible de la ligne encodée.
+    L'arbre, les revenus et les cibles d'entraînement sont sérialisés avec le modèle.
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 8,
+        columns: tuple[int, int, int] = (0, 6, 7),
+        leaf_size: int = 40,
+        batch_size: int = 100_000,
+    ) -> None:
+        """
+        Args:
+            n_neighbors (int, optional): Nombre de voisins agrégés. Defaults to 8.
+            columns (tuple, optional): Positions du revenu médian, de la latitude et de la
+                longitude parmi les caractéristiques. Defaults to (0, 6, 7) (`FEATURE_COLUMNS`).
+            leaf_size (int, optional): Taille des feuilles de l'arbre KD. Defaults to 40.
+            batch_size (int, optional): Lignes interrogées à la fois, pour borner la
+                mémoire des requêtes groupées. Defaults to 100_000.
+        """
+        self.n_neighbors = n_neighbors
+        self.columns = columns
+        self.leaf_size = leaf_size
+        self.batch_size = batch_size
+
+    def fit(self, X, y) -> "SpatialNeighborFeatures":
+        """
+        Construit l'index spatial des districts d'entraînement.
+
+        Args:
+            X (DataFrame | np.ndarray): Caractéristiques d'entraînement.
+            y (Series | np.ndarray): Cible d'entraînement.
+
+        Returns:
+            SpatialNeighborFeatures: Transformateur entraîné.
+        """
+        if hasattr(X, "columns"):
+            names = tuple(X.columns[list(self.columns)])
+            if names != COLUMN_NAMES:
+                raise ValueError(
+                    f"Colonnes {names} aux positions {self.columns}, {COLUMN_NAMES} attendues."
+                )
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = np.asarray(X, dtype=np.float64)
+        self.n_features_in_ = X.shape[1]
+        income, latitude, _ = self.columns
+        if len(X) <= self.n_neighbors:
+            raise ValueError(
+                f"Il faut plus de {self.n_neighbors} districts d'entraînement."
+            )
+        self.reference_latitude_ = float(X[:, latitude].mean())
+        self.tree_ = KDTree(self._project(X), leaf_size=self.leaf_size)
+        self.income_ = X[:, income].copy()
+        self.target_ = np.asarray(y, dtype=np.float64).copy()
+        return self
+
+    def fit_transform(self, X, y) -> np.ndarray:
+        """
+        Construit l'index puis ajoute les agrégats des voisins, chaque district étant
+        exclu de son propre voisinage.
+        """
+        return self.fit(X, y)._augment(np.asarray(X, dtype=np.float64), training=True)
+
+    def transform(self, X) -> np.ndarray:
+        """
+        Ajoute les agrégats des k districts d'entraînement les plus proches.
+
+        Args:
+            X (DataFrame | np.ndarray): Caractéristiques (n, n_features_in_).
+
+        Returns:
+            np.ndarray: Caractéristiques suivies des colonnes `NEIGHBOR_FEATURES`.
+        """
+        check_is_fitted(self, "tree_")
+        return self._augment(np.asarray(X, dtype=np.float64), training=False)
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        """
+        Noms des colonnes produites par `transform`.
+        """
+        if input_features is None:
+            input_features = getattr(
+                self,
+                "feature_names_in_",
+                [f"x{i}" for i in range(self.n_features_in_)],
+            )
+        return np.asarray([*input_features, *NEIGHBOR_FEATURES], dtype=object)
+
+    def _project(self, X: np.ndarray) -> np.ndarray:
+        """
+        Coordonnées (nord, est) en kilomètres, projection équirectangulaire.
+        """
+        _, latitude, longitude = self.columns
+        scale = np.cos(np.radians(self.reference_latitude_))
+        return np.column_stack(
+            [X[:, latitude] * KM_PER_DEGREE, X[:, longitude] * KM_PER_DEGREE * scale]
+        )
+
+    def _augment(self, X: np.ndarray, training: bool) -> np.ndarray:
+        """
+        Interroge l'index par paquets de `batch_size` lignes et agrège les voisins.
+        """
+        k = self.n_neighbors + training
+        features = np.empty((len(X), len(NEIGHBOR_FEATURES)))
+        coordinates = self._project(X)
+        for start in range(0, len(X), self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            distance, index = self.tree_.query(coordinates[batch], k=k)
+            if training:
+                distance, index = _exclude_self(
+                    distance, index, np.arange(start, start + len(index))
+                )
+            features[batch, 0] = self.income_[index].mean(axis=1)
+            features[batch, 1] = self.target_[index].mean(axis=1)
+            features[batch, 2] = distance.mean(axis=1)
+        return np.hstack([X, features])
+
+
+def _exclude_self(
+    distance: np.ndarray, index: np.ndarray, rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Retire chaque ligne de ses k + 1 voisins ; si elle n'y figure pas (districts
+    superposés à égalité), le voisin le plus éloigné est retiré à sa place.
+    """
+    drop = index == rows[:, None]
+    drop[~drop.any(axis=1), -1] = True
+    keep = ~drop
+    shape = (len(index), index.shape[1] - 1)
+    return distance[keep].reshape(shape), index[keep].reshape(shape)
+
+
+def with_spatial_features(model: BaseEstimator, n_neighbors: int = 8) -> Pipeline:
+    """
+    Fait précéder un estimateur de l'étape `SpatialNeighborFeatures`.
+
+    Le pipeline prend les mêmes caractéristiques que l'estimateur seul : l'API et la
+    signature MLflow sont inchangées, et les voisins de chaque requête sont
+    recherchés dans l'index sérialisé avec le modèle.
+
+    Args:
+        model (BaseEstimator): Estimateur final.
+        n_neighbors (int, optional): Nombre de voisins agrégés. Defaults to 8.
+
+    Returns:
+        Pipeline: Étapes "spatial" puis "model".
+    """
+    return Pipeline(
+        [
+            ("spatial", SpatialNeighborFeatures(n_neighbors=n_neighbors)),
+            ("model", model),
+        ]
+    )
+
+
+def spatial_model_factory(
+    estimator: Callable[..., BaseEstimator], n_neighbors: int, **params
+) -> Pipeline:
+    """
+    Constructeur d'un estimateur précédé des caractéristiques spatiales, pour la
+    recherche d'hyperparamètres (à lier avec `functools.partial`, sérialisable).
+    """
+    return with_spatial_features(estimator(**params), n_neighbors)
@@ -0,0 +1,206 @@
+import logging
+import time
+from functools import partial
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import KBinsDiscretizer
+
+from src.ml.evaluation import SLICES, evaluate_chunks
+
+logger = logging.getLogger(__name__)
+
+# Clé de hachage du découpage entraînement/test (16 caractères, voir
+# `pandas.util.hash_pandas_object`)
+SPLIT_HASH_KEY = "mlops-immobilier"
+
+
+def iter_chunks(
+    source: str | Path, chunk_size: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV ou Parquet par blocs de `chunk_size` lignes.
+
+    Args:
+        source (str | Path): Fichier .csv ou .parquet.
+        chunk_size (int, optional): Nombre de lignes par bloc. Defaults to 100_000.
+
+    Yields:
+        pd.DataFrame: Bloc de lignes, index de 0 à len(bloc).
+    """
+    path = Path(source)
+    if path.suffix == ".csv":
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            yield from reader
+    elif path.suffix in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Format de source non supporté : {path.suffix}.")
+
+
+def in_test_set(chunk: pd.DataFrame, test_size: float = 0.2) -> np.ndarray:
+    """
+    Affecte chaque ligne à l'ensemble de test d'après le hachage de son contenu.
+
+    L'affectation ne dépend que des valeurs de la ligne : elle est reproductible
+    quel que soit le découpage en blocs, et les doublons restent du même côté.
+
+    Args:
+        chunk (pd.DataFrame): Bloc de lignes (caractéristiques et cible).
+        test_size (float, optional): Proportion attendue de l'ensemble de test. Defaults to 0.2.
+
+    Returns:
+        np.ndarray: Masque booléen, True pour les lignes de test.
+    """
+    hashes = pd.util.hash_pandas_object(chunk, index=False, hash_key=SPLIT_HASH_KEY)
+    return (hashes.to_numpy() >> np.uint64(11)) / 2.0**53 < test_size
+
+
+def iter_split(
+    source: str | Path,
+    target: str,
+    subset: str = "train",
+    chunk_size: int = 100_000,
+    test_size: float = 0.2,
+) -> Iterator[tuple[pd.DataFrame, pd.Series]]:
+    """
+    Parcourt par blocs les lignes d'entraînement ou de test d'un fichier.
+
+    Args:
+        source (str | Path): Fichier .csv ou .parquet.
+        target (str): Colonne cible.
+        subset (str, optional): "train" ou "test". Defaults to "train".
+        chunk_size (int, optional): Nombre de lignes lues par bloc. Defaults to 100_000.
+        test_size (float, optional): Proportion de l'ensemble de test. Defaults to 0.2.
+
+    Yields:
+        tuple: (caractéristiques, cible) du bloc.
+    """
+    for chunk in iter_chunks(source, chunk_size):
+        mask = in_test_set(chunk, test_size)
+        rows = chunk[mask if subset == "test" else ~mask]
+        if len(rows):
+            yield rows.drop(columns=target), rows[target]
+
+
+def reservoir_sample(
+    chunks: Iterator[tuple[pd.DataFrame, pd.Series]],
+    size: int,
+    random_state: int | None = None,
+) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Tire uniformément `size` lignes d'un flux de blocs, en un seul passage.
+
+    Chaque ligne reçoit une clé aléatoire et l'échantillon conserve les `size` plus
+    petites clés : la mémoire reste bornée par `size` plus un bloc.
+
+    Returns:
+        tuple: (caractéristiques, cible) de l'échantillon.
+    """
+    rng = np.random.default_rng(random_state)
+    sample_X, sample_y, keys = None, None, np.empty(0)
+    for X, y in chunks:
+        X = pd.concat([sample_X, X], ignore_index=True)
+        y = pd.concat([sample_y, y], ignore_index=True)
+        keys = np.concatenate([keys, rng.random(len(X) - len(keys))])
+        if len(keys) > size:
+            keep = np.argpartition(keys, size)[:size]
+            X, y, keys = X.iloc[keep], y.iloc[keep], keys[keep]
+        sample_X, sample_y = X.reset_index(drop=True), y.reset_index(drop=True)
+    return sample_X, sample_y
+
+
+def fit_streaming(
+    source: str | Path,
+    target: str,
+    chunk_size: int = 100_000,
+    test_size: float = 0.2,
+    n_bins: int = 32,
+    sample_size: int = 100_000,
+    epochs: int = 3,
+    random_state: int | None = None,
+) -> Pipeline:
+    """
+    Entraîne un modèle sur un fichier plus grand que la mémoire, bloc par bloc.
+
+    1. Un premier passage tire un échantillon uniforme des lignes d'entraînement, sur
+       lequel sont calculées les bornes des histogrammes (quantiles) de chaque
+       caractéristique, comme le fait HistGradientBoostingRegressor ;
+    2. les passages suivants encodent chaque bloc dans ces intervalles (one-hot) et
+       mettent à jour un `SGDRegressor` avec `partial_fit`.
+
+    La mémoire est bornée par `chunk_size` et `sample_size`, indépendamment du nombre
+    de lignes du fichier. Le modèle obtenu est un `Pipeline` scikit-learn standard.
+
+    Args:
+        source (str | Path): Fichier .csv ou .parquet.
+        target (str): Colonne cible.
+        chunk_size (int, optional): Nombre de lignes lues par bloc. Defaults to 100_000.
+        test_size (float, optional): Proportion des lignes réservées au test. Defaults to 0.2.
+        n_bins (int, optional): Nombre d'intervalles par caractéristique. Defaults to 32.
+        sample_size (int, optional): Taille de l'échantillon des quantiles. Defaults to 100_000.
+        epochs (int, optional): Nombre de passages d'apprentissage. Defaults to 3.
+        random_state (int, optional): Graine de l'échantillon et du modèle. Defaults to None.
+
+    Returns:
+        Pipeline: Discrétisation puis régression linéaire, entraînées.
+    """
+    start = time.perf_counter()
+    train = partial(iter_split, source, target, "train", chunk_size, test_size)
+
+    sample_X, _ = reservoir_sample(train(), sample_size, random_state)
+    bins = KBinsDiscretizer(
+        n_bins=n_bins, encode="onehot", strategy="quantile", subsample=None
+    ).fit(sample_X)
+    del sample_X
+
+    regressor = SGDRegressor(alpha=1e-6, eta0=0.05, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    rows = 0
+    for epoch in range(epochs):
+        for X, y in train():
+            order = rng.permutation(len(X))
+            regressor.partial_fit(bins.transform(X.iloc[order]), y.to_numpy()[order])
+            if epoch == 0:
+                rows += len(X)
+    logger.info(
+        f"Streaming training on {rows} rows ({epochs} epochs) completed "
+        f"in {time.perf_counter() - start:.1f}s."
+    )
+    return Pipeline([("bins", bins), ("regressor", regressor)])
+
+
+def evaluate_streaming(
+    model,
+    source: str | Path,
+    target: str,
+    chunk_size: int = 100_000,
+    test_size: float = 0.2,
+    slices: list[str] | None = None,
+) -> dict:
+    """
+    Évalue un modèle bloc par bloc sur les lignes de test d'un fichier.
+
+    Args:
+        model: Modèle exposant `predict`.
+        source (str | Path): Fichier .csv ou .parquet.
+        target (str): Colonne cible.
+        chunk_size (int, optional): Nombre de lignes lues par bloc. Defaults to 100_000.
+        test_size (float, optional): Proportion des lignes réservées au test. Defaults to 0.2.
+        slices (list[str], optional): Découpages des métriques par tranche (voir `SLICES`).
+
+    Returns:
+        dict: Métriques "mean_squared_error", "mean_absolute_error", "r2", puis par tranche.
+    """
+    return evaluate_chunks(
+        model,
+        iter_split(source, target, "test", chunk_size, test_size),
+        {name: SLICES[name] for name in slices or []},
+    )
@@ -1,13 +1,30 @@
-from sklearn.model_selection import train_test_split
 from sklearn.base import BaseEstimator
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.datasets import fetch_california_housing
 from pandas import DataFrame
 import mlflow
 import mlflow.sklearn
+from mlflow import MlflowClient
+from mlflow.entities import Metric, Param
 from mlflow.models import infer_signature
 import logging
-from sklearn.ensemble import GradientBoostingRegressor
+import argparse
+import json
+import time
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from src.ml.dataset import DEFAULT_DATASET, DEFAULT_TARGET, load_dataset
+from src.ml.evaluation import SLICES, evaluate_chunks, iter_frame
+from src.ml.grid import PredictionGrid, log_grid
+from src.ml.onnx_export import ONNX_ARTIFACT, to_onnx
+from src.ml.search import SEARCH_SPACES, best_trial, log_trial, run_search
+from src.ml.spatial import spatial_model_factory, with_spatial_features
+from src.ml.streaming import (
+    evaluate_streaming,
+    fit_streaming,
+    iter_split,
+    reservoir_sample,
+)
+from src.monitoring.drift import REFERENCE_ARTIFACT, build_reference
 
 
 logging.basicConfig(
@@ -15,6 +32,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Familles de modèles disponibles : estimateur et hyperparamètres par défaut.
+# HistGradientBoostingRegressor discrétise les caractéristiques en histogrammes et
+# exploite tous les cœurs ; il passe bien mieux à l'échelle sur de gros volumes.
+MODEL_FAMILIES = {
+    "gradient_boosting": (
+        GradientBoostingRegressor,
+        {"n_estimators": 150, "max_depth": 5, "learning_rate": 0.15},
+    ),
+    "hist_gradient_boosting": (
+        HistGradientBoostingRegressor,
+        {"max_iter": 300, "learning_rate": 0.1, "max_leaf_nodes": 31},
+    ),
+}
+
+# Nombre de lignes d'entraînement utilisées pour inférer la signature du modèle
+# en mode d'enregistrement rapide (voir `log_model`)
+SIGNATURE_SAMPLE_SIZE = 1000
+
+# Enregistrements de modèles lancés en arrière-plan, attendus par `wait_for_uploads`
+_uploads: list[Future] = []
+_upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlflow-upload")
+
 
 def train_model(
     model: BaseEstimator, X_train: DataFrame, y_train: DataFrame
@@ -37,25 +76,37 @@ def train_model(
     return model
 
 
-def evalute_model(model: BaseEstimator, X_test: DataFrame, y_test: DataFrame) -> dict:
+def evalute_model(
+    model: BaseEstimator,
+    X_test: DataFrame,
+    y_test: DataFrame,
+    slices: list[str] = None,
+    chunk_size: int = 100_000,
+) -> dict:
     """
     Évalue un modèle de machine learning sur un ensemble de test.
 
+    Les prédictions sont faites par blocs et toutes les métriques sont mises à jour
+    en un seul passage (voir `src/ml/evaluation.py`).
+
     Args:
         model (BaseEstimator): Modèle scikit-learn à tester.
         X_test (DataFrame): Données de test.
         y_test (DataFrame): Cibles de test.
+        slices (list[str], optional): Découpages des métriques par tranche, parmi
+            `SLICES` ("medinc", "region"). Defaults to None.
+        chunk_size (int, optional): Nombre de lignes prédites par bloc. Defaults to 100_000.
 
     Returns:
-        dict: Dictionnaire contenant les métriques d'évaluation (MSE, MAE, R²).
+        dict: Dictionnaire contenant les métriques d'évaluation (MSE, MAE, R²), puis
+            les métriques par tranche "<découpage>/<tranche>/<métrique>".
     """
     logger.info("Starting model testing...")
-    y_pred = model.predict(X_test)
-    scores = {
-        "mean_squared_error": mean_squared_error(y_test, y_pred),
-        "mean_absolute_error": mean_absolute_error(y_test, y_pred),
-        "r2": r2_score(y_test, y_pred),
-    }
+    scores = evaluate_chunks(
+        model,
+        iter_frame(X_test, y_test, chunk_size),
+        {name: SLICES[name] for name in slices or []},
+    )
     logger.info("Model testing completed.")
     return scores
 
@@ -68,10 +119,23 @@ def log_model(
     run_name: str = None,
     experiment_name: str = "Imo_production",
     model_name: str = "Production-model",
+    run_id: str = None,
+    fast: bool = False,
+    drift_reference: dict = None,
+    onnx: bool = False,
+    prediction_grid: PredictionGrid = None,
 ) -> None:
     """
     Enregistre un modèle et ses artefacts associés dans MLflow.
 
+    En mode rapide (`fast=True`) :
+    - la signature est inférée sur les `SIGNATURE_SAMPLE_SIZE` premières lignes
+      d'entraînement, et non sur une prédiction du jeu complet ;
+    - paramètres et métriques sont envoyés en un seul appel `log_batch` ;
+    - la sérialisation et l'envoi du modèle, puis son inscription au registre, se font
+      dans un thread de fond : la fonction rend la main aussitôt. Le modèle ne doit
+      plus être modifié, et `wait_for_uploads` doit être appelée avant de le servir.
+
     Args:
         model (BaseEstimator): Modèle scikit-learn à enregistrer.
         params (dict): Paramètres du modèle.
@@ -80,46 +144,431 @@ def log_model(
         run_name (str, optional): Nom de l'exécution. Defaults to None.
         experiment_name (str, optional): Nom de l'expérience MLflow. Defaults to "Imo_production".
         model_name (str, optional): Nom du modèle à enregistrer. Defaults to "Production-model".
+        run_id (str, optional): Exécution existante à compléter (ex. celle de la recherche
+            d'hyperparamètres). Defaults to None (nouvelle exécution).
+        fast (bool, optional): Mode d'enregistrement rapide. Defaults to False.
+        drift_reference (dict, optional): Distribution de référence des caractéristiques
+            (voir `src/monitoring/drift.py`), enregistrée comme artefact. Defaults to None.
+        onnx (bool, optional): Exporte aussi le modèle au format ONNX (saveur `mlflow.onnx`,
+            artefact `ONNX_ARTIFACT`), après vérification de sa parité avec scikit-learn
+            sur les `SIGNATURE_SAMPLE_SIZE` premières lignes. Defaults to False.
+        prediction_grid (PredictionGrid, optional): Grille de prédictions approchées
+            (voir `src/ml/grid.py`), enregistrée comme artefact. Defaults to None.
 
     Returns:
         str: Identifiant de l'exécution dans MLflow.
     """
     logger.info(f"Logging model to MLflow with run name: {run_name}...")
+    start = time.perf_counter()
     mlflow.set_experiment(experiment_name)
-    with mlflow.start_run(run_name=run_name) as run:
-        signature = infer_signature(X_train, model.predict(X_train))
-        mlflow.log_params(params)
-        mlflow.log_metrics(metrics)
+    with mlflow.start_run(run_id=run_id, run_name=run_name) as run:
+        if drift_reference is not None:
+            mlflow.log_dict(drift_reference, REFERENCE_ARTIFACT)
+        if prediction_grid is not None:
+            log_grid(prediction_grid)
+        if not fast:
+            signature = infer_signature(X_train, model.predict(X_train))
+            mlflow.log_params(params)
+            mlflow.log_metrics(metrics)
+            # Avant l'inscription au registre : une version inscrite a déjà son export ONNX
+            if onnx:
+                _log_onnx(model, X_train[:SIGNATURE_SAMPLE_SIZE])
+            mlflow.sklearn.log_model(
+                sk_model=model,
+                artifact_path="sklearn-model",
+                signature=signature,
+                registered_model_name=model_name,
+            )
+        else:
+            X_sample = X_train[:SIGNATURE_SAMPLE_SIZE]
+            signature = infer_signature(X_sample, model.predict(X_sample))
+            timestamp = int(time.time() * 1000)
+            MlflowClient().log_batch(
+                run.info.run_id,
+                metrics=[
+                    Metric(key, value, timestamp, 0) for key, value in metrics.items()
+                ],
+                params=[Param(key, str(value)) for key, value in params.items()],
+            )
+    if fast:
+        _uploads.append(
+            _upload_executor.submit(
+                _upload_model,
+                model,
+                signature,
+                model_name,
+                run.info.run_id,
+                X_train[:SIGNATURE_SAMPLE_SIZE] if onnx else None,
+            )
+        )
+        logger.info(
+            f"Run logged to MLflow in {time.perf_counter() - start:.2f}s, "
+            "model upload continues in the background."
+        )
+    else:
+        logger.info(f"Model logged to MLflow in {time.perf_counter() - start:.2f}s.")
+    return run.info.run_id
+
+
+def _upload_model(
+    model: BaseEstimator,
+    signature,
+    model_name: str,
+    run_id: str,
+    onnx_sample: DataFrame = None,
+) -> None:
+    """
+    Enregistre le modèle dans une exécution existante, depuis un thread de fond,
+    ainsi que son export ONNX si `onnx_sample` (lignes de validation) est fourni.
+    """
+    start = time.perf_counter()
+    with mlflow.start_run(run_id=run_id):
+        if onnx_sample is not None:
+            _log_onnx(model, onnx_sample)
         mlflow.sklearn.log_model(
             sk_model=model,
             artifact_path="sklearn-model",
             signature=signature,
             registered_model_name=model_name,
         )
-    logger.info("Model logged to MLflow.")
-    return run.info.run_id
+    logger.info(f"Model uploaded to MLflow in {time.perf_counter() - start:.2f}s.")
 
 
-def main() -> None:
-    random_state = 42
-    housing = fetch_california_housing(as_frame=True)
+def _log_onnx(model: BaseEstimator, X_sample: DataFrame) -> None:
+    """
+    Convertit le modèle au format ONNX et l'enregistre dans l'exécution active.
+    """
+    import mlflow.onnx
+
+    start = time.perf_counter()
+    mlflow.onnx.log_model(to_onnx(model, X_sample), artifact_path=ONNX_ARTIFACT)
+    logger.info(f"ONNX model logged to MLflow in {time.perf_counter() - start:.2f}s.")
+
 
-    X = housing.data
-    y = housing.target
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=random_state
+def wait_for_uploads() -> None:
+    """
+    Attend la fin des enregistrements de modèles lancés en arrière-plan par `log_model`.
+
+    Raises:
+        Exception: Erreur survenue pendant un enregistrement.
+    """
+    while _uploads:
+        _uploads.pop(0).result()
+
+
+def search_params(
+    X_train: DataFrame,
+    y_train: DataFrame,
+    args: argparse.Namespace,
+    random_state: int,
+    run_name: str = None,
+    experiment_name: str = "Imo_production",
+) -> tuple[dict, str]:
+    """
+    Recherche les meilleurs hyperparamètres et enregistre chaque essai dans MLflow.
+
+    Les essais sont des exécutions imbriquées dans l'exécution `run_name`, que
+    `log_model` complète ensuite avec le modèle retenu.
+
+    Args:
+        X_train (DataFrame): Données d'entraînement.
+        y_train (DataFrame): Cibles d'entraînement.
+        args (argparse.Namespace): Famille de modèles et options de la recherche (voir `parse_args`).
+        random_state (int): Graine des plis, du tirage et des modèles.
+        run_name (str, optional): Nom de l'exécution parente. Defaults to None.
+        experiment_name (str, optional): Nom de l'expérience MLflow. Defaults to "Imo_production".
+
+    Returns:
+        tuple: (meilleurs hyperparamètres ou None si aucun essai n'a abouti, identifiant de l'exécution)
+    """
+    estimator, _ = MODEL_FAMILIES[args.model]
+    if args.spatial_features:
+        estimator = partial(spatial_model_factory, estimator, args.neighbors)
+    space = SEARCH_SPACES[args.model]
+    if args.space is not None:
+        with open(args.space) as file:
+            space = json.load(file)
+    mlflow.set_experiment(experiment_name)
+    with mlflow.start_run(run_name=run_name) as run:
+        mlflow.set_tags(
+            {
+                "model_family": args.model,
+                "search_strategy": args.search,
+                "search_space": json.dumps(space),
+                "search_budget": args.budget,
+                "spatial_neighbors": args.neighbors if args.spatial_features else 0,
+            }
+        )
+        trials = run_search(
+            X_train,
+            y_train,
+            space=space,
+            strategy=args.search,
+            n_iter=args.n_iter,
+            cv=args.cv,
+            n_jobs=args.n_jobs,
+            budget=args.budget,
+            model_factory=estimator,
+            random_state=random_state,
+            on_trial=log_trial,
+        )
+        best = best_trial(trials)
+        mlflow.log_metrics(
+            {
+                "search_trials": len(trials),
+                "search_pruned": sum(trial.status == "pruned" for trial in trials),
+            }
+        )
+        if best is not None:
+            mlflow.log_metric(
+                "best_cv_mean_squared_error", best.metrics["mean_squared_error"]
+            )
+    return (best.params if best else None), run.info.run_id
+
+
+def train_streaming(
+    args: argparse.Namespace,
+    random_state: int,
+    run_name: str = None,
+    model_name: str = "Production-model",
+) -> str:
+    """
+    Entraîne, évalue et enregistre un modèle en lisant la source par blocs.
+
+    Aucun bloc n'est conservé : la mémoire est bornée par `--chunk-size`, quelle que
+    soit la taille du fichier (voir `src/ml/streaming.py`).
+
+    Args:
+        args (argparse.Namespace): Source, cible et taille des blocs (voir `parse_args`).
+        random_state (int): Graine de l'échantillon et du modèle.
+        run_name (str, optional): Nom de l'exécution. Defaults to None.
+        model_name (str, optional): Nom du modèle à enregistrer. Defaults to "Production-model".
+
+    Returns:
+        str: Identifiant de l'exécution dans MLflow.
+    """
+    params = {
+        "chunk_size": args.chunk_size,
+        "n_bins": 32,
+        "sample_size": 100_000,
+        "epochs": 3,
+    }
+    model = fit_streaming(args.source, args.target, random_state=random_state, **params)
+    scores = evaluate_streaming(
+        model, args.source, args.target, args.chunk_size, slices=args.slices
+    )
+    # Un bloc d'entraînement suffit pour inférer la signature du modèle
+    X_sample, _ = next(iter_split(args.source, args.target, chunk_size=1000))
+    # Référence de dérive : échantillon uniforme de toute la source
+    X_reference, _ = reservoir_sample(
+        iter_split(args.source, args.target, chunk_size=args.chunk_size),
+        params["sample_size"],
+        random_state=random_state,
     )
-    params = {"n_estimators": 150, "max_depth": 5, "learning_rate": 0.15 ,"random_state": random_state}
+    return log_model(
+        model,
+        params,
+        scores,
+        X_sample,
+        run_name=run_name,
+        model_name=model_name,
+        fast=args.fast_logging,
+        drift_reference=build_reference(X_reference),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Lit les options du pipeline d'entraînement.
 
-    model = GradientBoostingRegressor(**params)
+    Returns:
+        argparse.Namespace: Jeu de données, famille de modèles, recherche et mode streaming.
+    """
+    parser = argparse.ArgumentParser(
+        description="Entraîne et enregistre le modèle de production."
+    )
+    parser.add_argument(
+        "--dataset",
+        default=DEFAULT_DATASET,
+        help="Nom du jeu de données dans le dépôt local (voir src/ml/dataset.py).",
+    )
+    parser.add_argument(
+        "--source",
+        help="Fichier CSV ou Parquet à ingérer (défaut : California Housing).",
+    )
+    parser.add_argument(
+        "--target", default=DEFAULT_TARGET, help="Colonne cible d'un fichier source."
+    )
+    parser.add_argument(
+        "--model",
+        choices=list(MODEL_FAMILIES),
+        help="Famille de modèles à entraîner (défaut : gradient_boosting).",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["grid", "random"],
+        help="Recherche d'hyperparamètres avant l'entraînement final (désactivée par défaut).",
+    )
+    parser.add_argument("--space", help="Fichier JSON de l'espace de recherche.")
+    parser.add_argument(
+        "--n-iter",
+        type=int,
+        default=20,
+        help="Configurations tirées en recherche aléatoire.",
+    )
+    parser.add_argument(
+        "--cv", type=int, default=3, help="Nombre de plis de la validation croisée."
+    )
+    parser.add_argument(
+        "--n-jobs", type=int, help="Nombre de processus (défaut : tous les cœurs)."
+    )
+    parser.add_argument(
+        "--budget", type=float, help="Durée maximale de la recherche en secondes."
+    )
+    parser.add_argument(
+        "--slices",
+        nargs="+",
+        choices=list(SLICES),
+        default=[],
+        help="Métriques de test supplémentaires par tranche (ex. medinc region).",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Entraînement par blocs depuis --source, sans charger le fichier en mémoire.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Nombre de lignes lues par bloc en mode --streaming.",
+    )
+    parser.add_argument(
+        "--spatial-features",
+        action="store_true",
+        help="Ajoute les agrégats des plus proches districts (voir src/ml/spatial.py).",
+    )
+    parser.add_argument(
+        "--neighbors",
+        type=int,
+        default=8,
+        help="Nombre de voisins agrégés avec --spatial-features.",
+    )
+    parser.add_argument(
+        "--onnx",
+        action="store_true",
+        help='Enregistre aussi le modèle au format ONNX (moteur d\'inférence "onnx").',
+    )
+    parser.add_argument(
+        "--prediction-grid",
+        action="store_true",
+        help="Enregistre une grille de prédictions approchées (voir src/ml/grid.py).",
+    )
+    parser.add_argument(
+        "--grid-features",
+        type=int,
+        default=3,
+        help="Nombre de caractéristiques de la grille de prédictions.",
+    )
+    parser.add_argument(
+        "--grid-resolution",
+        type=int,
+        default=32,
+        help="Nombre de valeurs par caractéristique de la grille de prédictions.",
+    )
+    parser.add_argument(
+        "--fast-logging",
+        action="store_true",
+        help="Signature inférée sur un échantillon, envoi du modèle MLflow en arrière-plan.",
+    )
+    args = parser.parse_args()
+    if args.streaming and (args.source is None or args.search is not None):
+        parser.error("--streaming requiert --source et n'accepte pas --search.")
+    if args.source and not args.streaming and args.dataset == DEFAULT_DATASET:
+        parser.error(f"--source requiert --dataset (autre que {DEFAULT_DATASET}).")
+    if args.streaming and args.spatial_features:
+        parser.error("--spatial-features n'est pas disponible en mode --streaming.")
+    if args.prediction_grid and (args.spatial_features or args.streaming):
+        parser.error(
+            "--prediction-grid n'accepte ni --spatial-features ni --streaming."
+        )
+    if args.onnx and args.spatial_features:
+        parser.error(
+            "--onnx n'accepte pas --spatial-features (étape sans convertisseur)."
+        )
+    if args.onnx and args.streaming:
+        parser.error("--onnx n'est pas disponible en mode --streaming.")
+    if args.model is not None and args.streaming:
+        parser.error("--model n'est pas disponible en mode --streaming.")
+    args.model = args.model or "gradient_boosting"
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    random_state = 42
     run_name = "Production-model"
     model_name = "Production-model"
+    if args.streaming:
+        logger.info(f"Starting the streaming training pipeline on {args.source}...")
+        train_streaming(args, random_state, run_name=run_name, model_name=model_name)
+        wait_for_uploads()
+        logger.info("Pipeline completed.")
+        return
+
+    dataset = load_dataset(
+        args.dataset,
+        source=args.source,
+        target=args.target,
+        test_size=0.2,
+        random_state=random_state,
+    )
+    X_train, X_test, y_train, y_test = dataset.splits()
+    estimator, params = MODEL_FAMILIES[args.model]
+    params = {**params, "random_state": random_state}
+
     logger.info(
         f"Starting the entire training and testing pipeline with run name: {run_name}..."
     )
+    run_id = None
+    if args.search is not None:
+        best_params, run_id = search_params(
+            X_train, y_train, args, random_state, run_name=run_name
+        )
+        if best_params is None:
+            logger.warning("No search trial completed, keeping the default parameters.")
+        else:
+            params = {**params, **best_params}
+    model = estimator(**params)
+    if args.spatial_features:
+        model = with_spatial_features(model, args.neighbors)
+        params = {**params, "spatial_neighbors": args.neighbors}
     model = train_model(model, X_train, y_train)
-    scores = evalute_model(model, X_test, y_test)
-    log_model(model, params, scores, X_train, run_name=run_name, model_name=model_name)
+    scores = evalute_model(model, X_test, y_test, slices=args.slices)
+    grid = None
+    if args.prediction_grid:
+        grid = PredictionGrid.build(
+            model,
+            X_train,
+            X_test,
+            n_features=args.grid_features,
+            resolution=args.grid_resolution,
+        )
+        scores["grid_error_p95"] = grid.error_bound
+    log_model(
+        model,
+        params,
+        scores,
+        X_train,
+        run_name=run_name,
+        model_name=model_name,
+        run_id=run_id,
+        fast=args.fast_logging,
+        drift_reference=build_reference(X_train),
+        onnx=args.onnx,
+        prediction_grid=grid,
+    )
+    wait_for_uploads()
     logger.info("Pipeline completed.")
 
 
@@ -0,0 +1,326 @@
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Chemin de la référence de dérive parmi les artefacts de l'exécution MLflow du modèle
+REFERENCE_ARTIFACT = "drift/reference.json"
+
+# Nombre de niveaux de la grille de quantiles de référence : le KS est calculé
+# exactement aux bornes de la grille (granularité 1/GRID_SIZE)
+GRID_SIZE = 1000
+
+# Nombre d'intervalles (quantiles de référence) du PSI
+PSI_BINS = 10
+
+# Proportion minimale d'un intervalle dans le calcul du PSI (évite log(0))
+PSI_EPSILON = 1e-4
+
+# Seuils au-delà desquels une caractéristique est considérée en dérive
+PSI_THRESHOLD = 0.2
+KS_THRESHOLD = 0.1
+
+# Quantiles dont le décalage est rapporté
+QUANTILES = {"p05": 0.05, "p50": 0.5, "p95": 0.95}
+
+
+def build_reference(
+    X: pd.DataFrame, sample_size: int = 1_000_000, random_state: int = 0
+) -> dict:
+    """
+    Calcule la distribution de référence de chaque caractéristique (jeu d'entraînement).
+
+    Pour chaque colonne : bornes de la grille de quantiles (`GRID_SIZE` niveaux),
+    fonction de répartition exacte de la référence en ces bornes, moyenne, écart-type
+    et quantiles de `QUANTILES`. Le résultat est sérialisable en JSON et enregistré
+    avec le modèle (`REFERENCE_ARTIFACT`).
+
+    Args:
+        X (pd.DataFrame): Caractéristiques d'entraînement.
+        sample_size (int, optional): Nombre maximal de lignes utilisées (tirées au hasard). Defaults to 1_000_000.
+        random_state (int, optional): Graine du tirage. Defaults to 0.
+
+    Returns:
+        dict: Référence, par caractéristique.
+    """
+    values = np.asarray(X, dtype=float)
+    if len(values) > sample_size:
+        rng = np.random.default_rng(random_state)
+        values = values[rng.choice(len(values), sample_size, replace=False)]
+    levels = np.arange(1, GRID_SIZE) / GRID_SIZE
+
+    columns = {}
+    for name, column in zip(X.columns, values.T):
+        column = np.sort(column[~np.isnan(column)])
+        edges = np.unique(np.quantile(column, levels))
+        cdf = np.searchsorted(column, edges, side="right") / len(column)
+        columns[name] = {
+            "edges": edges.tolist(),
+            "cdf": cdf.tolist(),
+            "mean": float(column.mean()),
+            "std": float(column.std()),
+            "quantiles": {
+                key: float(np.quantile(column, level))
+                for key, level in QUANTILES.items()
+            },
+        }
+    return {"features": list(X.columns), "rows": len(values), "columns": columns}
+
+
+def sample_reference(reference: dict, size: int, random_state: int = 0) -> np.ndarray:
+    """
+    Tire des lignes synthétiques des distributions d'entraînement de la référence.
+
+    Chaque caractéristique est tirée indépendamment, par inversion de sa fonction de
+    répartition sur la grille de quantiles : les marginales sont celles de
+    l'entraînement, pas les corrélations entre caractéristiques.
+
+    Args:
+        reference (dict): Référence calculée par `build_reference`.
+        size (int): Nombre de lignes.
+        random_state (int, optional): Graine du tirage. Defaults to 0.
+
+    Returns:
+        np.ndarray: Tableau (size, n_caractéristiques), dans l'ordre de la référence.
+    """
+    rng = np.random.default_rng(random_state)
+    return np.column_stack(
+        [
+            np.interp(
+                rng.random(size),
+                reference["columns"][name]["cdf"],
+                reference["columns"][name]["edges"],
+            )
+            for name in reference["features"]
+        ]
+    )
+
+
+class DriftMonitor:
+    """
+    Compare, en un seul passage et par blocs, une fenêtre de trafic à la référence.
+
+    Chaque bloc est réparti sur la grille de quantiles de la référence
+    (`np.searchsorted` puis `np.bincount` par colonne) ; seuls les effectifs de la
+    grille et les sommes des valeurs sont conservés, si bien que la mémoire ne dépend
+    pas du nombre de lignes.
+    """
+
+    def __init__(self, reference: dict) -> None:
+        """
+        Args:
+            reference (dict): Référence calculée par `build_reference`.
+        """
+        self.reference = reference
+        self.features = reference["features"]
+        self._edges = [
+            np.asarray(reference["columns"][name]["edges"]) for name in self.features
+        ]
+        self._counts = [
+            np.zeros(len(edges) + 1, dtype=np.int64) for edges in self._edges
+        ]
+        self._sums = np.zeros(len(self.features))
+        self.rows = 0
+
+    def update(self, X: pd.DataFrame | np.ndarray) -> None:
+        """
+        Ajoute un bloc de caractéristiques (colonnes de la référence, ou tableau dans leur ordre).
+        """
+        values = np.asarray(
+            X[self.features] if isinstance(X, pd.DataFrame) else X, dtype=float
+        )
+        for j, (edges, counts) in enumerate(zip(self._edges, self._counts)):
+            column = values[:, j]
+            column = column[~np.isnan(column)]
+            counts += np.bincount(
+                np.searchsorted(edges, column, side="left"), minlength=len(counts)
+            )
+            self._sums[j] += column.sum()
+        self.rows += len(values)
+
+    def result(self) -> dict:
+        """
+        Calcule les statistiques de dérive de chaque caractéristique.
+
+        - "psi" : indice de stabilité de la population sur `PSI_BINS` intervalles de
+          quantiles de la référence ;
+        - "ks" : statistique de Kolmogorov-Smirnov, écart maximal entre les fonctions
+          de répartition, évaluée aux bornes de la grille ;
+        - "mean_shift" et "quantile_shift" : décalages de la moyenne et des quantiles
+          (approchés sur la grille), en écarts-types de la référence.
+
+        Returns:
+            dict: Nombre de lignes, caractéristiques en dérive et statistiques par caractéristique.
+        """
+        features = {}
+        for j, name in enumerate(self.features):
+            reference = self.reference["columns"][name]
+            counts = self._counts[j]
+            n = counts.sum()
+            if n == 0:
+                continue
+            edges = self._edges[j]
+            reference_cdf = np.asarray(reference["cdf"])
+            live_cdf = np.cumsum(counts[:-1]) / n
+            scale = reference["std"] or 1.0
+
+            # Intervalles du PSI : bornes de la grille les plus proches des quantiles
+            # de niveau k / PSI_BINS de la référence
+            levels = np.arange(1, PSI_BINS) / PSI_BINS
+            cuts = np.unique(np.searchsorted(reference_cdf, levels, side="left"))
+            cuts = cuts[cuts < len(edges)]
+            expected = np.diff(np.concatenate([[0], reference_cdf[cuts], [1]]))
+            observed = np.diff(np.concatenate([[0], live_cdf[cuts], [1]]))
+            expected = np.clip(expected, PSI_EPSILON, None)
+            observed = np.clip(observed, PSI_EPSILON, None)
+            psi = float(np.sum((observed - expected) * np.log(observed / expected)))
+
+            ks = float(np.max(np.abs(live_cdf - reference_cdf)))
+            mean = self._sums[j] / n
+            features[name] = {
+                "psi": psi,
+                "ks": ks,
+                "mean_reference": reference["mean"],
+                "mean_live": float(mean),
+                "mean_shift": float((mean - reference["mean"]) / scale),
+                "quantile_shift": {
+                    key: float(
+                        (
+                            np.interp(level, live_cdf, edges)
+                            - reference["quantiles"][key]
+                        )
+                        / scale
+                    )
+                    for key, level in QUANTILES.items()
+                },
+                "drift": psi >= PSI_THRESHOLD or ks >= KS_THRESHOLD,
+            }
+        return {
+            "rows": self.rows,
+            "drifted_features": [
+                name for name, stats in features.items() if stats["drift"]
+            ],
+            "features": features,
+        }
+
+
+def compute_drift(reference: dict, chunks: Iterable[pd.DataFrame]) -> dict:
+    """
+    Compare un flux de blocs de trafic à la référence (voir `DriftMonitor.result`).
+    """
+    monitor = DriftMonitor(reference)
+    for chunk in chunks:
+        monitor.update(chunk)
+    return monitor.result()
+
+
+def load_reference(model_name: str, model_version: str | int) -> dict:
+    """
+    Charge la référence de dérive enregistrée avec une version du modèle.
+
+    Raises:
+        LookupError: Si la version n'a pas de référence (modèle entraîné avant son introduction).
+    """
+    import mlflow
+    from mlflow import MlflowClient
+    from mlflow.exceptions import MlflowException
+
+    run_id = MlflowClient().get_model_version(model_name, str(model_version)).run_id
+    try:
+        return mlflow.artifacts.load_dict(f"runs:/{run_id}/{REFERENCE_ARTIFACT}")
+    except (MlflowException, OSError) as exc:
+        raise LookupError(
+            f"Pas de référence de dérive pour le modèle '{model_name}' "
+            f"version {model_version}."
+        ) from exc
+
+
+def filter_window(
+    chunks: Iterable[pd.DataFrame],
+    since: str | datetime | None = None,
+    until: str | datetime | None = None,
+) -> Iterable[pd.DataFrame]:
+    """
+    Restreint des blocs de prédictions journalisées à une fenêtre de temps [since, until[.
+
+    Les dates sans fuseau horaire sont interprétées en UTC, comme les horodatages du journal.
+    """
+    bounds = []
+    for value in (since, until):
+        if value is not None:
+            value = pd.Timestamp(value)
+            value = value.tz_localize("UTC") if value.tzinfo is None else value
+        bounds.append(value)
+    since, until = bounds
+    for chunk in chunks:
+        if since is not None:
+            chunk = chunk[chunk["timestamp"] >= since]
+        if until is not None:
+            chunk = chunk[chunk["timestamp"] < until]
+        yield chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare le trafic servi à la distribution d'entraînement du modèle."
+    )
+    parser.add_argument(
+        "source",
+        help="Répertoire du journal des prédictions, ou fichier CSV ou Parquet.",
+    )
+    parser.add_argument("--model-name", default="Production-model")
+    parser.add_argument("--model-version", default="1")
+    parser.add_argument(
+        "--reference", help="Fichier JSON de référence (au lieu de celle du modèle)."
+    )
+    parser.add_argument("--since", help="Début de la fenêtre (journal uniquement).")
+    parser.add_argument("--until", help="Fin de la fenêtre (journal uniquement).")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--output", help="Fichier JSON du résultat.")
+    args = parser.parse_args()
+
+    if args.reference:
+        reference = json.loads(Path(args.reference).read_text())
+    else:
+        reference = load_reference(args.model_name, args.model_version)
+
+    start = time.perf_counter()
+    if Path(args.source).is_dir():
+        from src.api.prediction_log import iter_prediction_chunks
+
+        chunks = filter_window(
+            iter_prediction_chunks(args.source, args.chunk_size), args.since, args.until
+        )
+    else:
+        from src.ml.streaming import iter_chunks
+
+        chunks = iter_chunks(args.source, args.chunk_size)
+    result = compute_drift(reference, chunks)
+    logger.info(
+        f"Drift computed on {result['rows']} rows in {time.perf_counter() - start:.2f}s."
+    )
+
+    print(f"{'caractéristique':<14}{'PSI':>8}{'KS':>8}{'moyenne σ':>11}  dérive")
+    for name, stats in result["features"].items():
+        print(
+            f"{name:<14}{stats['psi']:>8.3f}{stats['ks']:>8.3f}"
+            f"{stats['mean_shift']:>+11.2f}  {'oui' if stats['drift'] else 'non'}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    main()
@@ -1,6 +1,16 @@
+import asyncio
+import subprocess
+import sys
+
 from fastapi.testclient import TestClient
+import httpx
+import numpy as np
 import pytest
+import src.api.app as app_module
 from src.api.app import app
+from src.api.batching import MicroBatcher
+from src.api.cache import PredictionCache
+from src.api.loader import ModelLoader, ServedModel
 
 
 # Créer un client de test pour l'API
@@ -114,3 +124,228 @@ def test_invalid_data_type(client: TestClient) -> None:
     }
     response = client.post("/predict", json=payload)
     assert response.status_code == 422  # Unprocessable Entity
+
+
+# Enregistrement valide réutilisé par les tests de prédiction par lot
+VALID_RECORD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+def test_batch_prediction_matches_single(client: TestClient) -> None:
+    """
+    Vérifie que la prédiction par lot retourne, dans l'ordre, les mêmes valeurs
+    que des appels unitaires à "/predict", quelle que soit la taille des paquets.
+    """
+    records = [
+        VALID_RECORD,
+        {**VALID_RECORD, "medinc": 2.5},
+        {**VALID_RECORD, "latitude": 34.05, "longitude": -118.24},
+    ]
+    expected = [client.post("/predict", json=r).json()["prediction"] for r in records]
+
+    response = client.post("/predict/batch?chunk_size=2", json={"records": records})
+    assert response.status_code == 200
+    assert response.json()["predictions"] == pytest.approx(expected)
+    assert response.json()["errors"] == []
+
+    response = client.post("/predict/batch", json=records)
+    assert response.json()["predictions"] == pytest.approx(expected)
+
+
+def test_batch_prediction_columns(client: TestClient) -> None:
+    """
+    Vérifie que le format en colonnes donne les mêmes prédictions que le format en lignes.
+    """
+    records = [VALID_RECORD, {**VALID_RECORD, "houseage": 5.0}]
+    columns = {field: [r[field] for r in records] for field in VALID_RECORD}
+
+    by_rows = client.post("/predict/batch", json={"records": records}).json()
+    by_columns = client.post("/predict/batch", json={"columns": columns}).json()
+    assert by_columns["predictions"] == pytest.approx(by_rows["predictions"])
+
+
+def test_batch_prediction_row_errors(client: TestClient) -> None:
+    """
+    Vérifie que les lignes invalides sont signalées sans faire échouer le lot.
+
+    - Une ligne avec un champ manquant et une ligne avec un type invalide.
+    - Les lignes valides sont prédites, les invalides valent None.
+    """
+    missing = {k: v for k, v in VALID_RECORD.items() if k != "latitude"}
+    records = [VALID_RECORD, missing, {**VALID_RECORD, "medinc": "abc"}, VALID_RECORD]
+    response = client.post("/predict/batch", json={"records": records})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["predictions"][1] is None and body["predictions"][2] is None
+    assert body["predictions"][0] == pytest.approx(body["predictions"][3])
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+
+    columns = {field: [VALID_RECORD[field]] * 3 for field in VALID_RECORD}
+    columns["population"][1] = "not_a_float"
+    body = client.post("/predict/batch", json={"columns": columns}).json()
+    assert body["predictions"][1] is None
+    assert body["errors"][0]["index"] == 1
+    assert body["errors"][0]["errors"][0]["loc"] == ["population"]
+
+
+def test_batch_prediction_invalid_payload(client: TestClient) -> None:
+    """
+    Vérifie que l'API retourne une erreur 422 si le lot est mal formé
+    (aucun format fourni ou colonnes de longueurs différentes).
+    """
+    assert client.post("/predict/batch", json={}).status_code == 422
+    columns = {field: [VALID_RECORD[field]] for field in VALID_RECORD}
+    columns["medinc"] = [1.0, 2.0]
+    response = client.post("/predict/batch", json={"columns": columns})
+    assert response.status_code == 422
+
+
+def test_prediction_with_micro_batching(monkeypatch) -> None:
+    """
+    Vérifie que "/predict" garde le même contrat de réponse lorsque
+    le micro-batching est activé au démarrage de l'application.
+    """
+    expected = TestClient(app).post("/predict", json=VALID_RECORD).json()
+    monkeypatch.setattr(app_module, "MICRO_BATCHING_ENABLED", True)
+    with TestClient(app) as client:
+        assert app_module.batcher.running
+        response = client.post("/predict", json=VALID_RECORD)
+    assert not app_module.batcher.running
+    assert response.status_code == 200
+    assert response.json() == pytest.approx(expected)
+    assert app_module.batcher.row_count >= 1
+
+
+class ConstantBackend:
+    """
+    Moteur d'inférence de test dont toutes les prédictions valent `value`.
+    """
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.full(len(features), self.value)
+
+
+def test_micro_batching_keeps_request_model(monkeypatch) -> None:
+    """
+    Vérifie qu'une requête en attente dans un lot est prédite par le modèle qu'elle a
+    résolu, même si le modèle servi est remplacé avant l'exécution du lot.
+
+    Asserts:
+        - Chaque réponse porte la prédiction du modèle indiqué par X-Model-Version.
+    """
+    served = {
+        version: ServedModel(ConstantBackend(value), "model", version, 0.0, 0.0)
+        for version, value in (("1", 1.0), ("2", 2.0))
+    }
+    monkeypatch.setattr(app_module, "cache", PredictionCache(max_size=0))
+    monkeypatch.setattr(app_module.loader, "served", served["1"])
+    batcher = MicroBatcher(app_module.predict_array, max_wait_ms=200)
+    monkeypatch.setattr(app_module, "batcher", batcher)
+
+    async def scenario() -> list:
+        await batcher.start()
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                first = asyncio.create_task(client.post("/predict", json=VALID_RECORD))
+                await asyncio.sleep(0.05)  # Première requête en attente dans le lot
+                app_module.loader.served = served["2"]
+                second = await client.post("/predict", json=VALID_RECORD)
+                return [await first, second]
+        finally:
+            await batcher.stop()
+
+    responses = asyncio.run(scenario())
+
+    assert [response.headers["X-Model-Version"] for response in responses] == [
+        "1",
+        "2",
+    ]
+    assert [response.json()["prediction"] for response in responses] == [1.0, 2.0]
+    assert batcher.batch_count == 2
+
+
+def test_prediction_cache(client: TestClient, monkeypatch) -> None:
+    """
+    Vérifie que des requêtes identiques sont servies par le cache avec la même
+    prédiction et que les compteurs sont exposés par "/cache/stats".
+    """
+    cache = PredictionCache(max_size=10)
+    cache.set_model(app_module.model_name, app_module.model_version)
+    monkeypatch.setattr(app_module, "cache", cache)
+
+    first = client.post("/predict", json=VALID_RECORD).json()
+    second = client.post("/predict", json=VALID_RECORD).json()
+
+    assert first == second
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_import_does_not_load_model() -> None:
+    """
+    Vérifie que l'import du module de l'API ne charge pas le modèle.
+    """
+    code = "import src.api.app as app; assert app.loader.state == 'idle'"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_ready_endpoint() -> None:
+    """
+    Vérifie que "/ready" retourne 200 une fois le modèle chargé au démarrage.
+    """
+    with TestClient(app) as client:
+        app_module.loader.wait(timeout=60)
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["model_name"] == "Production-model"
+
+
+def test_not_ready_when_model_is_missing(monkeypatch) -> None:
+    """
+    Vérifie que l'API reste vivante mais pas disponible lorsque le modèle est introuvable.
+
+    - "/" répond 200 (vivacité).
+    - "/ready" et "/predict" répondent 503.
+    """
+    loader = ModelLoader(app_module.INFERENCE_BACKEND, "Missing-model", 1)
+    monkeypatch.setattr(app_module, "loader", loader)
+
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+        assert client.post("/predict", json=VALID_RECORD).status_code == 503
+        assert client.get("/ready").status_code == 503
+    assert loader.state == "failed"
+
+
+def test_model_headers_and_status(client: TestClient) -> None:
+    """
+    Vérifie que les prédictions indiquent le modèle servi dans leurs en-têtes
+    et que "/model" décrit ce même modèle.
+    """
+    response = client.post("/predict", json=VALID_RECORD)
+    status = client.get("/model").json()
+
+    assert response.headers["X-Model-Name"] == "Production-model"
+    assert response.headers["X-Model-Version"] == status["model_version"]
+    assert float(response.headers["X-Model-Loaded-At"]) == pytest.approx(
+        status["loaded_at"], abs=1e-3
+    )
+    batch = client.post("/predict/batch", json=[VALID_RECORD])
+    assert batch.headers["X-Model-Version"] == status["model_version"]
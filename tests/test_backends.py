@@ -0,0 +1,101 @@
+import mlflow.sklearn
+import numpy as np
+import pytest
+from mlflow.models import infer_signature
+from pandas import DataFrame
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+from src.api.backends import (
+    FEATURE_COLUMNS,
+    PyfuncBackend,
+    SklearnBackend,
+    load_backend,
+)
+
+# Modèle enregistré par `src/ml/train.py`
+MODEL_URI = "models:/Production-model/1"
+
+
+@pytest.fixture(scope="module")
+def features() -> np.ndarray:
+    """
+    Fixture qui génère des caractéristiques aléatoires plausibles.
+
+    Returns:
+        np.ndarray: Tableau (200, 8) dans l'ordre de `FEATURE_COLUMNS`.
+    """
+    rng = np.random.default_rng(0)
+    low = [0.5, 1, 2, 0.5, 100, 1, 32.5, -124.3]
+    high = [15, 52, 10, 2, 5000, 5, 42, -114.3]
+    return rng.uniform(low, high, size=(200, len(FEATURE_COLUMNS)))
+
+
+@pytest.fixture(scope="module")
+def reference(features: np.ndarray) -> np.ndarray:
+    """
+    Fixture qui calcule les prédictions de référence via `mlflow.pyfunc`.
+
+    Returns:
+        np.ndarray: Prédictions du moteur "pyfunc".
+    """
+    return PyfuncBackend(MODEL_URI).predict(features)
+
+
+def test_sklearn_backend_matches_pyfunc(
+    features: np.ndarray, reference: np.ndarray
+) -> None:
+    """
+    Vérifie que le moteur "sklearn" donne les mêmes prédictions que "pyfunc",
+    par lot comme ligne par ligne avec le tampon réutilisé.
+    """
+    backend = SklearnBackend(MODEL_URI)
+
+    np.testing.assert_allclose(backend.predict(features), reference)
+    rows = [backend.predict_row(row.tolist()) for row in features]
+    np.testing.assert_allclose(rows, reference)
+
+
+def test_feature_order_is_validated(tmp_path) -> None:
+    """
+    Vérifie que le chargement échoue si la signature du modèle
+    n'utilise pas l'ordre des caractéristiques de l'API.
+    """
+    columns = FEATURE_COLUMNS[::-1]
+    X = DataFrame(np.random.default_rng(0).random((20, 8)), columns=columns)
+    model = GradientBoostingRegressor(n_estimators=2).fit(X, X.sum(axis=1))
+    path = tmp_path / "reversed-model"
+    mlflow.sklearn.save_model(
+        model, path, signature=infer_signature(X, model.predict(X))
+    )
+
+    with pytest.raises(ValueError):
+        SklearnBackend(str(path))
+
+
+def test_hist_gradient_boosting_is_served(tmp_path, features: np.ndarray) -> None:
+    """
+    Vérifie qu'un HistGradientBoostingRegressor est servi sans changement par les
+    moteurs "pyfunc" et "sklearn", et refusé explicitement par le moteur compilé.
+    """
+    X = DataFrame(features, columns=FEATURE_COLUMNS)
+    model = HistGradientBoostingRegressor(max_iter=20).fit(X, X.sum(axis=1))
+    path = tmp_path / "hist-model"
+    mlflow.sklearn.save_model(
+        model, path, signature=infer_signature(X, model.predict(X))
+    )
+
+    expected = model.predict(X)
+    np.testing.assert_allclose(PyfuncBackend(str(path)).predict(features), expected)
+    backend = SklearnBackend(str(path))
+    np.testing.assert_allclose(backend.predict(features), expected)
+    assert backend.predict_row(features[0].tolist()) == pytest.approx(expected[0])
+    with pytest.raises(TypeError):
+        load_backend("compiled", str(path))
+
+
+def test_unknown_backend() -> None:
+    """
+    Vérifie qu'un nom de moteur inconnu est refusé.
+    """
+    with pytest.raises(ValueError):
+        load_backend("unknown", MODEL_URI)
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.api.batching import MicroBatcher
+
+
+class RecordingModel:
+    """
+    Modèle factice qui enregistre la taille de chaque lot reçu.
+    """
+
+    def __init__(self) -> None:
+        self.batch_sizes = []
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Retourne la somme des caractéristiques de chaque ligne.
+        """
+        self.batch_sizes.append(len(features))
+        return features.sum(axis=1)
+
+
+async def submit_all(batcher: MicroBatcher, rows: np.ndarray) -> list[float]:
+    """
+    Démarre le regroupeur, soumet toutes les lignes en concurrence puis l'arrête.
+    """
+    await batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(row) for row in rows))
+    finally:
+        await batcher.stop()
+
+
+def test_concurrent_requests_are_merged() -> None:
+    """
+    Vérifie que des requêtes concurrentes sont regroupées en peu d'appels au modèle
+    et que chaque appelant reçoit la prédiction de sa propre ligne.
+    """
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=64, max_wait_ms=50)
+    rows = np.arange(100 * 8, dtype=float).reshape(100, 8)
+
+    results = asyncio.run(submit_all(batcher, rows))
+
+    assert results == pytest.approx(rows.sum(axis=1).tolist())
+    assert sum(model.batch_sizes) == 100
+    assert max(model.batch_sizes) <= 64
+    assert len(model.batch_sizes) < 100
+    assert batcher.batch_count == len(model.batch_sizes)
+
+
+def test_rows_are_grouped_by_predict_fn() -> None:
+    """
+    Vérifie que les lignes d'un même lot soumises avec des fonctions de prédiction
+    différentes (deux versions du modèle) sont prédites chacune par la sienne.
+    """
+    default, other = RecordingModel(), RecordingModel()
+    batcher = MicroBatcher(default.predict, max_batch_size=64, max_wait_ms=50)
+    rows = np.arange(10 * 8, dtype=float).reshape(10, 8)
+
+    async def scenario() -> list[float]:
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                *(
+                    batcher.submit(row, other.predict if i % 2 else None)
+                    for i, row in enumerate(rows)
+                )
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+
+    assert results == pytest.approx(rows.sum(axis=1).tolist())
+    assert default.batch_sizes == [5]
+    assert other.batch_sizes == [5]
+    assert batcher.batch_count == 2
+
+
+def test_max_wait_flushes_partial_batch() -> None:
+    """
+    Vérifie qu'une requête isolée est traitée après le délai maximal,
+    sans attendre que le lot soit plein.
+    """
+    model = RecordingModel()
+    batcher = MicroBatcher(model.predict, max_batch_size=1000, max_wait_ms=1)
+
+    results = asyncio.run(submit_all(batcher, np.ones((1, 8))))
+
+    assert results == [8.0]
+    assert model.batch_sizes == [1]
+
+
+def test_prediction_error_is_propagated() -> None:
+    """
+    Vérifie qu'une erreur du modèle est transmise à tous les appelants du lot.
+    """
+
+    def failing_predict(features: np.ndarray) -> np.ndarray:
+        raise ValueError("échec du modèle")
+
+    batcher = MicroBatcher(failing_predict, max_batch_size=8, max_wait_ms=10)
+
+    with pytest.raises(ValueError):
+        asyncio.run(submit_all(batcher, np.ones((4, 8))))
+
+
+@pytest.mark.parametrize("during", ["prediction", "collection"])
+def test_stop_cancels_in_flight_batch(during: str) -> None:
+    """
+    Vérifie que l'arrêt du regroupeur ne laisse aucun appelant bloqué.
+
+    Asserts:
+        - Les requêtes du lot en cours de prédiction (modèle lent) ou en cours de
+          collecte sont annulées par `stop`.
+    """
+    release = threading.Event()
+
+    def slow_predict(features: np.ndarray) -> np.ndarray:
+        release.wait(5)
+        return features.sum(axis=1)
+
+    max_wait_ms = 1 if during == "prediction" else 10_000
+    batcher = MicroBatcher(slow_predict, max_batch_size=64, max_wait_ms=max_wait_ms)
+
+    async def scenario() -> list:
+        await batcher.start()
+        tasks = [asyncio.create_task(batcher.submit(row)) for row in np.ones((3, 8))]
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(batcher.stop(), 1)
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        release.set()
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+def test_submit_requires_start() -> None:
+    """
+    Vérifie qu'une soumission sans démarrage préalable lève une erreur.
+    """
+    batcher = MicroBatcher(RecordingModel().predict)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.submit(np.ones(8)))
+
+
+@pytest.mark.parametrize("kwargs", [{"max_batch_size": 0}, {"max_wait_ms": -1}])
+def test_invalid_configuration(kwargs: dict) -> None:
+    """
+    Vérifie que des paramètres de regroupement invalides sont refusés.
+    """
+    with pytest.raises(ValueError):
+        MicroBatcher(RecordingModel().predict, **kwargs)
@@ -0,0 +1,115 @@
+import pytest
+
+from src.api.cache import PredictionCache
+
+
+class FakeClock:
+    """
+    Horloge contrôlable pour tester l'expiration des entrées.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache() -> PredictionCache:
+    """
+    Fixture qui retourne un petit cache associé au modèle "model" version 1.
+    """
+    cache = PredictionCache(max_size=2)
+    cache.set_model("model", 1)
+    return cache
+
+
+def test_hit_and_miss(cache: PredictionCache) -> None:
+    """
+    Vérifie qu'une prédiction ajoutée est retrouvée et que les compteurs sont tenus.
+    """
+    key = cache.key("model", 1, [1.0, 2.0])
+    assert cache.get(key) is None
+    cache.put(key, 3.5)
+    assert cache.get(key) == 3.5
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction(cache: PredictionCache) -> None:
+    """
+    Vérifie que l'entrée la moins récemment utilisée est évincée en premier.
+    """
+    a, b, c = (cache.key("model", 1, [value]) for value in (1.0, 2.0, 3.0))
+    cache.put(a, 1.0)
+    cache.put(b, 2.0)
+    cache.get(a)  # "a" devient la plus récente
+    cache.put(c, 3.0)
+
+    assert cache.get(b) is None
+    assert cache.get(a) == 1.0
+    assert cache.get(c) == 3.0
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_ttl_expiration() -> None:
+    """
+    Vérifie qu'une entrée n'est plus retournée après sa durée de vie.
+    """
+    clock = FakeClock()
+    cache = PredictionCache(max_size=10, ttl=5, clock=clock)
+    cache.set_model("model", 1)
+    key = cache.key("model", 1, [1.0])
+    cache.put(key, 1.0)
+
+    clock.now = 4.0
+    assert cache.get(key) == 1.0
+    clock.now = 6.0
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_rounded_keys() -> None:
+    """
+    Vérifie que l'arrondi configuré regroupe des caractéristiques quasi identiques.
+    """
+    cache = PredictionCache(decimals=2)
+    cache.set_model("model", 1)
+    cache.put(cache.key("model", 1, [1.0001, 2.0]), 7.0)
+
+    assert cache.get(cache.key("model", 1, [0.9999, 2.0])) == 7.0
+    assert cache.get(cache.key("model", 1, [1.01, 2.0])) is None
+
+
+def test_model_change_invalidates(cache: PredictionCache) -> None:
+    """
+    Vérifie que le changement de version du modèle vide le cache et que les
+    prédictions de l'ancienne version ne sont plus stockées.
+    """
+    old_key = cache.key("model", 1, [1.0])
+    cache.put(old_key, 1.0)
+
+    cache.set_model("model", 2)
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+    cache.put(old_key, 1.0)
+    assert cache.stats()["size"] == 0
+    new_key = cache.key("model", 2, [1.0])
+    cache.put(new_key, 2.0)
+    assert cache.get(new_key) == 2.0
+
+
+def test_disabled_cache() -> None:
+    """
+    Vérifie qu'un cache de taille 0 ne stocke rien.
+    """
+    cache = PredictionCache(max_size=0)
+    cache.set_model("model", 1)
+    key = cache.key("model", 1, [1.0])
+    cache.put(key, 1.0)
+
+    assert not cache.enabled
+    assert cache.get(key) is None
@@ -0,0 +1,220 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+from src.api.backends import CompiledBackend, SklearnBackend
+from src.ml.compiled import CompiledGradientBoosting
+
+# Modèle enregistré par `src/ml/train.py`
+MODEL_URI = "models:/Production-model/1"
+
+# Tolérance d'équivalence numérique avec `model.predict`
+TOLERANCE = 1e-9
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[np.ndarray]:
+    """
+    Fixture qui génère un jeu de données synthétique de régression.
+
+    Returns:
+        tuple: X (2000, 8) et y.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 8))
+    y = X[:, 0] * 2 + np.sin(X[:, 1] * 3) + (X[:, 2] > 0.5) + rng.normal(size=2000)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"n_estimators": 20, "max_depth": 3},
+        # Arbres déséquilibrés : feuilles à des profondeurs différentes
+        {"n_estimators": 20, "max_depth": 6, "min_samples_leaf": 200},
+        {"n_estimators": 5, "max_depth": 2, "init": "zero", "loss": "huber"},
+    ],
+)
+def test_compiled_matches_sklearn(data: tuple[np.ndarray], params: dict) -> None:
+    """
+    Vérifie que le moteur compilé est numériquement équivalent à `model.predict`,
+    par lot et ligne par ligne.
+    """
+    X, y = data
+    model = GradientBoostingRegressor(random_state=0, **params).fit(X, y)
+
+    compiled = CompiledGradientBoosting.from_sklearn(model, chunk_size=300)
+
+    np.testing.assert_allclose(compiled.predict(X), model.predict(X), atol=TOLERANCE)
+    np.testing.assert_allclose(
+        compiled.predict(X[:1]), model.predict(X[:1]), atol=TOLERANCE
+    )
+
+
+def test_compiled_arrays_layout(data: tuple[np.ndarray]) -> None:
+    """
+    Vérifie la forme des tableaux plats exportés pour tous les arbres.
+    """
+    X, y = data
+    model = GradientBoostingRegressor(n_estimators=7, max_depth=4).fit(X, y)
+
+    compiled = CompiledGradientBoosting.from_sklearn(model)
+
+    assert compiled.depth == 4
+    assert compiled.feature.shape == (7, 15)
+    assert compiled.threshold.shape == (7, 15)
+    assert compiled.value.shape == (7, 16)
+
+
+def test_unsupported_model(data: tuple[np.ndarray]) -> None:
+    """
+    Vérifie qu'un modèle autre qu'un `GradientBoostingRegressor` est refusé.
+    """
+    X, y = data
+    model = RandomForestRegressor(n_estimators=2, max_depth=2).fit(X, y)
+
+    with pytest.raises(TypeError):
+        CompiledGradientBoosting.from_sklearn(model)
+
+
+def test_compiled_backend_matches_production_model() -> None:
+    """
+    Vérifie que le moteur "compiled" de l'API reproduit le modèle de production.
+    """
+    rng = np.random.default_rng(1)
+    low = [0.5, 1, 2, 0.5, 100, 1, 32.5, -124.3]
+    high = [15, 52, 10, 2, 5000, 5, 42, -114.3]
+    features = rng.uniform(low, high, size=(1000, 8))
+
+    expected = SklearnBackend(MODEL_URI).predict(features)
+    backend = CompiledBackend(MODEL_URI)
+
+    np.testing.assert_allclose(backend.predict(features), expected, atol=TOLERANCE)
+    assert backend.predict_row(features[0].tolist()) == pytest.approx(expected[0])
+
+
+def test_save_and_memory_map(data: tuple[np.ndarray], tmp_path) -> None:
+    """
+    Vérifie que les tableaux écrits sur disque sont rechargés en projection
+    mémoire en lecture seule, avec des prédictions identiques.
+    """
+    X, y = data
+    model = GradientBoostingRegressor(n_estimators=10, max_depth=3).fit(X, y)
+    compiled = CompiledGradientBoosting.from_sklearn(model)
+
+    path = compiled.save(tmp_path / "model")
+    loaded = CompiledGradientBoosting.load(path, mmap=True)
+
+    assert isinstance(loaded.threshold, np.memmap)
+    assert not loaded.threshold.flags.writeable
+    np.testing.assert_array_equal(loaded.predict(X), compiled.predict(X))
+    # Un second enregistrement au même endroit conserve les fichiers existants
+    assert compiled.save(path) == path
+
+
+def test_mmap_backend_materializes_once(tmp_path, monkeypatch) -> None:
+    """
+    Vérifie que le moteur "mmap" compile le modèle une seule fois : un second
+    chargement (autre worker) réutilise les fichiers sans recharger l'estimateur.
+    Si le registre est reconstruit, la même URI désigne une autre exécution, dont
+    les fichiers ne sont pas réutilisés.
+    """
+    import src.api.backends as backends
+
+    monkeypatch.setattr(backends, "MODEL_MMAP_DIR", tmp_path)
+    first = backends.MmapBackend(MODEL_URI)
+
+    def fail(model_uri: str) -> None:
+        raise AssertionError("Le modèle ne doit pas être recompilé.")
+
+    monkeypatch.setattr(backends, "load_sklearn_model", fail)
+    second = backends.MmapBackend(MODEL_URI)
+
+    assert first.path == second.path
+    assert first.path.parent == tmp_path
+    row = [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]
+    assert second.predict_row(row) == first.predict_row(row)
+
+    monkeypatch.setattr(backends, "model_run_id", lambda model_uri: "rebuilt")
+    with pytest.raises(AssertionError, match="recompilé"):
+        backends.MmapBackend(MODEL_URI)
+
+
+def test_float32_reaches_same_leaves(data: tuple[np.ndarray], tmp_path) -> None:
+    """
+    Vérifie qu'en float32 chaque ligne atteint les mêmes feuilles qu'avec scikit-learn,
+    y compris pour des caractéristiques égales aux seuils ou à leurs voisins float32.
+    """
+    X, y = data
+    # Un seul arbre, taux 1 : une feuille différente se verrait à l'unité près
+    model = GradientBoostingRegressor(
+        n_estimators=1, max_depth=6, learning_rate=1.0
+    ).fit(X, y)
+    compiled = CompiledGradientBoosting.from_sklearn(model, dtype=np.float32)
+
+    tree = model.estimators_[0, 0].tree_
+    internal = tree.children_left != -1
+    features, thresholds = tree.feature[internal], tree.threshold[internal]
+    rows = np.arange(len(thresholds))
+    for values in (
+        thresholds,
+        np.nextafter(thresholds.astype(np.float32), np.float32(np.inf)),
+        np.nextafter(thresholds.astype(np.float32), np.float32(-np.inf)),
+    ):
+        X_edge = X[: len(thresholds)].copy()
+        X_edge[rows, features] = values
+        np.testing.assert_allclose(
+            compiled.predict(X_edge), model.predict(X_edge), atol=1e-5
+        )
+
+    assert compiled.threshold.dtype == np.float32
+    assert compiled.value.dtype == np.float32
+    loaded = CompiledGradientBoosting.load(compiled.save(tmp_path / "model"))
+    assert loaded.dtype == np.float32
+    np.testing.assert_array_equal(loaded.predict(X), compiled.predict(X))
+
+
+def test_float32_guardrail(tmp_path, monkeypatch) -> None:
+    """
+    Vérifie la validation au chargement du moteur float32.
+
+    Asserts:
+        - Sur l'échantillon de validation, le moteur float32 reste à moins d'un dollar
+          du modèle de production et est retenu.
+        - Avec une tolérance nulle, ou sans échantillon, le moteur float64 est conservé.
+        - Sans fichier, l'échantillon est l'ensemble de test du dépôt local, sinon un
+          tirage dans la référence de dérive.
+    """
+    import src.api.backends as backends
+    from src.ml.dataset import load_dataset
+
+    _, X_test, _, _ = load_dataset().splits()
+    sample = tmp_path / "sample.csv"
+    X_test.to_csv(sample, index=False)
+    monkeypatch.setattr(backends, "INFERENCE_PRECISION_SAMPLE", str(sample))
+
+    backend = CompiledBackend(MODEL_URI, precision="float32")
+    assert backend.precision == "float32"
+    expected = SklearnBackend(MODEL_URI).predict(X_test.to_numpy())
+    np.testing.assert_allclose(backend.predict(X_test.to_numpy()), expected, atol=1e-5)
+
+    monkeypatch.setattr(backends, "INFERENCE_PRECISION_MAX_ERROR", 0.0)
+    assert CompiledBackend(MODEL_URI, precision="float32").precision == "float64"
+
+    # Sans fichier, l'échantillon vient de l'ensemble de test du dépôt local
+    monkeypatch.setattr(backends, "INFERENCE_PRECISION_SAMPLE", "")
+    monkeypatch.setattr(backends, "INFERENCE_PRECISION_MAX_ERROR", 1e-5)
+    monkeypatch.setattr(backends, "INFERENCE_PRECISION_SAMPLE_SIZE", 500)
+    np.testing.assert_array_equal(
+        backends.precision_sample(MODEL_URI), X_test.to_numpy()[:500]
+    )
+    # Sans dépôt local, la référence de dérive (absente pour ce modèle) est lue
+    monkeypatch.setattr("src.ml.dataset.DATASET_DIR", tmp_path)
+    with pytest.raises(LookupError, match="référence de dérive"):
+        backends.precision_sample(MODEL_URI)
+
+    def missing(model_uri: str) -> None:
+        raise LookupError("pas de référence")
+
+    monkeypatch.setattr(backends, "precision_sample", missing)
+    assert CompiledBackend(MODEL_URI, precision="float32").precision == "float64"
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.dataset import Dataset, ingest, load_dataset
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """
+    Fixture générant un petit jeu de données immobilier.
+
+    Returns:
+        pd.DataFrame: Deux caractéristiques et une colonne cible "price".
+    """
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "surface": rng.uniform(20, 200, 50),
+            "rooms": rng.integers(1, 8, 50).astype(float),
+            "price": rng.uniform(1, 5, 50),
+        }
+    )
+
+
+def test_ingest_csv(tmp_path, frame: pd.DataFrame) -> None:
+    """
+    Teste l'ingestion d'un fichier CSV et le découpage sans copie.
+
+    Asserts:
+        - Le manifeste décrit les colonnes, la cible et le découpage.
+        - Les sous-ensembles reprennent toutes les lignes, sans recouvrement.
+        - Les sous-ensembles sont des vues sur les fichiers projetés en mémoire.
+    """
+    source = tmp_path / "biens.csv"
+    frame.to_csv(source, index=False)
+
+    dataset = ingest("biens", source, target="price", directory=tmp_path)
+    X_train, X_test, y_train, y_test = dataset.splits()
+
+    assert dataset.feature_names == ["surface", "rooms"]
+    assert dataset.manifest["split"]["train_rows"] == len(X_train) == 40
+    assert len(X_test) == len(y_test) == 10
+    np.testing.assert_allclose(
+        np.sort(pd.concat([y_train, y_test])), np.sort(frame["price"])
+    )
+    assert isinstance(dataset.features, np.memmap)
+    assert np.shares_memory(X_train.to_numpy(), dataset.features)
+    assert np.shares_memory(y_test.to_numpy(), dataset.target)
+
+
+def test_ingest_parquet_float32(tmp_path, frame: pd.DataFrame) -> None:
+    """
+    Teste l'ingestion d'un fichier Parquet en float32.
+
+    Asserts:
+        - Les colonnes sont stockées dans le type demandé.
+        - Une colonne cible absente est refusée.
+    """
+    source = tmp_path / "biens.parquet"
+    frame.to_parquet(source)
+
+    dataset = ingest(
+        "biens", source, target="price", dtype="float32", directory=tmp_path
+    )
+
+    assert dataset.features.dtype == np.float32
+    assert dataset.features.flags.f_contiguous
+    with pytest.raises(ValueError):
+        ingest("biens", source, target="prix", directory=tmp_path)
+
+
+def test_load_dataset_reuses_store(tmp_path, frame: pd.DataFrame) -> None:
+    """
+    Teste que le jeu de données n'est ingéré qu'une fois, sauf changement de découpage.
+
+    Asserts:
+        - Un second chargement réutilise les fichiers existants.
+        - Un autre découpage déclenche une nouvelle ingestion.
+    """
+    source = tmp_path / "biens.csv"
+    frame.to_csv(source, index=False)
+
+    first = load_dataset("biens", source, "price", directory=tmp_path)
+    second = load_dataset("biens", None, directory=tmp_path)
+    assert second.manifest["ingested_at"] == first.manifest["ingested_at"]
+
+    resplit = load_dataset("biens", source, "price", test_size=0.5, directory=tmp_path)
+    assert resplit.train_rows == 25
+
+
+def test_load_dataset_default_name(tmp_path, frame: pd.DataFrame) -> None:
+    """
+    Teste qu'une source locale ingérée sous le nom par défaut ne remplace pas
+    durablement California Housing.
+
+    Asserts:
+        - Sans source, le jeu par défaut est ingéré à nouveau depuis California Housing.
+        - Une autre colonne cible déclenche une nouvelle ingestion.
+    """
+    source = tmp_path / "biens.csv"
+    frame.to_csv(source, index=False)
+
+    assert load_dataset(source=source, target="price", directory=tmp_path).rows == 50
+    default = load_dataset(directory=tmp_path)
+    assert default.manifest["source"] == "california_housing"
+    assert default.rows == 20640
+
+    load_dataset("biens", source, "price", directory=tmp_path)
+    retargeted = load_dataset("biens", source, "rooms", directory=tmp_path)
+    assert retargeted.target_name == "rooms"
+    assert retargeted.feature_names == ["surface", "price"]
+
+
+def test_verify_detects_corruption(tmp_path, frame: pd.DataFrame) -> None:
+    """
+    Teste la vérification des sommes de contrôle du manifeste.
+
+    Asserts:
+        - Un jeu intact est validé.
+        - Un fichier modifié après l'ingestion est détecté.
+    """
+    source = tmp_path / "biens.csv"
+    frame.to_csv(source, index=False)
+    dataset = ingest("biens", source, target="price", directory=tmp_path)
+    dataset.verify()
+
+    target = np.load(dataset.path / "target.npy")
+    np.save(dataset.path / "target.npy", target + 1)
+
+    with pytest.raises(ValueError):
+        Dataset(dataset.path).verify()
+    with pytest.raises(ValueError):
+        load_dataset("biens", directory=tmp_path, verify=True)
+
+
+def test_california_housing_matches_train_test_split(tmp_path) -> None:
+    """
+    Teste que le jeu par défaut reproduit le découpage historique de l'entraînement.
+
+    Asserts:
+        - X_train, X_test, y_train, y_test sont identiques à `train_test_split`
+          appliqué à `fetch_california_housing`, lignes dans le même ordre.
+    """
+    from sklearn.datasets import fetch_california_housing
+    from sklearn.model_selection import train_test_split
+
+    housing = fetch_california_housing(as_frame=True)
+    expected = train_test_split(
+        housing.data, housing.target, test_size=0.2, random_state=42
+    )
+
+    splits = load_dataset(directory=tmp_path).splits()
+
+    for part, reference in zip(splits, expected):
+        np.testing.assert_array_equal(part.to_numpy(), reference.to_numpy())
+    assert list(splits[0].columns) == list(housing.data.columns)
+    assert splits[2].name == "MedHouseVal"
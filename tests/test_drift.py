@@ -0,0 +1,163 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from scipy.stats import ks_2samp
+
+import src.api.app as app_module
+from src.api.app import app
+from src.api.backends import FEATURE_COLUMNS
+from src.api.prediction_log import PredictionLogger
+from src.monitoring.drift import (
+    DriftMonitor,
+    build_reference,
+    compute_drift,
+    filter_window,
+)
+
+
+def make_features(n: int, shift: float = 0.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère des caractéristiques synthétiques aux colonnes de California Housing.
+
+    Args:
+        n (int): Nombre de lignes.
+        shift (float, optional): Décalage ajouté au revenu médian. Defaults to 0.0.
+        seed (int, optional): Graine du générateur. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Caractéristiques.
+    """
+    rng = np.random.default_rng(seed)
+    low = [0.5, 1, 2, 0.5, 100, 1, 32.5, -124.3]
+    high = [15, 52, 10, 2, 5000, 5, 42, -114.3]
+    X = pd.DataFrame(rng.uniform(low, high, (n, 8)), columns=FEATURE_COLUMNS)
+    X["MedInc"] = rng.lognormal(1.2, 0.5, n) + shift
+    return X
+
+
+@pytest.fixture(scope="module")
+def reference() -> dict:
+    """
+    Fixture calculant la référence de dérive de 20 000 lignes synthétiques.
+
+    Returns:
+        dict: Référence.
+    """
+    return build_reference(make_features(20_000))
+
+
+def test_no_drift(reference: dict) -> None:
+    """
+    Teste la comparaison d'une fenêtre tirée de la même distribution que la référence.
+
+    Asserts:
+        - Aucune caractéristique n'est en dérive ; PSI et KS restent proches de 0.
+        - La référence est sérialisable en JSON.
+    """
+    result = compute_drift(reference, [make_features(50_000, seed=1)])
+
+    assert result["rows"] == 50_000
+    assert result["drifted_features"] == []
+    for stats in result["features"].values():
+        assert stats["psi"] < 0.01
+        assert stats["ks"] < 0.02
+        assert abs(stats["mean_shift"]) < 0.05
+    json.dumps(reference)
+
+
+def test_drift_detected(reference: dict) -> None:
+    """
+    Teste la détection d'un décalage du revenu médian.
+
+    Asserts:
+        - Seul le revenu médian est en dérive, avec des décalages positifs.
+        - Le KS sur la grille de référence est proche du KS exact à deux échantillons.
+    """
+    live = make_features(50_000, shift=1.0, seed=1)
+    result = compute_drift(reference, [live])
+    stats = result["features"]["MedInc"]
+
+    assert result["drifted_features"] == ["MedInc"]
+    assert stats["psi"] > 0.2
+    assert stats["mean_shift"] == pytest.approx(
+        1.0 / reference["columns"]["MedInc"]["std"], rel=0.05
+    )
+    assert stats["quantile_shift"]["p50"] > 0
+    exact = ks_2samp(make_features(20_000)["MedInc"], live["MedInc"]).statistic
+    assert stats["ks"] == pytest.approx(exact, abs=0.01)
+
+
+def test_chunk_invariance(reference: dict) -> None:
+    """
+    Teste que le résultat ne dépend pas du découpage en blocs.
+
+    Asserts:
+        - Un passage en un bloc et un passage par blocs de 777 lignes donnent les mêmes statistiques.
+        - Les valeurs manquantes sont ignorées.
+    """
+    live = make_features(10_000, shift=0.3, seed=2)
+    live.iloc[::10, 0] = np.nan
+    whole = compute_drift(reference, [live])
+    chunked = DriftMonitor(reference)
+    for start in range(0, len(live), 777):
+        chunked.update(live.iloc[start : start + 777].to_numpy())
+
+    result = chunked.result()
+    assert result["rows"] == whole["rows"]
+    for name, stats in whole["features"].items():
+        assert result["features"][name]["ks"] == stats["ks"]
+        assert result["features"][name]["psi"] == pytest.approx(stats["psi"])
+        assert result["features"][name]["mean_live"] == pytest.approx(
+            stats["mean_live"]
+        )
+    assert whole["features"]["MedInc"]["mean_live"] == pytest.approx(
+        live["MedInc"].mean()
+    )
+
+
+def test_filter_window() -> None:
+    """
+    Teste la restriction des blocs journalisés à une fenêtre de temps.
+
+    Asserts:
+        - Seules les lignes de [since, until[ sont conservées, dates naïves lues en UTC.
+    """
+    chunk = pd.DataFrame(
+        {"timestamp": pd.date_range("2025-01-01", periods=4, freq="h", tz="UTC")}
+    )
+    [window] = filter_window([chunk], "2025-01-01T01:00", "2025-01-01T03:00+00:00")
+
+    assert window["timestamp"].dt.hour.tolist() == [1, 2]
+
+
+def test_api_drift(tmp_path, monkeypatch, reference: dict) -> None:
+    """
+    Teste le point de terminaison "/drift" sur le trafic journalisé.
+
+    Asserts:
+        - Sans journal des prédictions, le point de terminaison répond 404.
+        - Les prédictions journalisées sont comparées à la référence du modèle servi.
+    """
+    client = TestClient(app)
+    monkeypatch.setattr(app_module, "prediction_log", PredictionLogger(None))
+    assert client.get("/drift").status_code == 404
+
+    prediction_log = PredictionLogger(tmp_path)
+    monkeypatch.setattr(app_module, "prediction_log", prediction_log)
+    monkeypatch.setattr(app_module, "drift_references", {})
+    monkeypatch.setattr(app_module, "load_reference", lambda name, version: reference)
+    live = make_features(500, shift=1.0, seed=3)
+    prediction_log.log(
+        "/predict/batch", "model", "1", live.to_numpy(), np.zeros(500), None
+    )
+    prediction_log.stop()
+
+    response = client.get("/drift", params={"since": "2000-01-01T00:00:00"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rows"] == 500
+    assert body["drifted_features"] == ["MedInc"]
+    assert body["model_version"] == app_module.model_version
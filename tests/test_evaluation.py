@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.api.backends import FEATURE_COLUMNS
+from src.ml.evaluation import (
+    RunningMetrics,
+    evaluate_chunks,
+    iter_frame,
+    medinc_bucket,
+    region,
+)
+from src.ml.train import evalute_model
+
+
+@pytest.fixture
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Fixture générant des logements synthétiques aux colonnes de California Housing.
+
+    Returns:
+        tuple: X, y
+    """
+    rng = np.random.default_rng(0)
+    low = [0.5, 1, 2, 0.5, 100, 1, 32.5, -124.3]
+    high = [15, 52, 10, 2, 5000, 5, 42, -114.3]
+    X = pd.DataFrame(rng.uniform(low, high, (3000, 8)), columns=FEATURE_COLUMNS)
+    y = pd.Series(0.4 * X["MedInc"] + rng.normal(0, 0.5, len(X)), name="MedHouseVal")
+    return X, y
+
+
+@pytest.fixture
+def model(data: tuple) -> LinearRegression:
+    """
+    Fixture entraînant une régression linéaire sur les données synthétiques.
+
+    Returns:
+        LinearRegression: Modèle entraîné.
+    """
+    X, y = data
+    return LinearRegression().fit(X[:1000], y[:1000])
+
+
+def reference(y_true, y_pred) -> dict:
+    """
+    Métriques calculées par scikit-learn, comme avant l'évaluation par blocs.
+    """
+    return {
+        "mean_squared_error": mean_squared_error(y_true, y_pred),
+        "mean_absolute_error": mean_absolute_error(y_true, y_pred),
+        "r2": r2_score(y_true, y_pred),
+    }
+
+
+def test_evalute_model_matches_sklearn(data: tuple, model: LinearRegression) -> None:
+    """
+    Teste que `evalute_model` reproduit les métriques de scikit-learn.
+
+    Asserts:
+        - En un bloc, les trois métriques sont identiques.
+        - Par petits blocs, elles sont égales aux erreurs d'arrondi près.
+    """
+    X, y = data
+    expected = reference(y, model.predict(X))
+
+    assert evalute_model(model, X, y) == expected
+    chunked = evalute_model(model, X, y, chunk_size=128)
+    assert chunked == pytest.approx(expected, rel=1e-12)
+
+
+def test_running_metrics_is_numerically_stable() -> None:
+    """
+    Teste la stabilité du R² sur une cible de grande moyenne et de faible variance.
+
+    Asserts:
+        - Le R² accumulé par blocs reste égal à celui de scikit-learn.
+    """
+    rng = np.random.default_rng(0)
+    y_true = 1e9 + rng.normal(0, 1, 100_000)
+    y_pred = y_true + rng.normal(0, 0.5, len(y_true))
+
+    metrics = RunningMetrics()
+    for start in range(0, len(y_true), 1000):
+        metrics.update(y_true[start : start + 1000], y_pred[start : start + 1000])
+
+    assert metrics.result()["r2"] == pytest.approx(r2_score(y_true, y_pred), rel=1e-9)
+
+
+def test_constant_target() -> None:
+    """
+    Teste le R² d'une cible constante, comme `r2_score`.
+
+    Asserts:
+        - 1.0 pour des prédictions parfaites, 0.0 sinon.
+    """
+    perfect, imperfect = RunningMetrics(), RunningMetrics()
+    perfect.update(np.ones(5), np.ones(5))
+    imperfect.update(np.ones(5), np.zeros(5))
+
+    assert perfect.result()["r2"] == 1.0
+    assert imperfect.result()["r2"] == 0.0
+
+
+def test_sliced_metrics(data: tuple, model: LinearRegression) -> None:
+    """
+    Teste les métriques par tranche calculées dans le même passage.
+
+    Asserts:
+        - Chaque tranche de revenu a les métriques de scikit-learn sur ses lignes.
+        - Les effectifs des tranches couvrent toutes les lignes.
+    """
+    X, y = data
+    scores = evaluate_chunks(
+        model, iter_frame(X, y, 500), {"medinc": medinc_bucket, "region": region}
+    )
+
+    buckets = medinc_bucket(X)
+    for label in np.unique(buckets):
+        rows = buckets == label
+        expected = reference(y[rows], model.predict(X[rows]))
+        for key, value in expected.items():
+            assert scores[f"medinc/{label}/{key}"] == pytest.approx(value, rel=1e-9)
+        assert scores[f"medinc/{label}/count"] == rows.sum()
+    region_counts = [value for key, value in scores.items() if key.endswith("/count")]
+    assert sum(region_counts) == 2 * len(X)
+
+
+def test_slice_labels() -> None:
+    """
+    Teste les étiquettes des tranches de revenu et des régions.
+
+    Asserts:
+        - Les bornes des tranches de revenu sont inclusives à gauche.
+        - Les régions sont désignées par le coin sud-ouest de leur case.
+    """
+    X = pd.DataFrame(
+        {
+            "MedInc": [1.0, 2.0, 7.9, 12.0],
+            "Latitude": [37.88] * 4,
+            "Longitude": [-122.23] * 4,
+        }
+    )
+
+    assert list(medinc_bucket(X)) == ["0-2", "2-4", "6-8", "8-inf"]
+    assert region(X)[0] == "lat36_lon-124"
+
+
+def test_evaluate_chunks_handles_arrays() -> None:
+    """
+    Teste l'évaluation par blocs de tableaux NumPy, utilisée par la recherche d'hyperparamètres.
+
+    Asserts:
+        - Les trois métriques sont calculées sans noms de colonnes.
+    """
+    X, y = np.arange(20.0).reshape(10, 2), np.arange(10.0)
+    model = DummyRegressor().fit(X, y)
+
+    scores = evaluate_chunks(model, iter_frame(X, y, 3))
+
+    assert scores == pytest.approx(reference(y, model.predict(X)), rel=1e-12)
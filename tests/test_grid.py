@@ -0,0 +1,206 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.inspection import partial_dependence
+
+import src.api.app as app_module
+from src.api.app import app
+from src.api.cache import PredictionCache
+from src.api.loader import ServedModel
+from src.ml.grid import ERROR_QUANTILES, PredictionGrid
+
+PAYLOAD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[np.ndarray]:
+    """
+    Fixture qui génère un jeu de données synthétique dont la cible ne dépend, à un
+    bruit près, que des deux premières caractéristiques.
+
+    Returns:
+        tuple: X (3000, 8) et y.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-1, 1, size=(3000, 8))
+    y = 2 * X[:, 0] + np.sin(3 * X[:, 1]) + 0.05 * rng.normal(size=3000)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def model(data: tuple[np.ndarray]) -> GradientBoostingRegressor:
+    """
+    Fixture qui entraîne un GradientBoostingRegressor sur le jeu synthétique.
+    """
+    X, y = data
+    return GradientBoostingRegressor(n_estimators=50, max_depth=3).fit(X, y)
+
+
+def test_grid_interpolates_partial_dependence(data: tuple, model) -> None:
+    """
+    Vérifie que la grille reproduit la dépendance partielle aux nœuds et interpole entre eux.
+
+    Asserts:
+        - Les caractéristiques retenues sont celles dont dépend la cible.
+        - Aux nœuds, la prédiction vaut la dépendance partielle plus la constante.
+        - Au milieu d'une cellule, elle vaut la moyenne des coins.
+        - Hors des bornes, la valeur est celle du bord.
+    """
+    X, y = data
+    grid = PredictionGrid.build(model, X[:2000], X[2000:], n_features=2, resolution=8)
+    assert grid.features.tolist() == [0, 1]
+
+    axes = [np.linspace(a, b, 8) for a, b in zip(grid.lower, grid.upper)]
+    expected = partial_dependence(
+        model, X[:2000], [0, 1], method="recursion", custom_values=dict(enumerate(axes))
+    )["average"][0]
+    rows = np.zeros((3, 8))
+    rows[0, :2] = axes[0][2], axes[1][5]
+    rows[1, :2] = (axes[0][2] + axes[0][3]) / 2, axes[1][5]
+    rows[2, :2] = grid.upper[0] + 10, axes[1][5]
+    predictions = grid.predict(rows) - grid.offset
+
+    np.testing.assert_allclose(predictions[0], expected[2, 5], rtol=1e-6)
+    np.testing.assert_allclose(
+        predictions[1], (expected[2, 5] + expected[3, 5]) / 2, rtol=1e-6
+    )
+    np.testing.assert_allclose(predictions[2], expected[7, 5], rtol=1e-6)
+
+
+def test_grid_error(data: tuple, model) -> None:
+    """
+    Vérifie la mesure de l'erreur de la grille par rapport au modèle exact.
+
+    Asserts:
+        - Les quantiles de l'erreur sont croissants.
+        - La borne annoncée est le quantile 95 % de l'erreur sur la validation.
+        - L'erreur diminue quand la résolution augmente.
+    """
+    X, y = data
+    coarse = PredictionGrid.build(model, X[:2000], X[2000:], n_features=2, resolution=4)
+    fine = PredictionGrid.build(model, X[:2000], X[2000:], n_features=2, resolution=32)
+
+    assert len(fine.errors) == len(ERROR_QUANTILES)
+    assert np.all(np.diff(fine.errors) >= 0)
+    error = np.abs(fine.predict(X[2000:]) - model.predict(X[2000:]))
+    assert fine.error_bound == pytest.approx(np.quantile(error, 0.95))
+    assert fine.error_bound < coarse.error_bound
+
+
+def test_grid_save_load(tmp_path, data: tuple, model) -> None:
+    """
+    Vérifie qu'une grille relue depuis son fichier `.npz` prédit à l'identique.
+
+    Asserts:
+        - Prédictions, borne d'erreur et empreinte mémoire identiques.
+    """
+    X, y = data
+    grid = PredictionGrid.build(model, X[:2000], X[2000:], n_features=3, resolution=8)
+
+    loaded = PredictionGrid.load(grid.save(tmp_path / "grid.npz"))
+
+    np.testing.assert_array_equal(loaded.predict(X), grid.predict(X))
+    assert loaded.error_bound == grid.error_bound
+    assert loaded.table.nbytes == 8**3 * 4
+
+
+def test_grid_constant_feature(tmp_path, data: tuple, model) -> None:
+    """
+    Teste une grille dont une caractéristique est constante (bornes égales).
+
+    Asserts:
+        - La construction, la prédiction et le rechargement n'émettent pas
+          d'avertissement numérique (division par zéro).
+        - Les prédictions sont finies et ne dépendent pas de la valeur lue sur
+          l'axe constant.
+    """
+    X, y = data
+    X = X.copy()
+    X[:, 1] = 0.5
+    with np.errstate(all="raise"):
+        grid = PredictionGrid.build(
+            model, X[:2000], X[2000:], resolution=8, features=[0, 1]
+        )
+        predictions = grid.predict(X[2000:])
+        shifted = X[2000:].copy()
+        shifted[:, 1] = 3.0
+        np.testing.assert_array_equal(grid.predict(shifted), predictions)
+        loaded = PredictionGrid.load(grid.save(tmp_path / "grid.npz"))
+        np.testing.assert_array_equal(loaded.predict(X[2000:]), predictions)
+
+    assert np.isfinite(predictions).all()
+    assert np.isfinite(grid.errors).all()
+
+
+@pytest.mark.parametrize(
+    "error", [LookupError("absente"), OSError("illisible"), RuntimeError("registre")]
+)
+def test_on_model_load_without_grid(monkeypatch, error: Exception) -> None:
+    """
+    Teste la préparation d'un modèle dont la grille ne peut pas être chargée.
+
+    Asserts:
+        - La grille est chargée avant que le cache ne change de modèle.
+        - Quelle que soit l'erreur, le modèle est préparé sans grille et le cache
+          passe à sa version.
+    """
+    cache = PredictionCache(max_size=8)
+    cache.set_model("model", "1")
+    cached_model = []
+
+    def load_grid(*key):
+        cached_model.append(cache._model)
+        raise error
+
+    monkeypatch.setattr(app_module, "PREDICTION_GRID_ENABLED", True)
+    monkeypatch.setattr(app_module, "prediction_grids", {})
+    monkeypatch.setattr(app_module, "cache", cache)
+    monkeypatch.setattr(app_module, "load_grid", load_grid)
+
+    app_module.on_model_load(ServedModel(None, "model", "2", 0.0, 0.0))
+
+    assert cached_model == [("model", "1")]
+    assert app_module.prediction_grids == {}
+    assert cache._model == ("model", "2")
+
+
+def test_api_approximate(monkeypatch, data: tuple, model) -> None:
+    """
+    Teste le point de terminaison "/predict/approximate".
+
+    Asserts:
+        - Désactivé, il répond 404.
+        - Sans grille pour le modèle servi, il répond 404.
+        - Sinon, il renvoie la prédiction de la grille et sa borne d'erreur.
+    """
+    client = TestClient(app)
+    monkeypatch.setattr(app_module, "PREDICTION_GRID_ENABLED", False)
+    assert client.post("/predict/approximate", json=PAYLOAD).status_code == 404
+
+    monkeypatch.setattr(app_module, "PREDICTION_GRID_ENABLED", True)
+    monkeypatch.setattr(app_module, "prediction_grids", {})
+    assert client.post("/predict/approximate", json=PAYLOAD).status_code == 404
+
+    X, y = data
+    grid = PredictionGrid.build(model, X[:2000], X[2000:], n_features=2, resolution=8)
+    served = app_module.get_model()
+    app_module.prediction_grids[(served.name, served.version)] = grid
+    response = client.post("/predict/approximate", json=PAYLOAD)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["prediction"] == pytest.approx(
+        grid.predict(np.array([list(PAYLOAD.values())]))[0]
+    )
+    assert body["error_bound"] == grid.error_bound
+    assert response.headers["X-Model-Version"] == served.version
@@ -1,5 +1,13 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
 from streamlit.testing.v1 import AppTest
-from src.interface.interface import model_prediction
+import src.interface.interface as interface
+from src.interface.interface import model_prediction, score_frame
 import pytest
 import requests
 
@@ -44,7 +52,7 @@ def test_model_prediction_success(monkeypatch) -> None:
     def mock_post(*args, **kwargs) -> MockResponseSuccess:
         return MockResponseSuccess()
 
-    monkeypatch.setattr(requests, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
 
     input_data = {
         "medinc": 5.0,
@@ -69,7 +77,7 @@ def test_model_prediction_exception(monkeypatch) -> None:
     def mock_post(*args, **kwargs) -> requests.exceptions.RequestException:
         raise requests.exceptions.RequestException
 
-    monkeypatch.setattr(requests, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
 
     input_data = {
         "medinc": 5.0,
@@ -94,7 +102,7 @@ def test_model_prediction_http_error(monkeypatch):
     def mock_post(*args, **kwargs) -> MockResponseError:
         return MockResponseError()
 
-    monkeypatch.setattr(requests, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
 
     input_data = {
         "medinc": 5.0,
@@ -110,6 +118,184 @@ def test_model_prediction_http_error(monkeypatch):
     assert result == "Erreur : le modèle n'a pas pu effectuer une prédiction."
 
 
+INPUT = {
+    "medinc": 5.0,
+    "houseage": 15.0,
+    "averooms": 6.0,
+    "avebedrms": 1.0,
+    "population": 800.0,
+    "aveoccup": 3.0,
+    "latitude": 37.0,
+    "longitude": -122.0,
+}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    Fixture lançant une API HTTP/1.1 locale dont le comportement est réglable.
+
+    Le gestionnaire `api.handle(handler)` retourne (statut, corps) ; chaque requête
+    est enregistrée avec le port client, pour vérifier la réutilisation des connexions.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            server.requests.append((self.path, self.client_address[1]))
+            status, payload = server.handle(json.loads(body))
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(interface, "API_URL", f"http://127.0.0.1:{server.server_port}")
+    interface.get_session.clear()
+    yield server
+    interface.get_session.clear()
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_and_keep_alive(api) -> None:
+    """
+    Teste les nouvelles tentatives et la réutilisation des connexions.
+
+    Asserts:
+        - Une réponse 503 est retentée et la prédiction finit par aboutir.
+        - Les requêtes successives passent par la même connexion (même port client).
+    """
+    statuses = iter([503, 200, 200])
+    api.handle = lambda body: (next(statuses), {"prediction": 3})
+
+    assert (
+        model_prediction(INPUT)
+        == "Le prix prédit pour le logement est : 300000 dollars."
+    )
+    assert (
+        model_prediction(INPUT)
+        == "Le prix prédit pour le logement est : 300000 dollars."
+    )
+    assert len(api.requests) == 3
+    assert len({port for _, port in api.requests}) == 1
+
+
+def test_model_prediction_approximate(api) -> None:
+    """
+    Teste `model_prediction` en mode approché.
+
+    Asserts:
+        - La prédiction approchée est affichée avec sa borne d'erreur.
+        - Si l'API répond 404 (grille indisponible), la prédiction exacte de "/predict" est affichée.
+    """
+    available = True
+
+    def handle(body: dict) -> tuple:
+        if api.requests[-1][0] == "/predict":
+            return 200, {"prediction": 3}
+        if available:
+            return 200, {"prediction": 3, "error_bound": 0.15}
+        return 404, {"detail": "Not Found"}
+
+    api.handle = handle
+    assert model_prediction(INPUT, approximate=True) == (
+        "Le prix estimé pour le logement est d'environ 300000 dollars (± 15000 dollars)."
+    )
+
+    available = False
+    api.requests.clear()
+    assert (
+        model_prediction(INPUT, approximate=True)
+        == "Le prix prédit pour le logement est : 300000 dollars."
+    )
+    assert [path for path, _ in api.requests] == ["/predict/approximate", "/predict"]
+
+
+def test_read_timeout(api, monkeypatch) -> None:
+    """
+    Teste qu'une API trop lente ne bloque pas l'interface.
+
+    Asserts:
+        - Après le délai de lecture et les nouvelles tentatives, un message d'erreur est retourné.
+    """
+
+    def slow(body: dict) -> tuple:
+        time.sleep(1)
+        return 200, {"prediction": 3}
+
+    api.handle = slow
+    monkeypatch.setattr(interface, "API_READ_TIMEOUT", 0.1)
+
+    start = time.perf_counter()
+    result = model_prediction(INPUT)
+    assert result == "Erreur : le modèle n'a pas pu effectuer une prédiction."
+    assert time.perf_counter() - start < 1
+    assert len(api.requests) == interface.API_RETRIES + 1
+
+
+def test_score_frame(api) -> None:
+    """
+    Teste la prédiction d'un fichier de districts par paquets simultanés.
+
+    Asserts:
+        - Chaque district reçoit la prédiction de sa ligne, quel que soit l'ordre des réponses.
+        - Les lignes invalides et celles d'un paquet en échec restent sans prédiction.
+        - La progression est signalée après chaque paquet, jusqu'au total.
+    """
+
+    def batch(records: list[dict]) -> tuple:
+        if any(record["houseage"] == -1 for record in records):
+            return 500, {}
+        return 200, {
+            "predictions": [
+                None if record["medinc"] is None else record["medinc"]
+                for record in records
+            ]
+        }
+
+    api.handle = batch
+    frame = pd.DataFrame([INPUT] * 25)
+    frame.columns = [column.capitalize() for column in frame.columns]
+    frame["Medinc"] = np.arange(25.0)
+    frame.loc[3, "Medinc"] = np.nan
+    frame.loc[21, "Houseage"] = -1  # Fait échouer le paquet des lignes 20 à 24
+    progress = []
+
+    predictions, failed = score_frame(
+        frame,
+        chunk_size=5,
+        concurrency=3,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    expected = np.arange(25.0)
+    expected[[3, 20, 21, 22, 23, 24]] = np.nan
+    np.testing.assert_array_equal(predictions.to_numpy(), expected)
+    assert failed == 6
+    assert [done for done, _ in progress] == [5, 10, 15, 20, 25]
+    assert progress[-1] == (25, 25)
+
+
+def test_score_frame_missing_columns() -> None:
+    """
+    Teste le refus d'un fichier auquel il manque des colonnes.
+    """
+    with pytest.raises(KeyError, match="longitude"):
+        score_frame(pd.DataFrame([INPUT]).drop(columns="longitude"))
+
+
 @pytest.fixture
 def session() -> AppTest:
     """
@@ -153,7 +339,7 @@ def test_valid_input(session: AppTest, monkeypatch) -> None:
     def mock_post(*args, **kwargs) -> MockResponseSuccess:
         return MockResponseSuccess()
 
-    monkeypatch.setattr(requests, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
     # Fournir des entrées utilissessioneur valides
     session.text_input[0].input("-122.23")
     session.text_input[1].input("37.88")
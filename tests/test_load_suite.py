@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+
+from benchmarks.load_suite import (
+    compare,
+    make_payloads,
+    replay_records,
+    run_target,
+    synthetic_records,
+)
+
+
+def result(throughput: float, p99: float, errors: int = 0) -> dict:
+    """
+    Résultat minimal d'une configuration de la suite de charge.
+    """
+    return {
+        "target": "inprocess",
+        "concurrency": 8,
+        "batch_size": 1,
+        "errors": errors,
+        "throughput_rps": throughput,
+        "latency_p50_ms": 2.0,
+        "latency_p99_ms": p99,
+    }
+
+
+def test_compare_to_baseline() -> None:
+    """
+    Teste la détection des régressions par rapport à une référence.
+
+    Asserts:
+        - Une variation dans la tolérance n'est pas une régression.
+        - Une baisse de débit, une hausse de latence ou de nouvelles erreurs en sont.
+        - La tolérance peut être fixée par métrique.
+        - Une configuration absente du rapport ou de la référence en est une.
+    """
+    baseline = {"results": [result(400, 10)]}
+
+    assert compare({"results": [result(350, 11)]}, baseline, tolerance=0.2) == []
+    regressions = compare({"results": [result(300, 15, 2)]}, baseline, 0.2)
+    assert len(regressions) == 3
+    assert any("throughput_rps" in regression for regression in regressions)
+    assert any("latency_p99_ms" in regression for regression in regressions)
+    assert compare({"results": [result(300, 15)]}, baseline, tolerance=0.6) == []
+    assert (
+        compare({"results": [result(400, 15)]}, baseline, 0.2, {"latency_p99_ms": 0.6})
+        == []
+    )
+    other = {**result(400, 10), "concurrency": 32}
+    assert compare({"results": [other]}, baseline, 0.2) == [
+        "inprocess clients=8 lignes=1 : absente du rapport",
+        "inprocess clients=32 lignes=1 : absente de la référence",
+    ]
+
+
+def test_replay_and_payloads(tmp_path) -> None:
+    """
+    Teste la relecture d'un journal de requêtes et le découpage en requêtes.
+
+    Asserts:
+        - Les enregistrements nus et les lots sous la clé "request" sont relus.
+        - Les requêtes reprennent au début des enregistrements si besoin.
+    """
+    records = synthetic_records(3, seed=1)
+    path = tmp_path / "requetes.jsonl"
+    path.write_text(
+        json.dumps(records[0]) + "\n" + json.dumps({"request": records[1:]}) + "\n"
+    )
+
+    assert replay_records(path) == records
+    assert make_payloads(records, 1, 4) == [*records, records[0]]
+    assert make_payloads(records, 2, 2) == [records[:2], [records[2], records[0]]]
+
+
+def test_inprocess_sweep() -> None:
+    """
+    Teste un balayage réduit contre l'application dans ce processus.
+
+    Asserts:
+        - Chaque configuration (clients, taille) a un résultat sans erreur, avec
+          débit, percentiles de latence, CPU et RSS.
+    """
+    args = argparse.Namespace(concurrency=[1, 2], batch_sizes=[1, 5], requests=10)
+
+    results = asyncio.run(run_target("inprocess", synthetic_records(20), args))
+
+    assert [(r["concurrency"], r["batch_size"]) for r in results] == [
+        (1, 1),
+        (2, 1),
+        (1, 5),
+        (2, 5),
+    ]
+    for r in results:
+        assert r["requests"] == 10 and r["errors"] == 0
+        assert r["throughput_rps"] > 0 and r["rss_mb"] > 0
+        assert r["latency_p50_ms"] <= r["latency_p99_ms"] <= r["latency_max_ms"]
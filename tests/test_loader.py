@@ -0,0 +1,235 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.api.backends import Backend
+from src.api.loader import (
+    ModelLoader,
+    ModelNotReady,
+    ServedModel,
+    resolve_model_version,
+)
+
+
+class ConstantBackend(Backend):
+    """
+    Moteur d'inférence factice qui prédit toujours la même valeur.
+    """
+
+    name = "constant"
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.full(len(features), 1.5)
+
+
+def test_background_loading() -> None:
+    """
+    Vérifie que le chargement se fait en arrière-plan et que le modèle est
+    disponible, avec ses métadonnées, une fois terminé.
+    """
+    release = threading.Event()
+    loaded = []
+
+    def slow_load(backend_name: str, model_uri: str) -> Backend:
+        release.wait(5)
+        return ConstantBackend()
+
+    loader = ModelLoader(
+        "constant", "model", 3, on_load=loaded.append, load_fn=slow_load
+    )
+    assert loader.state == "idle"
+
+    loader.start()
+    assert loader.state == "loading"
+    with pytest.raises(ModelNotReady):
+        loader.wait(timeout=0.01)
+
+    release.set()
+    served = loader.wait(timeout=5)
+    assert isinstance(served, ServedModel)
+    assert served.version == "3"
+    assert served.backend.predict_row([0.0] * 8) == 1.5
+    assert loader.status()["status"] == "ready"
+    assert loaded == [served]
+
+
+def test_wait_starts_loading_lazily() -> None:
+    """
+    Vérifie que `wait` déclenche le chargement s'il n'a pas été démarré.
+    """
+    loader = ModelLoader("constant", "model", 1, load_fn=lambda *_: ConstantBackend())
+
+    assert loader.wait(timeout=5).backend.predict_row([0.0] * 8) == 1.5
+
+
+def test_loading_failure() -> None:
+    """
+    Vérifie qu'un échec de chargement est signalé sans faire planter l'appelant.
+    """
+
+    def failing_load(backend_name: str, model_uri: str) -> Backend:
+        raise OSError("registre injoignable")
+
+    loader = ModelLoader("constant", "model", 1, load_fn=failing_load, retry_interval=0)
+
+    with pytest.raises(ModelNotReady, match="registre injoignable"):
+        loader.wait(timeout=5)
+    assert loader.state == "failed"
+    assert "registre injoignable" in loader.status()["error"]
+
+    # Sans nouvelles tentatives, un appel suivant relance le chargement
+    loader.load_fn = lambda *_: ConstantBackend()
+    assert loader.wait(timeout=5).backend.predict_row([0.0] * 8) == 1.5
+    assert "error" not in loader.status()
+
+
+def test_initial_load_is_retried() -> None:
+    """
+    Vérifie qu'un chargement initial en échec (registre pas encore joignable) est
+    retenté en arrière-plan, sans redémarrer le processus.
+
+    Asserts:
+        - Après le premier échec, l'état est "failed" avec l'erreur.
+        - La tentative suivante réussit et le modèle est servi.
+    """
+    attempts = []
+    first_failed = threading.Event()
+
+    def resolve(model_name: str, model_version: str, **kwargs) -> str:
+        attempts.append(model_version)
+        if len(attempts) == 1:
+            first_failed.set()
+            raise ConnectionError("registre injoignable")
+        return "1"
+
+    loader = ModelLoader(
+        "version",
+        "model",
+        load_fn=lambda name, uri: VersionBackend(uri),
+        resolve_fn=resolve,
+        retry_interval=0.2,
+    )
+    loader.start()
+    assert first_failed.wait(5)
+    with pytest.raises(ModelNotReady, match="registre injoignable"):
+        loader.wait(timeout=5)
+    assert loader.state == "failed"
+
+    for _ in range(100):
+        if loader.ready:
+            break
+        time.sleep(0.05)
+    assert loader.wait(timeout=5).version == "1"
+    assert loader.state == "ready"
+    assert len(attempts) == 2
+
+
+class VersionBackend(Backend):
+    """
+    Moteur d'inférence factice qui prédit le numéro de version de son modèle.
+    """
+
+    name = "version"
+
+    def __init__(self, model_uri: str) -> None:
+        self.value = float(model_uri.rsplit("/", 1)[1])
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.full(len(features), self.value)
+
+
+class Registry:
+    """
+    Registre factice : la version désignée peut être modifiée par le test.
+    """
+
+    def __init__(self, version: str) -> None:
+        self.version = version
+
+    def resolve(self, model_name: str, model_version: str, **kwargs) -> str:
+        return self.version
+
+
+def test_hot_reload_swaps_model() -> None:
+    """
+    Vérifie qu'une nouvelle version désignée dans le registre est chargée puis
+    servie, et qu'une référence déjà obtenue reste sur l'ancien modèle.
+    """
+    registry = Registry("1")
+    loaded = []
+    loader = ModelLoader(
+        "version",
+        "model",
+        alias="champion",
+        on_load=loaded.append,
+        load_fn=lambda name, uri: VersionBackend(uri),
+        resolve_fn=registry.resolve,
+    )
+    in_flight = loader.wait(timeout=5)
+    assert loader.check_for_update() is False
+
+    registry.version = "2"
+    assert loader.check_for_update() is True
+
+    assert loader.served.version == "2"
+    assert loader.served.backend.predict_row([0.0] * 8) == 2.0
+    assert in_flight.backend.predict_row([0.0] * 8) == 1.0
+    assert [served.version for served in loaded] == ["1", "2"]
+    assert loader.status()["model_version"] == "2"
+
+
+def test_failed_warmup_keeps_current_model() -> None:
+    """
+    Vérifie qu'un nouveau modèle qui échoue au préchauffage n'est pas servi.
+    """
+
+    class BrokenBackend(Backend):
+        def predict(self, features: np.ndarray) -> np.ndarray:
+            return np.full(len(features), np.nan)
+
+    registry = Registry("1")
+
+    def load(name: str, uri: str) -> Backend:
+        return BrokenBackend() if uri.endswith("/2") else VersionBackend(uri)
+
+    loader = ModelLoader("version", "model", load_fn=load, resolve_fn=registry.resolve)
+    loader.wait(timeout=5)
+
+    registry.version = "2"
+    with pytest.raises(ValueError):
+        loader.check_for_update()
+    assert loader.served.version == "1"
+
+
+def test_watcher_reloads_in_background() -> None:
+    """
+    Vérifie que la surveillance périodique sert la nouvelle version sans appel explicite.
+    """
+    registry = Registry("1")
+    swapped = threading.Event()
+    loader = ModelLoader(
+        "version",
+        "model",
+        on_load=lambda served: served.version == "3" and swapped.set(),
+        load_fn=lambda name, uri: VersionBackend(uri),
+        resolve_fn=registry.resolve,
+    )
+    loader.start()
+    loader.start_watching(0.01)
+    try:
+        loader.wait(timeout=5)
+        registry.version = "3"
+        assert swapped.wait(timeout=5)
+    finally:
+        loader.stop_watching()
+    assert loader.status()["watching"] is False
+
+
+def test_resolve_latest_version() -> None:
+    """
+    Vérifie la résolution d'une version fixe et de la dernière version du registre.
+    """
+    assert resolve_model_version("Production-model", 4) == "4"
+    assert int(resolve_model_version("Production-model", "latest")) >= 1
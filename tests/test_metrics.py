@@ -0,0 +1,149 @@
+from fastapi.testclient import TestClient
+import pytest
+import src.api.app as app_module
+from src.api.app import app
+from src.api.cache import PredictionCache
+from src.api.metrics import LATENCY_BUCKETS, STAGES, Histogram
+
+PAYLOAD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 880.0,
+    "avebedrms": 129.0,
+    "population": 322.0,
+    "aveoccup": 126.0,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """
+    Fixture qui retourne un client de test de l'API, avec des métriques remises à zéro.
+
+    Returns:
+        TestClient: Client de test pour l'API.
+    """
+    app_module.metrics.reset()
+    return TestClient(app)
+
+
+def scrape(client: TestClient) -> dict[str, float]:
+    """
+    Lit "/metrics" et retourne la valeur de chaque série, indexée par nom et étiquettes.
+    """
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    series = {}
+    for line in response.text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            series[name] = float(value)
+    return series
+
+
+def test_histogram_buckets() -> None:
+    """
+    Teste la répartition des observations dans les intervalles de l'histogramme.
+
+    Asserts:
+        - Les compteurs exportés sont cumulés, bornes supérieures incluses.
+        - Somme et nombre d'observations sont exacts.
+    """
+    histogram = Histogram(bounds=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    lines = histogram.render("latency", 'stage="parse"')
+
+    assert lines == [
+        'latency_bucket{stage="parse",le="0.1"} 2',
+        'latency_bucket{stage="parse",le="1.0"} 3',
+        'latency_bucket{stage="parse",le="+Inf"} 4',
+        'latency_sum{stage="parse"} 2.65',
+        'latency_count{stage="parse"} 4',
+    ]
+
+
+def test_metrics_match_synthetic_traffic(client: TestClient) -> None:
+    """
+    Teste les métriques exposées après un trafic synthétique connu.
+
+    Asserts:
+        - Requêtes et erreurs sont comptées par point de terminaison et statut.
+        - Chaque prédiction réussie alimente un histogramme par étape, pour la version servie.
+        - Les requêtes rejetées à la validation ne sont pas comptées dans les étapes.
+        - La durée des étapes ne dépasse pas la durée totale des requêtes.
+    """
+    for _ in range(5):
+        assert client.post("/predict", json=PAYLOAD).status_code == 200
+    for _ in range(2):
+        invalid = {**PAYLOAD, "medinc": "abc"}
+        assert client.post("/predict", json=invalid).status_code == 422
+    response = client.post("/predict/batch", json=[PAYLOAD] * 3)
+    assert response.status_code == 200
+    version = response.headers["X-Model-Version"]
+
+    series = scrape(client)
+
+    assert series['api_requests_total{endpoint="/predict",status="200"}'] == 5
+    assert series['api_requests_total{endpoint="/predict",status="422"}'] == 2
+    assert series['api_request_errors_total{endpoint="/predict"}'] == 2
+    assert series['api_requests_total{endpoint="/predict/batch",status="200"}'] == 1
+    assert series['api_request_errors_total{endpoint="/predict/batch"}'] == 0
+    assert series['api_request_duration_seconds_count{endpoint="/predict"}'] == 7
+    stage_sum = 0.0
+    for stage in STAGES:
+        labels = f'endpoint="/predict",stage="{stage}",model_version="{version}"'
+        assert series[f"api_stage_duration_seconds_count{{{labels}}}"] == 5
+        assert series[f'api_stage_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 5
+        stage_sum += series[f"api_stage_duration_seconds_sum{{{labels}}}"]
+        labels = f'endpoint="/predict/batch",stage="{stage}",model_version="{version}"'
+        assert series[f"api_stage_duration_seconds_count{{{labels}}}"] == 1
+    assert (
+        0 < stage_sum <= series['api_request_duration_seconds_sum{endpoint="/predict"}']
+    )
+
+
+def test_cache_hits_skip_inference_stage(client: TestClient, monkeypatch) -> None:
+    """
+    Teste qu'une prédiction servie par le cache n'alimente pas l'étape d'inférence.
+
+    Asserts:
+        - Les étapes de validation, de caractéristiques et de sérialisation comptent
+          les deux requêtes, l'inférence une seule.
+    """
+    cache = PredictionCache(max_size=10)
+    cache.set_model(app_module.model_name, app_module.model_version)
+    monkeypatch.setattr(app_module, "cache", cache)
+    client.post("/predict", json=PAYLOAD)
+    response = client.post("/predict", json=PAYLOAD)
+    version = response.headers["X-Model-Version"]
+
+    series = scrape(client)
+
+    for stage in STAGES:
+        labels = f'endpoint="/predict",stage="{stage}",model_version="{version}"'
+        expected = 1 if stage == "inference" else 2
+        assert series[f"api_stage_duration_seconds_count{{{labels}}}"] == expected
+
+
+def test_unknown_routes_share_one_series(client: TestClient) -> None:
+    """
+    Teste que les URL sans route sont regroupées sous une seule étiquette.
+
+    Asserts:
+        - Les 404 sont comptées sous "other", sans série par URL.
+    """
+    client.get("/inexistant/1")
+    client.get("/inexistant/2")
+
+    series = scrape(client)
+
+    assert series['api_requests_total{endpoint="other",status="404"}'] == 2
+    assert len(LATENCY_BUCKETS) + 1 == sum(
+        name.startswith('api_request_duration_seconds_bucket{endpoint="other"')
+        for name in series
+    )
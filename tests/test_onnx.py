@@ -0,0 +1,132 @@
+import mlflow.artifacts
+import numpy as np
+import pytest
+from mlflow import MlflowClient
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+# Dépendances optionnelles de l'export ONNX
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+from src.api import backends
+from src.api.backends import OnnxBackend
+from src.ml.dataset import load_dataset
+from src.ml.onnx_export import ONNX_MAX_ERROR, onnx_predict, to_onnx
+from src.ml.train import log_model
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[np.ndarray]:
+    """
+    Fixture qui génère un jeu de données synthétique de régression.
+
+    Returns:
+        tuple: X (2000, 8) et y.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 8))
+    y = X[:, 0] * 2 + np.sin(X[:, 1] * 3) + (X[:, 2] > 0.5) + rng.normal(size=2000)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        GradientBoostingRegressor(n_estimators=50, max_depth=4),
+        GradientBoostingRegressor(n_estimators=20, init="zero", loss="huber"),
+        HistGradientBoostingRegressor(max_iter=50),
+    ],
+)
+def test_onnx_matches_sklearn(data: tuple[np.ndarray], model) -> None:
+    """
+    Vérifie la parité des prédictions onnxruntime avec `model.predict`, y compris pour
+    des caractéristiques égales aux seuils des arbres (cas où l'arrondi float32 des
+    seuils changerait de branche).
+
+    Asserts:
+        - L'écart maximal reste sous `ONNX_MAX_ERROR`.
+    """
+    X, y = data
+    model.fit(X, y)
+    onnx_model = to_onnx(model, X[:100])
+
+    X_test = X.copy()
+    if hasattr(model, "estimators_"):
+        tree = model.estimators_[0, 0].tree_
+        internal = tree.feature >= 0
+        rows = np.arange(internal.sum()) % len(X_test)
+        X_test[rows, tree.feature[internal]] = tree.threshold[internal]
+    error = np.abs(onnx_predict(onnx_model, X_test) - model.predict(X_test))
+
+    assert error.max() < ONNX_MAX_ERROR
+
+
+def test_onnx_export_rejected(data: tuple[np.ndarray]) -> None:
+    """
+    Vérifie que l'export est refusé quand l'écart avec scikit-learn dépasse la tolérance.
+
+    Asserts:
+        - `to_onnx` lève une ValueError.
+    """
+    X, y = data
+    model = GradientBoostingRegressor(n_estimators=20).fit(X, y)
+
+    with pytest.raises(ValueError):
+        to_onnx(model, X[:100], max_error=1e-12)
+
+
+def test_onnx_backend(tmp_path, monkeypatch) -> None:
+    """
+    Vérifie qu'un modèle enregistré avec `log_model(..., onnx=True)` est servi par le
+    moteur "onnx", puis rechargé depuis le fichier copié sur disque sans MLflow.
+
+    Asserts:
+        - Les prédictions par lot et unitaires correspondent à scikit-learn.
+        - Le second chargement réutilise le fichier ONNX copié, sauf si l'URI désigne
+          une autre exécution (registre reconstruit).
+        - Un modèle enregistré sans export ONNX est refusé (LookupError).
+    """
+    monkeypatch.setattr(backends, "MODEL_MMAP_DIR", tmp_path)
+    X_train, X_test, y_train, _ = load_dataset().splits()
+    model = GradientBoostingRegressor(n_estimators=20, max_depth=3)
+    model.fit(X_train, y_train)
+    client = MlflowClient()
+    if client.get_experiment_by_name("test_experiment") is None:
+        client.create_experiment("test_experiment")
+    run_ids = [
+        log_model(
+            model,
+            {},
+            {},
+            X_train,
+            experiment_name="test_experiment",
+            model_name="test_onnx_model",
+            onnx=onnx,
+        )
+        for onnx in (True, False)
+    ]
+    versions = {
+        run_id: client.search_model_versions(f"run_id='{run_id}'")[0].version
+        for run_id in run_ids
+    }
+    model_uri = f"models:/test_onnx_model/{versions[run_ids[0]]}"
+
+    backend = OnnxBackend(model_uri)
+    expected = model.predict(X_test)
+    X_test = X_test.to_numpy()
+
+    assert np.abs(backend.predict(X_test) - expected).max() < ONNX_MAX_ERROR
+    assert backend.predict_row(X_test[0]) == pytest.approx(expected[0], abs=1e-5)
+
+    def fail(*args, **kwargs) -> None:
+        raise AssertionError("Le fichier ONNX ne doit pas être recopié.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(mlflow.artifacts, "download_artifacts", fail)
+        assert OnnxBackend(model_uri).path == backend.path
+        # Registre reconstruit : même URI, autre exécution, le fichier est recopié
+        patch.setattr(backends, "model_run_id", lambda model_uri: "rebuilt")
+        with pytest.raises(AssertionError, match="recopié"):
+            OnnxBackend(model_uri)
+    with pytest.raises(LookupError):
+        OnnxBackend(f"models:/test_onnx_model/{versions[run_ids[1]]}")
@@ -0,0 +1,186 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+import src.api.app as app_module
+from src.api.app import app
+from src.api.backends import FEATURE_COLUMNS
+from src.api.prediction_log import (
+    PredictionLogger,
+    iter_prediction_chunks,
+    read_predictions,
+)
+
+RECORD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 6.98,
+    "avebedrms": 1.02,
+    "population": 322.0,
+    "aveoccup": 2.55,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+def test_log_and_read_back(tmp_path) -> None:
+    """
+    Teste l'écriture des prédictions puis leur relecture en flux.
+
+    Asserts:
+        - Une ligne est écrite par ligne prédite, dans l'ordre, avec le modèle et la latence.
+        - Les blocs relus ont les colonnes du modèle, la prédiction et la version.
+    """
+    prediction_log = PredictionLogger(tmp_path)
+    prediction_log.log("/predict", "model", "1", list(RECORD.values()), 1.5, 0.002)
+    features = np.arange(16.0).reshape(2, 8)
+    prediction_log.log(
+        "/predict/batch", "model", "2", features, np.array([2.0, 3.0]), None
+    )
+    prediction_log.stop()
+
+    records = list(read_predictions(tmp_path))
+    assert [record["prediction"] for record in records] == [1.5, 2.0, 3.0]
+    assert records[0]["request"] == RECORD
+    assert records[0]["latency_ms"] == 2.0
+    assert records[2]["model_version"] == "2"
+    assert records[2]["endpoint"] == "/predict/batch"
+    chunks = list(iter_prediction_chunks(tmp_path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert list(chunks[0].columns[:8]) == FEATURE_COLUMNS
+    np.testing.assert_array_equal(chunks[1][FEATURE_COLUMNS].to_numpy(), features[1:])
+    assert prediction_log.stats()["logged"] == 3
+
+
+@pytest.mark.parametrize("block_size", [100, 1000, 2**20])
+def test_read_chunks_by_blocks(tmp_path, block_size: int) -> None:
+    """
+    Teste la relecture en flux d'un fichier par lectures de taille bornée.
+
+    Asserts:
+        - Les blocs ont `chunk_size` lignes, y compris à cheval sur plusieurs lectures
+          ou avec des lectures plus courtes qu'une ligne.
+        - Toutes les lignes complètes sont relues dans l'ordre ; la dernière ligne,
+          incomplète, est ignorée.
+    """
+    prediction_log = PredictionLogger(tmp_path)
+    features = np.arange(400.0).reshape(50, 8)
+    prediction_log.log("/predict/batch", "model", "1", features, np.arange(50.0), None)
+    prediction_log.stop()
+    (path,) = tmp_path.glob("predictions-*.jsonl")
+    with open(path, "a") as file:
+        file.write('{"timestamp": ')
+
+    chunks = list(iter_prediction_chunks(tmp_path, chunk_size=7, block_size=block_size))
+
+    assert [len(chunk) for chunk in chunks] == [7] * 7 + [1]
+    frame = pd.concat(chunks)
+    np.testing.assert_array_equal(frame[FEATURE_COLUMNS].to_numpy(), features)
+    np.testing.assert_array_equal(frame["prediction"], np.arange(50.0))
+
+
+def test_non_finite_values(tmp_path) -> None:
+    """
+    Teste la journalisation de caractéristiques et de prédictions non finies.
+
+    Asserts:
+        - Chaque ligne est du JSON strict : NaN et ±inf sont écrits null.
+        - Les lignes sont relues, les valeurs null devenant NaN dans les blocs.
+    """
+    prediction_log = PredictionLogger(tmp_path)
+    features = np.arange(16.0).reshape(2, 8)
+    features[0, 1], features[1, 7] = np.nan, -np.inf
+    prediction_log.log(
+        "/predict/batch", "model", "1", features, np.array([np.inf, 3.0]), None
+    )
+    prediction_log.stop()
+
+    def reject(constant: str) -> None:
+        raise ValueError(f"JSON invalide : {constant}")
+
+    (path,) = tmp_path.glob("predictions-*.jsonl")
+    records = [
+        json.loads(line, parse_constant=reject)
+        for line in path.read_text().splitlines()
+    ]
+    assert records[0]["request"]["houseage"] is None
+    assert records[0]["prediction"] is None
+    assert records[1]["request"]["longitude"] is None
+    assert records[1]["prediction"] == 3.0
+    (chunk,) = iter_prediction_chunks(tmp_path)
+    features[1, 7] = np.nan
+    np.testing.assert_array_equal(chunk[FEATURE_COLUMNS].to_numpy(), features)
+
+
+def test_rotation(tmp_path) -> None:
+    """
+    Teste la rotation des fichiers selon leur taille.
+
+    Asserts:
+        - Plusieurs fichiers sont écrits et toutes les lignes sont relues dans l'ordre.
+    """
+    prediction_log = PredictionLogger(tmp_path, batch_size=1, max_bytes=1000)
+    for i in range(20):
+        prediction_log.log("/predict", "model", "1", list(RECORD.values()), i, None)
+    prediction_log.stop()
+
+    assert len(list(tmp_path.glob("predictions-*.jsonl"))) > 1
+    assert prediction_log.rotations > 0
+    assert [record["prediction"] for record in read_predictions(tmp_path)] == list(
+        range(20)
+    )
+
+
+def test_full_queue_drops_records(tmp_path) -> None:
+    """
+    Teste qu'une file pleine fait perdre des prédictions plutôt que d'attendre.
+
+    Asserts:
+        - Les prédictions au-delà de la capacité de la file sont comptées comme perdues.
+    """
+    prediction_log = PredictionLogger(tmp_path, max_queue=2)
+    prediction_log.start = lambda: None  # Pas de thread d'écriture : la file se remplit
+
+    for _ in range(3):
+        prediction_log.log("/predict", "model", "1", list(RECORD.values()), 1.0, None)
+    prediction_log.log(
+        "/predict/batch", "model", "1", np.zeros((4, 8)), np.zeros(4), None
+    )
+
+    assert prediction_log.stats()["queued"] == 2
+    assert prediction_log.dropped == 5
+
+
+def test_api_logs_predictions(tmp_path, monkeypatch) -> None:
+    """
+    Teste la journalisation des prédictions servies par l'API.
+
+    Asserts:
+        - Les prédictions unitaires et par lot sont journalisées avec la version servie.
+        - Les lignes invalides d'un lot ne sont pas journalisées.
+    """
+    prediction_log = PredictionLogger(tmp_path)
+    monkeypatch.setattr(app_module, "prediction_log", prediction_log)
+    client = TestClient(app)
+
+    single = client.post("/predict", json=RECORD)
+    batch = client.post("/predict/batch", json=[RECORD, {"medinc": "abc"}, RECORD])
+    assert client.get("/prediction-log/stats").json()["enabled"]
+    prediction_log.stop()
+
+    records = list(read_predictions(tmp_path))
+    assert [record["endpoint"] for record in records] == [
+        "/predict",
+        "/predict/batch",
+        "/predict/batch",
+    ]
+    assert records[0]["prediction"] == single.json()["prediction"]
+    assert records[0]["model_version"] == single.headers["X-Model-Version"]
+    assert records[0]["latency_ms"] > 0
+    assert [record["prediction"] for record in records[1:]] == [
+        prediction
+        for prediction in batch.json()["predictions"]
+        if prediction is not None
+    ]
@@ -0,0 +1,146 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+import src.api.app as app_module
+from src.api.app import app
+from src.api.prediction_log import PredictionLogger
+from src.api.profiler import BACKGROUND_THREADS, SamplingProfiler
+
+RECORD = {
+    "medinc": 8.3252,
+    "houseage": 41.0,
+    "averooms": 880.0,
+    "avebedrms": 129.0,
+    "population": 322.0,
+    "aveoccup": 126.0,
+    "latitude": 37.88,
+    "longitude": -122.23,
+}
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    """
+    Fixture qui retourne un client de test de l'API, avec un jeton d'administration
+    et un profileur neuf.
+
+    Returns:
+        TestClient: Client de test pour l'API.
+    """
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(app_module, "profiler", SamplingProfiler(interval=0.001))
+    return TestClient(app)
+
+
+def busy_loop(seconds: float) -> None:
+    """
+    Occupe le thread courant pendant `seconds` secondes.
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_keeps_only_matching_stacks() -> None:
+    """
+    Teste l'échantillonnage d'un thread occupé.
+
+    Asserts:
+        - Seules les piles traversant les modules demandés sont conservées.
+        - La session s'arrête d'elle-même à l'échéance.
+        - Le rapport est au format des piles repliées.
+    """
+    profiler = SamplingProfiler(interval=0.001, roots=(__name__,))
+    profiler.start(seconds=0.3)
+    worker = threading.Thread(target=busy_loop, args=(0.2,))
+    worker.start()
+    worker.join()
+    profiler._thread.join(timeout=5)
+
+    assert not profiler.active
+    stacks = [line.rsplit(" ", 1) for line in profiler.collapsed().splitlines()]
+    assert all(int(count) > 0 for _, count in stacks)
+    assert all(f";{__name__}:" in stack for stack, _ in stacks)
+    assert any(stack.endswith(f"{__name__}:busy_loop") for stack, _ in stacks)
+
+
+def test_profiler_ignores_background_threads(tmp_path) -> None:
+    """
+    Teste que les threads de fond de l'API ne sont pas relevés.
+
+    Asserts:
+        - Le thread d'écriture du journal des prédictions, en attente, traverse les
+          modules de l'API et serait relevé sans exclusion.
+        - Par défaut, il est ignoré : aucune pile n'est conservée hors des requêtes.
+    """
+    prediction_log = PredictionLogger(tmp_path)
+    prediction_log.start()
+    try:
+        sessions = []
+        for ignored_threads in [(), BACKGROUND_THREADS]:
+            profiler = SamplingProfiler(interval=0.001, ignored_threads=ignored_threads)
+            profiler.start(seconds=0.1)
+            profiler._thread.join(timeout=5)
+            sessions.append(profiler.collapsed())
+    finally:
+        prediction_log.stop()
+
+    assert "src.api.prediction_log:PredictionLogger._run" in sessions[0]
+    assert sessions[1] == ""
+
+
+def test_profile_contains_predict_frames(client: TestClient) -> None:
+    """
+    Teste le profilage des prochaines requêtes de prédiction via l'API.
+
+    Asserts:
+        - La session s'arrête après le nombre de requêtes demandé.
+        - Le rapport contient des piles du chemin de prédiction, jusqu'aux fonctions
+          `predict` du modèle.
+    """
+    headers = {"X-Admin-Token": "secret"}
+    client.post("/predict", json=RECORD)  # Chargement du modèle hors session
+    response = client.post("/admin/profile?requests=3", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["active"]
+
+    for _ in range(3):
+        client.post("/predict/batch", json=[RECORD] * 5000)
+    app_module.profiler._thread.join(timeout=5)
+
+    report = client.get("/admin/profile", headers=headers)
+    assert report.headers["X-Profile-Active"] == "false"
+    assert report.headers["X-Profile-Requests"] == "3"
+    frames = {
+        frame
+        for line in report.text.splitlines()
+        for frame in line.rsplit(" ", 1)[0].split(";")
+    }
+    assert "src.api.app:predict_batch" in frames
+    assert any(
+        frame.endswith(".predict") and not frame.startswith("src.") for frame in frames
+    )
+
+
+def test_profile_requires_admin_token(client: TestClient, monkeypatch) -> None:
+    """
+    Teste la protection des points de terminaison de profilage.
+
+    Asserts:
+        - 403 sans jeton ou avec un jeton invalide.
+        - 404 lorsque l'administration est désactivée.
+        - 409 si une session est déjà en cours.
+    """
+    assert client.post("/admin/profile").status_code == 403
+    headers = {"X-Admin-Token": "wrong"}
+    assert client.get("/admin/profile", headers=headers).status_code == 403
+
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post("/admin/profile?seconds=5", headers=headers).status_code == 200
+    assert client.post("/admin/profile", headers=headers).status_code == 409
+    app_module.profiler.stop()
+
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "")
+    assert client.get("/admin/profile", headers=headers).status_code == 404
@@ -0,0 +1,201 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.backends import FEATURE_COLUMNS, SklearnBackend
+from src.ml.score import (
+    INPUT_FIELDS,
+    checkpoint_path,
+    read_chunks,
+    score_file,
+)
+
+# Modèle enregistré par `src/ml/train.py`
+MODEL_URI = "models:/Production-model/1"
+
+
+@pytest.fixture(scope="module")
+def features() -> np.ndarray:
+    """
+    Fixture qui génère des caractéristiques aléatoires plausibles.
+
+    Returns:
+        np.ndarray: Tableau (1000, 8) dans l'ordre de `FEATURE_COLUMNS`.
+    """
+    rng = np.random.default_rng(0)
+    low = [0.5, 1, 2, 0.5, 100, 1, 32.5, -124.3]
+    high = [15, 52, 10, 2, 5000, 5, 42, -114.3]
+    return rng.uniform(low, high, size=(1000, len(FEATURE_COLUMNS)))
+
+
+@pytest.fixture(scope="module")
+def expected(features: np.ndarray) -> np.ndarray:
+    """
+    Fixture qui calcule les prédictions de référence du moteur "sklearn".
+    """
+    return SklearnBackend(MODEL_URI).predict(features)
+
+
+def write_input(path, features: np.ndarray) -> None:
+    """
+    Écrit les caractéristiques au format déduit de l'extension, avec des noms de
+    colonnes de casses différentes et une colonne en trop.
+    """
+    frame = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+    frame.insert(0, "district", np.arange(len(frame)))
+    if path.suffix == ".csv":
+        frame.to_csv(path, index=False)
+    elif path.suffix == ".parquet":
+        frame.to_parquet(path, index=False, row_group_size=128)
+    else:
+        frame.columns = [column.lower() for column in frame.columns]
+        frame.to_json(path, orient="records", lines=True, double_precision=15)
+
+
+def read_output(path) -> np.ndarray:
+    """
+    Relit les prédictions écrites par `score_file`.
+    """
+    if path.suffix == ".csv":
+        return pd.read_csv(path)["prediction"].to_numpy()
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)["prediction"].to_numpy()
+    return pd.read_json(path, lines=True)["prediction"].to_numpy()
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".jsonl"])
+def test_read_chunks(tmp_path, features: np.ndarray, suffix: str) -> None:
+    """
+    Teste la lecture par blocs des trois formats d'entrée.
+
+    Asserts:
+        - Les colonnes sont reconnues quels que soient leur casse et leur ordre.
+        - Les blocs ne dépassent pas `chunk_size` et reprennent à la ligne `start`.
+    """
+    source = tmp_path / f"input{suffix}"
+    write_input(source, features)
+
+    chunks = list(read_chunks(source, chunk_size=300, start=450))
+
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    np.testing.assert_allclose(np.concatenate(chunks), features[450:], rtol=1e-14)
+
+
+def test_read_chunks_csv_blank_lines(tmp_path, features: np.ndarray) -> None:
+    """
+    Teste la reprise de la lecture d'un CSV contenant des lignes vides.
+
+    Asserts:
+        - Les lignes vides ne comptent pas dans `start` : la lecture reprend à la
+          ligne de données `start`, comme elles avaient été comptées à la prédiction.
+    """
+    source = tmp_path / "input.csv"
+    write_input(source, features[:10])
+    lines = source.read_text().splitlines()
+    source.write_text("\n".join([lines[0], "", *lines[1:4], "", "", *lines[4:]]) + "\n")
+
+    assert len(np.concatenate(list(read_chunks(source)))) == 10
+    chunks = list(read_chunks(source, chunk_size=2, start=5))
+
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    np.testing.assert_allclose(np.concatenate(chunks), features[5:10], rtol=1e-14)
+
+
+def test_invalid_rows(tmp_path) -> None:
+    """
+    Teste les lignes invalides et les colonnes manquantes.
+
+    Asserts:
+        - Une valeur manquante ou non numérique devient NaN.
+        - Ces lignes restent sans prédiction : "" (CSV) ou null (JSONL), relues comme NaN.
+        - Une colonne manquante lève une KeyError.
+    """
+    source = tmp_path / "input.csv"
+    source.write_text(
+        ",".join(INPUT_FIELDS)
+        + "\n8.3,41,7,1,322,2.5,37.9,-122.2\n8.3,,7,1,322,2.5,37.9,-122.2"
+        + "\n8.3,x,7,1,322,2.5,37.9,-122.2\n"
+    )
+
+    (values,) = read_chunks(source)
+    assert np.isnan(values).any(axis=1).tolist() == [False, True, True]
+    score_file(source, tmp_path / "output.csv", MODEL_URI, workers=0)
+    score_file(source, tmp_path / "output.jsonl", MODEL_URI, workers=0)
+    assert (tmp_path / "output.csv").read_text().splitlines()[2:] == ['""', '""']
+    assert pd.read_csv(tmp_path / "output.csv")["prediction"].isna().tolist() == [
+        False,
+        True,
+        True,
+    ]
+    assert (tmp_path / "output.jsonl").read_text().splitlines()[1:] == [
+        '{"prediction": null}',
+        '{"prediction": null}',
+    ]
+
+    source.write_text("medinc,houseage\n1,2\n")
+    with pytest.raises(KeyError, match="averooms"):
+        next(read_chunks(source))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize(
+    "suffixes", [(".csv", ".jsonl"), (".parquet", ".csv"), (".jsonl", ".parquet")]
+)
+def test_score_file(
+    tmp_path, features: np.ndarray, expected: np.ndarray, suffixes, workers: int
+) -> None:
+    """
+    Teste la prédiction d'un fichier, dans le processus courant ou un pool.
+
+    Asserts:
+        - Toutes les lignes sont prédites, dans l'ordre du fichier d'entrée.
+        - Les prédictions sont celles du moteur d'inférence.
+    """
+    source, output = tmp_path / f"input{suffixes[0]}", tmp_path / f"output{suffixes[1]}"
+    write_input(source, features)
+
+    rows = score_file(source, output, MODEL_URI, workers=workers, chunk_size=128)
+
+    assert rows == len(features)
+    np.testing.assert_allclose(read_output(output), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".jsonl"])
+def test_score_file_resume(
+    tmp_path, features: np.ndarray, expected: np.ndarray, suffix: str
+) -> None:
+    """
+    Teste la reprise d'une exécution interrompue après son point de reprise.
+
+    Asserts:
+        - Seules les lignes postérieures au point de reprise sont prédites.
+        - Un bloc écrit après le point de reprise (interruption) est remplacé.
+        - La sortie finale est identique à celle d'une exécution sans interruption.
+        - Un point de reprise d'un autre fichier d'entrée ou d'un autre modèle est refusé.
+    """
+    source, output = tmp_path / "input.parquet", tmp_path / f"output{suffix}"
+    write_input(source, features)
+    score_file(source, output, MODEL_URI, workers=0, chunk_size=300)
+    state = json.loads(checkpoint_path(output).read_text())
+    assert state["rows"] == len(features)
+
+    # Interruption simulée : point de reprise après 600 lignes, bloc suivant à moitié écrit
+    if suffix == ".parquet":
+        state = {**state, "rows": 600}
+    else:
+        lines = output.read_bytes().splitlines(keepends=True)
+        kept = lines[: 600 + (suffix == ".csv")]
+        output.write_bytes(b"".join(kept) + lines[-1][:5])
+        state = {**state, "rows": 600, "size": sum(map(len, kept))}
+    checkpoint_path(output).write_text(json.dumps(state))
+
+    rows = score_file(source, output, MODEL_URI, workers=2, chunk_size=128, resume=True)
+
+    assert rows == len(features) - 600
+    np.testing.assert_allclose(read_output(output), expected, rtol=1e-12)
+    with pytest.raises(ValueError, match="point de reprise"):
+        score_file(tmp_path / "other.csv", output, MODEL_URI, resume=True)
+    with pytest.raises(ValueError, match="point de reprise"):
+        score_file(source, output, "models:/Production-model/2", resume=True)
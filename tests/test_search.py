@@ -0,0 +1,153 @@
+import mlflow
+import pytest
+from mlflow import MlflowClient
+from sklearn.datasets import make_regression
+
+from src.ml.search import (
+    SEARCH_SPACES,
+    Trial,
+    best_trial,
+    candidate_params,
+    log_trial,
+    run_search,
+)
+from src.ml.train import MODEL_FAMILIES
+
+SPACE = {"n_estimators": [5, 20], "max_depth": [1, 3]}
+
+
+@pytest.fixture
+def data() -> tuple:
+    """
+    Fixture générant un petit jeu de données de régression.
+
+    Returns:
+        tuple: X, y
+    """
+    return make_regression(n_samples=300, n_features=8, noise=1.0, random_state=0)
+
+
+def test_candidate_params() -> None:
+    """
+    Teste l'énumération des configurations en grille et en recherche aléatoire.
+
+    Asserts:
+        - La grille contient toutes les combinaisons.
+        - La recherche aléatoire tire des configurations distinctes, sans dépasser la grille.
+    """
+    assert len(candidate_params(SPACE, "grid")) == 4
+    sampled = candidate_params(SPACE, "random", n_iter=3, random_state=0)
+    assert len(sampled) == 3
+    assert len({tuple(sorted(params.items())) for params in sampled}) == 3
+    assert len(candidate_params(SPACE, "random", n_iter=100)) == 4
+    with pytest.raises(ValueError):
+        candidate_params(SPACE, "bayes")
+
+
+def test_search_spaces_match_model_families() -> None:
+    """
+    Teste que chaque famille de modèles a un espace de recherche valide.
+
+    Asserts:
+        - Les hyperparamètres par défaut et les configurations tirées sont acceptés par l'estimateur.
+    """
+    assert set(SEARCH_SPACES) == set(MODEL_FAMILIES)
+    for family, (estimator, params) in MODEL_FAMILIES.items():
+        estimator(**params)._validate_params()
+        for params in candidate_params(SEARCH_SPACES[family], n_iter=5, random_state=0):
+            estimator(**params)._validate_params()
+
+
+def test_run_search(data: tuple) -> None:
+    """
+    Teste la recherche parallèle et le choix du meilleur essai.
+
+    Asserts:
+        - Toutes les configurations sont évaluées et transmises à `on_trial`.
+        - Les métriques suivent les clés de `evalute_model`.
+        - Le meilleur essai est celui de plus faible erreur quadratique moyenne.
+    """
+    X, y = data
+    seen = []
+    trials = run_search(
+        X,
+        y,
+        SPACE,
+        strategy="grid",
+        cv=2,
+        n_jobs=2,
+        prune_ratio=float("inf"),
+        random_state=0,
+        on_trial=seen.append,
+    )
+
+    assert len(trials) == 4 and seen == trials
+    assert all(trial.status == "completed" and trial.folds == 2 for trial in trials)
+    assert set(trials[0].metrics) == {"mean_squared_error", "mean_absolute_error", "r2"}
+    best = best_trial(trials)
+    assert best.metrics["mean_squared_error"] == min(
+        trial.metrics["mean_squared_error"] for trial in trials
+    )
+    assert best.params["random_state"] == 0
+
+
+def test_run_search_prunes_bad_configurations(data: tuple) -> None:
+    """
+    Teste l'arrêt anticipé des configurations nettement moins bonnes que la meilleure.
+
+    Asserts:
+        - Avec un seul processus, la configuration la plus faible, évaluée après la
+          meilleure, s'arrête après son premier pli.
+    """
+    X, y = data
+    space = {"n_estimators": [50, 1], "max_depth": [3]}
+    trials = run_search(X, y, space, strategy="grid", cv=3, n_jobs=1, prune_ratio=1.1)
+
+    assert [trial.status for trial in trials] == ["completed", "pruned"]
+    assert trials[1].folds == 1
+    assert best_trial(trials) is trials[0]
+
+
+def test_run_search_respects_budget(data: tuple) -> None:
+    """
+    Teste le budget de temps de la recherche.
+
+    Asserts:
+        - Avec un budget épuisé, aucun essai n'aboutit et aucun meilleur essai n'est retenu.
+    """
+    X, y = data
+    trials = run_search(X, y, SPACE, strategy="grid", n_jobs=1, budget=0)
+
+    assert all(trial.status == "timeout" for trial in trials)
+    assert best_trial(trials) is None
+
+
+def test_log_trial() -> None:
+    """
+    Teste l'enregistrement d'un essai comme exécution MLflow imbriquée.
+
+    Asserts:
+        - L'exécution de l'essai est rattachée à l'exécution parente.
+        - Les paramètres, métriques et l'état de l'essai sont enregistrés.
+    """
+    trial = Trial(
+        number=3,
+        params={"max_depth": 3},
+        status="completed",
+        metrics={"mean_squared_error": 0.5, "mean_absolute_error": 0.4, "r2": 0.8},
+        folds=3,
+        seconds=1.0,
+    )
+    mlflow.set_experiment("test_experiment")
+    with mlflow.start_run() as parent:
+        log_trial(trial)
+
+    client = MlflowClient()
+    (child,) = client.search_runs(
+        [parent.info.experiment_id],
+        f"tags.mlflow.parentRunId = '{parent.info.run_id}'",
+    )
+    assert child.info.run_name == "trial-3"
+    assert child.data.params == {"max_depth": "3"}
+    assert child.data.metrics["r2"] == 0.8
+    assert child.data.tags["status"] == "completed"
@@ -0,0 +1,144 @@
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor
+
+from src.ml.spatial import (
+    KM_PER_DEGREE,
+    NEIGHBOR_FEATURES,
+    SpatialNeighborFeatures,
+    with_spatial_features,
+)
+
+# Colonnes dans l'ordre de `FEATURE_COLUMNS`
+COLUMNS = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Fixture qui génère des districts synthétiques répartis sur la Californie.
+
+    Returns:
+        tuple: X (500, 8) et y.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, 8)), columns=COLUMNS)
+    X["Latitude"] = rng.uniform(32.5, 42.0, 500)
+    X["Longitude"] = rng.uniform(-124.3, -114.3, 500)
+    y = pd.Series(X["MedInc"] + X["Latitude"] / 10 + rng.normal(size=500))
+    return X, y
+
+
+def brute_force(
+    transformer: SpatialNeighborFeatures, X: np.ndarray, exclude: np.ndarray | None
+) -> np.ndarray:
+    """
+    Agrégats des voisins calculés par recherche exhaustive.
+    """
+    X_train = transformer.tree_.data.base
+    scale = np.cos(np.radians(transformer.reference_latitude_))
+    points = np.column_stack([X[:, 6] * KM_PER_DEGREE, X[:, 7] * KM_PER_DEGREE * scale])
+    distances = np.linalg.norm(points[:, None, :] - X_train[None, :, :], axis=2)
+    if exclude is not None:
+        distances[np.arange(len(X)), exclude] = np.inf
+    index = np.argsort(distances, axis=1)[:, : transformer.n_neighbors]
+    return np.column_stack(
+        [
+            transformer.income_[index].mean(axis=1),
+            transformer.target_[index].mean(axis=1),
+            np.take_along_axis(distances, index, axis=1).mean(axis=1),
+        ]
+    )
+
+
+def test_transform_matches_brute_force(data: tuple) -> None:
+    """
+    Vérifie que les agrégats calculés avec l'arbre KD correspondent à une recherche
+    exhaustive, quelle que soit la taille des paquets.
+
+    Asserts:
+        - Les caractéristiques d'origine sont conservées, suivies de `NEIGHBOR_FEATURES`.
+        - Les agrégats sont égaux à ceux de la recherche exhaustive.
+        - Le résultat ne dépend pas de `batch_size`.
+    """
+    X, y = data
+    transformer = SpatialNeighborFeatures(n_neighbors=5).fit(X, y)
+    queries = X.to_numpy()[:50] + 0.01
+
+    result = transformer.transform(queries)
+
+    assert result.shape == (50, 8 + len(NEIGHBOR_FEATURES))
+    np.testing.assert_array_equal(result[:, :8], queries)
+    np.testing.assert_allclose(result[:, 8:], brute_force(transformer, queries, None))
+    transformer.set_params(batch_size=7)
+    np.testing.assert_array_equal(transformer.transform(queries), result)
+    assert list(transformer.get_feature_names_out()[8:]) == NEIGHBOR_FEATURES
+
+
+def test_fit_transform_excludes_self(data: tuple) -> None:
+    """
+    Vérifie qu'à l'entraînement chaque district est exclu de ses propres voisins.
+
+    Asserts:
+        - Les agrégats de `fit_transform` sont ceux des voisins autres que la ligne elle-même.
+        - Une ligne superposée à un autre district n'est toujours agrégée que k fois.
+    """
+    X, y = data
+    X = pd.concat([X, X.iloc[:3]], ignore_index=True)
+    y = pd.concat([y, y.iloc[:3]], ignore_index=True)
+    transformer = SpatialNeighborFeatures(n_neighbors=5, batch_size=64)
+
+    result = transformer.fit_transform(X, y)
+
+    expected = brute_force(transformer, X.to_numpy(), np.arange(len(X)))
+    np.testing.assert_allclose(result[:, 8:], expected)
+
+
+def test_invalid_columns(data: tuple) -> None:
+    """
+    Vérifie que des colonnes dans un autre ordre que `FEATURE_COLUMNS` sont refusées.
+
+    Asserts:
+        - `fit` lève une ValueError.
+    """
+    X, y = data
+
+    with pytest.raises(ValueError):
+        SpatialNeighborFeatures().fit(X[COLUMNS[::-1]], y)
+
+
+def test_pipeline_serving(data: tuple) -> None:
+    """
+    Vérifie qu'un pipeline avec caractéristiques spatiales se sert comme l'API le
+    charge : sérialisé, puis appelé ligne à ligne sur des tableaux numpy sans noms
+    de colonnes (voir `load_sklearn_model`).
+
+    Asserts:
+        - Les prédictions après désérialisation sont identiques.
+        - Aucune alerte n'est émise sur une ligne numpy.
+    """
+    X, y = data
+    pipeline = with_spatial_features(GradientBoostingRegressor(n_estimators=10))
+    pipeline.fit(X, y)
+    expected = pipeline.predict(X.iloc[:5])
+
+    served = pickle.loads(pickle.dumps(pipeline))
+    del served.steps[0][1].feature_names_in_
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        predictions = [served.predict(row[None, :])[0] for row in X.to_numpy()[:5]]
+    np.testing.assert_allclose(predictions, expected)
@@ -0,0 +1,135 @@
+import tracemalloc
+
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+import pytest
+from mlflow.models import infer_signature
+
+from src.api.backends import FEATURE_COLUMNS, SklearnBackend
+from src.ml.streaming import (
+    evaluate_streaming,
+    fit_streaming,
+    iter_chunks,
+    iter_split,
+    reservoir_sample,
+)
+
+
+def write_dataset(path, rows: int) -> None:
+    """
+    Écrit un jeu de données synthétique aux colonnes de l'API, par blocs pour un CSV.
+    """
+    rng = np.random.default_rng(0)
+    frames = []
+    for start in range(0, rows, 50_000):
+        X = rng.uniform(0, 10, size=(min(50_000, rows - start), len(FEATURE_COLUMNS)))
+        frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+        frame["price"] = X[:, 0] + np.sin(X[:, 1]) + rng.normal(0, 0.1, len(X))
+        if path.suffix == ".csv":
+            frame.to_csv(path, mode="a", header=start == 0, index=False)
+        else:
+            frames.append(frame)
+    if frames:
+        pd.concat(frames).to_parquet(path)
+
+
+@pytest.fixture
+def source(tmp_path):
+    """
+    Fixture écrivant un fichier CSV synthétique de 5 000 lignes.
+
+    Returns:
+        Path: Chemin du fichier.
+    """
+    path = tmp_path / "biens.csv"
+    write_dataset(path, 5000)
+    return path
+
+
+def test_split_is_deterministic(source) -> None:
+    """
+    Teste le découpage entraînement/test par hachage.
+
+    Asserts:
+        - Entraînement et test sont disjoints et couvrent toutes les lignes.
+        - La proportion de test est proche de `test_size`.
+        - Le découpage ne dépend pas de la taille des blocs.
+    """
+    train = pd.concat(X for X, _ in iter_split(source, "price", "train", 700))
+    test = pd.concat(X for X, _ in iter_split(source, "price", "test", 700))
+    test_large = pd.concat(X for X, _ in iter_split(source, "price", "test", 5000))
+
+    assert len(train) + len(test) == 5000
+    assert 0.17 < len(test) / 5000 < 0.23
+    assert not set(train["MedInc"]) & set(test["MedInc"])
+    np.testing.assert_array_equal(test.to_numpy(), test_large.to_numpy())
+
+
+def test_reservoir_sample(source) -> None:
+    """
+    Teste l'échantillonnage en un passage.
+
+    Asserts:
+        - L'échantillon a la taille demandée et provient du flux.
+        - L'échantillon est reproductible avec une graine.
+    """
+    X, y = reservoir_sample(iter_split(source, "price", chunk_size=300), 200, 0)
+    X_again, _ = reservoir_sample(iter_split(source, "price", chunk_size=300), 200, 0)
+
+    assert len(X) == len(y) == 200
+    train = pd.concat(X for X, _ in iter_split(source, "price", chunk_size=300))
+    assert set(X["MedInc"]) <= set(train["MedInc"])
+    pd.testing.assert_frame_equal(X, X_again)
+
+
+def test_fit_and_evaluate_streaming(tmp_path) -> None:
+    """
+    Teste l'entraînement et l'évaluation par blocs depuis un fichier Parquet.
+
+    Asserts:
+        - Les métriques suivent les clés de `evalute_model`.
+        - Le modèle capture la relation non linéaire de la cible.
+        - Le modèle est servi tel quel par le moteur "sklearn" de l'API.
+    """
+    path = tmp_path / "biens.parquet"
+    write_dataset(path, 5000)
+    model = fit_streaming(path, "price", chunk_size=1000, epochs=5, random_state=0)
+
+    scores = evaluate_streaming(model, path, "price", chunk_size=1000)
+
+    assert set(scores) == {"mean_squared_error", "mean_absolute_error", "r2"}
+    assert scores["r2"] > 0.9
+    X = next(iter_chunks(path, 100)).drop(columns="price")
+    mlflow.sklearn.save_model(
+        model, tmp_path / "model", signature=infer_signature(X, model.predict(X))
+    )
+    backend = SklearnBackend(str(tmp_path / "model"))
+    np.testing.assert_allclose(backend.predict(X.to_numpy()), model.predict(X))
+
+
+def test_peak_memory_is_bounded_by_chunk_size(tmp_path) -> None:
+    """
+    Profile la mémoire de l'entraînement par blocs sur des jeux de tailles différentes.
+
+    Asserts:
+        - Le pic de mémoire allouée ne croît pas avec le nombre de lignes du fichier.
+        - Il reste nettement inférieur à la taille du jeu complet en mémoire.
+    """
+    small, large = tmp_path / "small.csv", tmp_path / "large.csv"
+    write_dataset(small, 20_000)
+    write_dataset(large, 100_000)
+    options = dict(chunk_size=4000, sample_size=1000, epochs=1, random_state=0)
+    # Premier appel hors mesure : imports et caches internes de scikit-learn
+    fit_streaming(small, "price", **options)
+
+    peaks = {}
+    for path in (small, large):
+        tracemalloc.start()
+        fit_streaming(path, "price", **options)
+        peaks[path] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    full_size = 100_000 * (len(FEATURE_COLUMNS) + 1) * 8
+    assert peaks[large] < 1.2 * peaks[small]
+    assert peaks[large] < full_size / 2
@@ -1,8 +1,15 @@
 import pytest
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.datasets import fetch_california_housing
-from src.ml.train import train_model, evalute_model, log_model
-from sklearn.model_selection import train_test_split
+from src.ml.dataset import load_dataset
+from src.ml.train import (
+    train_model,
+    evalute_model,
+    log_model,
+    parse_args,
+    wait_for_uploads,
+)
+from src.api.backends import load_sklearn_model
+from src.monitoring.drift import build_reference, load_reference
 from mlflow import MlflowClient
 from pandas import DataFrame
 from sklearn.base import BaseEstimator
@@ -11,15 +18,13 @@ from sklearn.base import BaseEstimator
 @pytest.fixture
 def data() -> tuple[DataFrame]:
     """
-    Fixture pour charger les données California Housing et effectuer un split train/test.
+    Fixture pour charger les données California Housing depuis le dépôt local,
+    découpées en train/test.
 
     Returns:
         tuple: X_train, X_test, y_train, y_test
     """
-    housing = fetch_california_housing(as_frame=True)
-    X = housing.data
-    y = housing.target
-    return train_test_split(X, y, test_size=0.2, random_state=42)
+    return load_dataset().splits()
 
 
 @pytest.fixture
@@ -134,3 +139,76 @@ def test_log_model(
     run = mlflow_client.get_run(run_id)
     assert run.data.params == params
     assert run.data.metrics == metrics
+
+
+def test_log_model_fast(
+    mlflow_client: MlflowClient, model: BaseEstimator, data: tuple[DataFrame]
+) -> None:
+    """
+    Teste le mode d'enregistrement rapide de `log_model` (signature sur un échantillon,
+    envoi du modèle en arrière-plan).
+
+    Args:
+        mlflow_client (MlflowClient): Client MLflow pour récupérer les informations de run.
+        model (RandomForestRegressor): Modèle RandomForest à enregistrer.
+        data (tuple): Données d'entraînement et de test (X_train, X_test, y_train, y_test).
+
+    Asserts:
+        - Les paramètres et métriques sont enregistrés en un appel.
+        - Une fois l'envoi terminé, la version inscrite au registre est chargeable par l'API
+          et prédit comme le modèle d'origine.
+        - La référence de dérive est enregistrée avec le modèle.
+    """
+    X_train, X_test, y_train, y_test = data
+    model.fit(X_train, y_train)
+    params = {"n_estimators": "2", "max_depth": "1"}
+    metrics = {"mean_squared_error": 0.5, "mean_absolute_error": 122, "r2": 0.8}
+    run_id = log_model(
+        model,
+        params,
+        metrics,
+        X_train,
+        experiment_name="test_experiment",
+        model_name="test_model",
+        fast=True,
+        drift_reference=build_reference(X_train),
+    )
+    wait_for_uploads()
+
+    run = mlflow_client.get_run(run_id)
+    assert run.data.params == params
+    assert run.data.metrics == metrics
+    (version,) = mlflow_client.search_model_versions(f"run_id='{run_id}'")
+    served = load_sklearn_model(f"models:/test_model/{version.version}")
+    assert (served.predict(X_test.to_numpy()) == model.predict(X_test)).all()
+    reference = load_reference("test_model", version.version)
+    assert reference == build_reference(X_train)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--source", "biens.parquet", "--target", "prix"],
+        ["--prediction-grid", "--streaming", "--source", "biens.parquet"],
+        ["--onnx", "--streaming", "--source", "biens.parquet"],
+        [
+            "--model",
+            "hist_gradient_boosting",
+            "--streaming",
+            "--source",
+            "biens.parquet",
+        ],
+    ],
+)
+def test_parse_args_rejects_ignored_options(monkeypatch, options: list[str]) -> None:
+    """
+    Teste le refus des options qui seraient ignorées en mode --streaming, et d'une
+    source ingérée sous le nom du jeu par défaut.
+
+    Asserts:
+        - L'analyse des arguments s'arrête sur une erreur (code 2).
+    """
+    monkeypatch.setattr("sys.argv", ["train", *options])
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args()
+    assert exit_info.value.code == 2